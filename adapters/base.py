@@ -1,14 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Iterable
 
-from engine.models import Candle, Fill, OrderIntent, Position
+from engine.models import CandleSeries, Fill, OrderIntent, Position
 
 
 class BrokerAdapter(ABC):
     @abstractmethod
-    async def fetch_candles(self, symbol: str, timeframe: str, limit: int = 200) -> list[Candle]:
+    async def fetch_candles(self, symbol: str, timeframe: str, limit: int = 200) -> CandleSeries:
         raise NotImplementedError
 
     @abstractmethod
@@ -19,6 +20,17 @@ class BrokerAdapter(ABC):
     async def get_spread(self, symbol: str) -> float:
         raise NotImplementedError
 
+    async def prepare(self, symbols: list[str]) -> list[str]:
+        return []
+
+    async def get_spreads(self, symbols: list[str]) -> dict[str, float]:
+        spreads = await asyncio.gather(*(self.get_spread(symbol) for symbol in symbols))
+        return dict(zip(symbols, spreads))
+
+    async def get_spread_quotes(self, symbols: list[str]) -> dict[str, tuple[float, float]]:
+        spreads = await self.get_spreads(symbols)
+        return {symbol: (spread, 0.0) for symbol, spread in spreads.items()}
+
     @abstractmethod
     async def place_order(self, intent: OrderIntent) -> Fill:
         raise NotImplementedError
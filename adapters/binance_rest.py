@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import time
+from typing import Any
+from urllib.parse import urlencode
+
+import httpx
+
+from adapters.rate_limit import PRIORITY_MARKET_DATA, PRIORITY_ORDER, WeightLimiter, request_weight
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - optional speedup
+    import json
+
+    _loads = json.loads
+
+BINANCE_BASE_URL = "https://api.binance.com"
+
+
+class BinanceAPIError(RuntimeError):
+    def __init__(self, status: int, code: int | None, message: str) -> None:
+        super().__init__(f"Binance API error {status} ({code}): {message}")
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+def create_http_client(
+    base_url: str = BINANCE_BASE_URL,
+    timeout: float = 10.0,
+    max_connections: int = 20,
+) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=base_url,
+        timeout=httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections, keepalive_expiry=60.0),
+        headers={"Accept": "application/json"},
+    )
+
+
+class BinanceRestClient:
+    def __init__(
+        self,
+        api_key: str = "",
+        api_secret: str = "",
+        http: httpx.AsyncClient | None = None,
+        limiter: WeightLimiter | None = None,
+        recv_window: int = 5000,
+        max_attempts: int = 3,
+    ) -> None:
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.http = http or create_http_client()
+        self.limiter = limiter
+        self.recv_window = recv_window
+        self.max_attempts = max_attempts
+        self._owns_http = http is None
+
+    async def close(self) -> None:
+        if self._owns_http:
+            await self.http.aclose()
+
+    async def get_klines(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int = 500,
+        start_time: int | None = None,
+        end_time: int | None = None,
+        priority: int = PRIORITY_MARKET_DATA,
+    ) -> list[list[Any]]:
+        params: dict[str, Any] = {"symbol": symbol, "interval": interval, "limit": limit}
+        if start_time is not None:
+            params["startTime"] = start_time
+        if end_time is not None:
+            params["endTime"] = end_time
+        return await self.request("GET", "/api/v3/klines", params, priority=priority)
+
+    async def get_order_book(self, symbol: str, limit: int = 5) -> dict[str, Any]:
+        return await self.request("GET", "/api/v3/depth", {"symbol": symbol, "limit": limit})
+
+    async def get_book_tickers(self, symbols: list[str] | None = None) -> list[dict[str, Any]]:
+        if symbols and len(symbols) == 1:
+            return [await self.request("GET", "/api/v3/ticker/bookTicker", {"symbol": symbols[0]})]
+        params = {"symbols": _symbols_param(symbols)} if symbols else None
+        return await self.request("GET", "/api/v3/ticker/bookTicker", params)
+
+    async def get_exchange_info(self, symbols: list[str] | None = None) -> dict[str, Any]:
+        params = {"symbols": _symbols_param(symbols)} if symbols else None
+        return await self.request("GET", "/api/v3/exchangeInfo", params)
+
+    async def create_order(self, **params: Any) -> dict[str, Any]:
+        return await self.request("POST", "/api/v3/order", params, signed=True, priority=PRIORITY_ORDER)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        signed: bool = False,
+        priority: int = PRIORITY_MARKET_DATA,
+    ) -> Any:
+        weight = request_weight(path, params)
+        for attempt in range(1, self.max_attempts + 1):
+            if self.limiter is not None:
+                await self.limiter.acquire(weight, priority)
+            response = await self._send(method, path, params, signed)
+            if self.limiter is not None:
+                used = response.headers.get("x-mbx-used-weight-1m")
+                if used is not None:
+                    self.limiter.observe(int(used))
+                if response.status_code in (418, 429):
+                    self.limiter.penalize(float(response.headers.get("retry-after", 60)))
+                    if response.status_code == 429 and attempt < self.max_attempts:
+                        continue
+            return self._decode(response)
+
+    async def _send(self, method: str, path: str, params: dict[str, Any] | None, signed: bool) -> httpx.Response:
+        params = dict(params or {})
+        headers = {}
+        if signed:
+            if not (self.api_key and self.api_secret):
+                raise RuntimeError("Binance API keys missing for signed request")
+            params["timestamp"] = int(time.time() * 1000)
+            params["recvWindow"] = self.recv_window
+            query = urlencode(params)
+            signature = hmac.new(self.api_secret.encode(), query.encode(), hashlib.sha256).hexdigest()
+            query = f"{query}&signature={signature}"
+            headers["X-MBX-APIKEY"] = self.api_key
+        else:
+            query = urlencode(params)
+        url = f"{path}?{query}" if query else path
+        return await self.http.request(method, url, headers=headers)
+
+    def _decode(self, response: httpx.Response) -> Any:
+        try:
+            payload = _loads(response.content) if response.content else None
+        except ValueError:
+            payload = None
+        if response.status_code >= 400:
+            if isinstance(payload, dict):
+                raise BinanceAPIError(response.status_code, payload.get("code"), str(payload.get("msg", "")))
+            raise BinanceAPIError(response.status_code, None, response.text[:200])
+        return payload
+
+
+def _symbols_param(symbols: list[str]) -> str:
+    return "[" + ",".join(f'"{s}"' for s in symbols) + "]"
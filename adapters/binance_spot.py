@@ -1,92 +1,122 @@
 from __future__ import annotations
 
-import asyncio
 from decimal import Decimal
 from typing import Any
 
-from binance.client import Client
-from binance.exceptions import BinanceAPIException
-from loguru import logger
+import httpx
+import numpy as np
 
 from adapters.base import BrokerAdapter
-from engine.models import Candle, Fill, OrderIntent, Position
+from adapters.binance_rest import BinanceAPIError, BinanceRestClient
+from adapters.rate_limit import PRIORITY_BACKFILL, WeightLimiter
+from adapters.symbol_filters import SymbolFilterCache
+from engine.models import CandleSeries, Fill, OrderIntent, Position
 
 
 _TIMEFRAME_MAP = {
-    "1m": Client.KLINE_INTERVAL_1MINUTE,
-    "5m": Client.KLINE_INTERVAL_5MINUTE,
-    "15m": Client.KLINE_INTERVAL_15MINUTE,
-    "1h": Client.KLINE_INTERVAL_1HOUR,
+    "1m": "1m",
+    "5m": "5m",
+    "15m": "15m",
+    "1h": "1h",
 }
 
 
 class BinanceSpotAdapter(BrokerAdapter):
-    def __init__(self, api_key: str = "", api_secret: str = "") -> None:
-        self.client = Client(api_key, api_secret)
-        self._precision_cache: dict[str, dict[str, Decimal]] = {}
+    def __init__(
+        self,
+        api_key: str = "",
+        api_secret: str = "",
+        http: httpx.AsyncClient | None = None,
+        limiter: WeightLimiter | None = None,
+        filters: SymbolFilterCache | None = None,
+    ) -> None:
+        self.client = BinanceRestClient(api_key, api_secret, http=http, limiter=limiter)
+        self.filters = filters or SymbolFilterCache()
         self._has_keys = bool(api_key and api_secret)
 
-    async def fetch_candles(self, symbol: str, timeframe: str, limit: int = 200) -> list[Candle]:
+    async def fetch_candles(self, symbol: str, timeframe: str, limit: int = 200) -> CandleSeries:
         interval = _TIMEFRAME_MAP.get(timeframe)
         if not interval:
             raise ValueError(f"Unsupported timeframe: {timeframe}")
-        klines = await asyncio.to_thread(self.client.get_klines, symbol=symbol, interval=interval, limit=limit)
-        candles = []
-        for k in klines:
-            candles.append(
-                Candle(
-                    ts=int(k[0] / 1000),
-                    open=float(k[1]),
-                    high=float(k[2]),
-                    low=float(k[3]),
-                    close=float(k[4]),
-                    volume=float(k[5]),
-                )
-            )
-        return candles
+        klines = await self.client.get_klines(symbol, interval, limit=limit)
+        return _klines_to_series(klines)
+
+    async def fetch_candle_range(self, symbol: str, timeframe: str, start_ts: int, end_ts: int, limit: int = 1000) -> CandleSeries:
+        interval = _TIMEFRAME_MAP.get(timeframe)
+        if not interval:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
+        klines = await self.client.get_klines(
+            symbol,
+            interval,
+            limit=limit,
+            start_time=start_ts * 1000,
+            end_time=end_ts * 1000,
+            priority=PRIORITY_BACKFILL,
+        )
+        return _klines_to_series(klines)
 
     async def get_positions(self) -> list[Position]:
         return []
 
+    async def prepare(self, symbols: list[str]) -> list[str]:
+        return await self.filters.preload(self.client, symbols)
+
     async def get_spread(self, symbol: str) -> float:
-        depth = await asyncio.to_thread(self.client.get_order_book, symbol=symbol, limit=5)
-        bid = float(depth["bids"][0][0])
-        ask = float(depth["asks"][0][0])
-        return (ask - bid) / ask
+        return (await self.get_spreads([symbol]))[symbol]
+
+    async def get_spreads(self, symbols: list[str]) -> dict[str, float]:
+        tickers = await self.client.get_book_tickers(symbols)
+        return {t["symbol"]: _spread(float(t["bidPrice"]), float(t["askPrice"])) for t in tickers}
 
     async def place_order(self, intent: OrderIntent) -> Fill:
         if not self._has_keys:
             raise RuntimeError("Binance API keys missing for live order")
-        qty = self._round_qty(intent.symbol, intent.qty)
-        side = Client.SIDE_BUY if intent.side == "BUY" else Client.SIDE_SELL
+        filters = self.filters.get(intent.symbol)
+        qty = filters.round_qty(intent.qty)
+        price = filters.round_price(intent.price) if intent.price is not None else None
+        filters.validate(qty, price)
+        if price is None:
+            filters.validate(qty, await self._reference_price(intent))
+        side = "BUY" if intent.side == "BUY" else "SELL"
+        params: dict[str, Any] = {"symbol": intent.symbol, "side": side, "quantity": str(qty), "newOrderRespType": "FULL"}
+        if price is None:
+            params["type"] = "MARKET"
+        else:
+            params.update(type="LIMIT", timeInForce="GTC", price=str(price))
         try:
-            resp = await asyncio.to_thread(
-                self.client.create_order,
-                symbol=intent.symbol,
-                side=side,
-                type=Client.ORDER_TYPE_MARKET,
-                quantity=str(qty),
-            )
-        except BinanceAPIException as exc:
+            resp = await self.client.create_order(**params)
+        except BinanceAPIError as exc:
             raise RuntimeError(f"Binance order failed: {exc.message}") from exc
         fills = resp.get("fills", [])
-        price = float(fills[0]["price"]) if fills else float(resp.get("price", 0.0))
+        fill_price = float(fills[0]["price"]) if fills else float(resp.get("price", 0.0))
         order_id = str(resp.get("orderId"))
-        return Fill(order_id=order_id, symbol=intent.symbol, side=intent.side, qty=float(qty), price=price)
-
-    def _round_qty(self, symbol: str, qty: float) -> float:
-        info = self._precision_cache.get(symbol)
-        if not info:
-            info = self._load_precision(symbol)
-            self._precision_cache[symbol] = info
-        step = info["step"]
-        rounded = (Decimal(str(qty)) // step) * step
-        return float(rounded)
-
-    def _load_precision(self, symbol: str) -> dict[str, Decimal]:
-        info = self.client.get_symbol_info(symbol)
-        if not info:
-            raise RuntimeError(f"Symbol not found: {symbol}")
-        lot_filter = next(f for f in info["filters"] if f["filterType"] == "LOT_SIZE")
-        step = Decimal(lot_filter["stepSize"])
-        return {"step": step}
+        return Fill(order_id=order_id, symbol=intent.symbol, side=intent.side, qty=float(qty), price=fill_price)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    async def _reference_price(self, intent: OrderIntent) -> Decimal:
+        if intent.ref_price is not None:
+            return Decimal(str(intent.ref_price))
+        ticker = (await self.client.get_book_tickers([intent.symbol]))[0]
+        return Decimal(ticker["askPrice"] if intent.side == "BUY" else ticker["bidPrice"])
+
+
+def _spread(bid: float, ask: float) -> float:
+    if ask <= 0:
+        return 0.0
+    return (ask - bid) / ask
+
+
+def _klines_to_series(klines: list[list[Any]]) -> CandleSeries:
+    if not klines:
+        return CandleSeries.empty()
+    columns = list(zip(*klines))
+    return CandleSeries(
+        np.array(columns[0], dtype=np.int64) // 1000,
+        np.array(columns[1], dtype=np.float64),
+        np.array(columns[2], dtype=np.float64),
+        np.array(columns[3], dtype=np.float64),
+        np.array(columns[4], dtype=np.float64),
+        np.array(columns[5], dtype=np.float64),
+    )
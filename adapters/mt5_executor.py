@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Callable, Hashable
+
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class MT5Account:
+    login: str
+    password: str
+    server: str
+
+
+@dataclass
+class _Job:
+    account: MT5Account | None
+    fn: Callable[..., Any]
+    args: tuple
+    key: Hashable | None
+    future: asyncio.Future
+    loop: asyncio.AbstractEventLoop
+    result: Any = None
+    error: BaseException | None = None
+
+
+_STOP = object()
+
+
+class MT5Executor:
+    def __init__(self, module: ModuleType, max_batch: int = 64) -> None:
+        self.mt5 = module
+        self.max_batch = max_batch
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._closed = False
+        self._account: MT5Account | None = None
+        self.batches = 0
+        self.jobs = 0
+        self.coalesced = 0
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        account: MT5Account | None = None,
+        key: Hashable | None = None,
+    ) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._ensure_thread()
+        self._queue.put(_Job(account, fn, args, key, future, loop))
+        return future
+
+    def shutdown(self) -> None:
+        with _shared_lock:
+            if _shared.get(id(self.mt5)) is self:
+                del _shared[id(self.mt5)]
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join()
+
+    def stats(self) -> dict[str, int]:
+        return {"batches": self.batches, "jobs": self.jobs, "coalesced": self.coalesced}
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MT5 executor is shut down")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mt5", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stopping = True
+                batch = [job for job in batch if job is not _STOP]
+            self._execute(batch)
+        if self._initialized:
+            self.mt5.shutdown()
+            self._initialized = False
+            self._account = None
+
+    def _execute(self, batch: list[_Job]) -> None:
+        shared: dict[tuple, _Job] = {}
+        accounts: dict[MT5Account | None, list[_Job]] = {}
+        for job in batch:
+            accounts.setdefault(job.account, []).append(job)
+        for job in (job for jobs in accounts.values() for job in jobs):
+            dedupe = (job.account, job.key) if job.key is not None else None
+            if dedupe is not None and dedupe in shared:
+                source = shared[dedupe]
+                job.result, job.error = source.result, source.error
+                self.coalesced += 1
+                continue
+            try:
+                self._connect(job.account)
+                job.result = job.fn(self.mt5, *job.args)
+            except Exception as exc:
+                job.error = exc
+            if dedupe is not None:
+                shared[dedupe] = job
+        self.batches += 1
+        self.jobs += len(batch)
+        loops: dict[asyncio.AbstractEventLoop, list[_Job]] = {}
+        for job in batch:
+            loops.setdefault(job.loop, []).append(job)
+        for loop, jobs in loops.items():
+            try:
+                loop.call_soon_threadsafe(_resolve, jobs)
+            except RuntimeError:
+                logger.warning("Dropping {} MT5 results for a closed event loop", len(jobs))
+
+    def _connect(self, account: MT5Account | None) -> None:
+        if not self._initialized:
+            if not self.mt5.initialize():
+                raise RuntimeError(f"MT5 initialize failed: {self.mt5.last_error()}")
+            self._initialized = True
+        if account is None or account == self._account:
+            return
+        if not self.mt5.login(int(account.login), password=account.password, server=account.server):
+            self._account = None
+            raise RuntimeError(f"MT5 login failed: {self.mt5.last_error()}")
+        self._account = account
+
+
+def _resolve(jobs: list[_Job]) -> None:
+    for job in jobs:
+        if job.future.done():
+            continue
+        if job.error is not None:
+            job.future.set_exception(job.error)
+        else:
+            job.future.set_result(job.result)
+
+
+_shared: dict[int, MT5Executor] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_executor(module: ModuleType) -> MT5Executor:
+    with _shared_lock:
+        executor = _shared.get(id(module))
+        if executor is None:
+            executor = _shared[id(module)] = MT5Executor(module)
+        return executor
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 import asyncio
-import time
-from typing import Any
+from types import ModuleType
+from typing import Any, Callable, Hashable
 
 try:
     import MetaTrader5 as mt5
@@ -10,90 +10,114 @@ except Exception:  # pragma: no cover - runtime gated
     mt5 = None
 
 from adapters.base import BrokerAdapter
-from engine.models import Candle, Fill, OrderIntent, Position
+from adapters.mt5_executor import MT5Account, MT5Executor, shared_executor
+from engine.models import CandleSeries, Fill, OrderIntent, Position
 
 
 class MT5Adapter(BrokerAdapter):
-    def __init__(self, login: str, password: str, server: str, symbol_map: dict[str, str] | None = None) -> None:
-        self.login = login
-        self.password = password
-        self.server = server
+    def __init__(
+        self,
+        login: str,
+        password: str,
+        server: str,
+        symbol_map: dict[str, str] | None = None,
+        mt5_module: ModuleType | None = None,
+        executor: MT5Executor | None = None,
+    ) -> None:
+        self.account = MT5Account(login, password, server)
         self.symbol_map = symbol_map or {}
-        self._initialized = False
-
-    def _ensure_init(self) -> None:
-        if not mt5:
-            raise RuntimeError("MetaTrader5 package not installed")
-        if self._initialized:
-            return
-        if not mt5.initialize():
-            raise RuntimeError(f"MT5 initialize failed: {mt5.last_error()}")
-        if not mt5.login(int(self.login), password=self.password, server=self.server):
-            raise RuntimeError(f"MT5 login failed: {mt5.last_error()}")
-        self._initialized = True
+        self.mt5 = mt5_module or mt5
+        self._executor = executor
 
     def _map_symbol(self, symbol: str) -> str:
         return self.symbol_map.get(symbol, symbol)
 
-    async def fetch_candles(self, symbol: str, timeframe: str, limit: int = 200) -> list[Candle]:
-        self._ensure_init()
-        tf_map = {"1m": mt5.TIMEFRAME_M1, "5m": mt5.TIMEFRAME_M5, "15m": mt5.TIMEFRAME_M15, "1h": mt5.TIMEFRAME_H1}
+    def _submit(self, fn: Callable[..., Any], *args: Any, key: Hashable | None = None) -> asyncio.Future:
+        if self._executor is None:
+            if not self.mt5:
+                raise RuntimeError("MetaTrader5 package not installed")
+            self._executor = shared_executor(self.mt5)
+        return self._executor.submit(fn, *args, account=self.account, key=key)
+
+    async def fetch_candles(self, symbol: str, timeframe: str, limit: int = 200) -> CandleSeries:
+        if not self.mt5:
+            raise RuntimeError("MetaTrader5 package not installed")
+        tf_map = {
+            "1m": self.mt5.TIMEFRAME_M1,
+            "5m": self.mt5.TIMEFRAME_M5,
+            "15m": self.mt5.TIMEFRAME_M15,
+            "1h": self.mt5.TIMEFRAME_H1,
+        }
         tf = tf_map.get(timeframe)
         if tf is None:
             raise ValueError(f"Unsupported timeframe: {timeframe}")
         mapped = self._map_symbol(symbol)
-        rates = await asyncio.to_thread(mt5.copy_rates_from_pos, mapped, tf, 0, limit)
-        if rates is None:
-            raise RuntimeError(f"MT5 copy_rates failed: {mt5.last_error()}")
-        candles = [
-            Candle(ts=int(r[0]), open=float(r[1]), high=float(r[2]), low=float(r[3]), close=float(r[4]), volume=float(r[5]))
-            for r in rates
-        ]
-        return candles
+        return await self._submit(_copy_rates, mapped, tf, limit, key=("rates", mapped, tf, limit))
 
     async def get_positions(self) -> list[Position]:
-        self._ensure_init()
-        positions = await asyncio.to_thread(mt5.positions_get)
-        if positions is None:
-            return []
-        results = []
-        for p in positions:
-            results.append(Position(symbol=p.symbol, qty=float(p.volume), avg_price=float(p.price_open)))
-        return results
+        return await self._submit(_positions, key=("positions",))
 
     async def get_spread(self, symbol: str) -> float:
-        self._ensure_init()
-        mapped = self._map_symbol(symbol)
-        tick = await asyncio.to_thread(mt5.symbol_info_tick, mapped)
-        if tick is None:
-            raise RuntimeError(f"MT5 tick failed: {mt5.last_error()}")
-        if tick.ask == 0:
-            return 0.0
-        return (tick.ask - tick.bid) / tick.ask
+        return (await self.get_spreads([symbol]))[symbol]
+
+    async def get_spreads(self, symbols: list[str]) -> dict[str, float]:
+        mapped = tuple(self._map_symbol(s) for s in symbols)
+        spreads = await self._submit(_spreads, mapped, key=("spreads", mapped))
+        return dict(zip(symbols, spreads))
 
     async def place_order(self, intent: OrderIntent) -> Fill:
-        self._ensure_init()
         mapped = self._map_symbol(intent.symbol)
-        symbol_info = mt5.symbol_info(mapped)
-        if symbol_info is None:
-            raise RuntimeError(f"MT5 symbol info failed: {mt5.last_error()}")
-        if not symbol_info.visible:
-            mt5.symbol_select(mapped, True)
-        order_type = mt5.ORDER_TYPE_BUY if intent.side == "BUY" else mt5.ORDER_TYPE_SELL
-        price = mt5.symbol_info_tick(mapped).ask if intent.side == "BUY" else mt5.symbol_info_tick(mapped).bid
-        request = {
-            "action": mt5.TRADE_ACTION_DEAL,
-            "symbol": mapped,
-            "volume": intent.qty,
-            "type": order_type,
-            "price": price,
-            "deviation": 10,
-            "magic": 234000,
-            "comment": "tg-bot",
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": mt5.ORDER_FILLING_IOC,
-        }
-        result = await asyncio.to_thread(mt5.order_send, request)
-        if result is None or result.retcode != mt5.TRADE_RETCODE_DONE:
-            raise RuntimeError(f"MT5 order failed: {result}")
-        return Fill(order_id=str(result.order), symbol=intent.symbol, side=intent.side, qty=intent.qty, price=price)
+        order, price = await self._submit(_send_order, mapped, intent.side, intent.qty)
+        return Fill(order_id=str(order), symbol=intent.symbol, side=intent.side, qty=intent.qty, price=price)
+
+
+def _copy_rates(mt5: ModuleType, symbol: str, timeframe: int, limit: int) -> CandleSeries:
+    rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, limit)
+    if rates is None:
+        raise RuntimeError(f"MT5 copy_rates failed: {mt5.last_error()}")
+    return CandleSeries(rates["time"], rates["open"], rates["high"], rates["low"], rates["close"], rates["tick_volume"])
+
+
+def _positions(mt5: ModuleType) -> list[Position]:
+    positions = mt5.positions_get()
+    if positions is None:
+        return []
+    return [Position(symbol=p.symbol, qty=float(p.volume), avg_price=float(p.price_open)) for p in positions]
+
+
+def _spreads(mt5: ModuleType, symbols: tuple[str, ...]) -> list[float]:
+    spreads = []
+    for symbol in symbols:
+        tick = mt5.symbol_info_tick(symbol)
+        if tick is None:
+            raise RuntimeError(f"MT5 tick failed: {mt5.last_error()}")
+        spreads.append(0.0 if tick.ask == 0 else (tick.ask - tick.bid) / tick.ask)
+    return spreads
+
+
+def _send_order(mt5: ModuleType, symbol: str, side: str, qty: float) -> tuple[int, float]:
+    symbol_info = mt5.symbol_info(symbol)
+    if symbol_info is None:
+        raise RuntimeError(f"MT5 symbol info failed: {mt5.last_error()}")
+    if not symbol_info.visible:
+        mt5.symbol_select(symbol, True)
+    tick = mt5.symbol_info_tick(symbol)
+    if tick is None:
+        raise RuntimeError(f"MT5 tick failed: {mt5.last_error()}")
+    price = tick.ask if side == "BUY" else tick.bid
+    request = {
+        "action": mt5.TRADE_ACTION_DEAL,
+        "symbol": symbol,
+        "volume": qty,
+        "type": mt5.ORDER_TYPE_BUY if side == "BUY" else mt5.ORDER_TYPE_SELL,
+        "price": price,
+        "deviation": 10,
+        "magic": 234000,
+        "comment": "tg-bot",
+        "type_time": mt5.ORDER_TIME_GTC,
+        "type_filling": mt5.ORDER_FILLING_IOC,
+    }
+    result = mt5.order_send(request)
+    if result is None or result.retcode != mt5.TRADE_RETCODE_DONE:
+        raise RuntimeError(f"MT5 order failed: {result}")
+    return result.order, price
@@ -1,60 +1,101 @@
 from __future__ import annotations
 
+import itertools
 import random
-import time
-from typing import Optional
+import uuid
 
 from loguru import logger
 
 from adapters.base import BrokerAdapter
-from engine.models import Candle, Fill, OrderIntent, Position
+from engine.models import CandleSeries, Fill, OrderIntent, Position, apply_fill
+from services.market_data import MarketDataHub
 
 
-class PaperAdapter(BrokerAdapter):
-    def __init__(self, data_provider: BrokerAdapter, slippage_bps: float = 2.0, fee_bps: float = 1.0) -> None:
-        self.data_provider = data_provider
+class PaperExchange:
+    def __init__(
+        self,
+        hub: MarketDataHub,
+        source: str = "binance",
+        slippage_bps: float = 2.0,
+        fee_bps: float = 1.0,
+        seed: int = 0,
+    ) -> None:
+        self.hub = hub
+        self.source = source
         self.slippage_bps = slippage_bps
         self.fee_bps = fee_bps
-        self._positions: dict[str, Position] = {}
+        self.seed = seed
+        self.fills = 0
+        self._rngs: dict[int, random.Random] = {}
+        self._positions: dict[int, dict[str, Position]] = {}
+        self._order_prefix = f"paper-{uuid.uuid4().hex[:12]}"
+        self._order_ids = itertools.count(1)
 
-    async def fetch_candles(self, symbol: str, timeframe: str, limit: int = 200) -> list[Candle]:
-        return await self.data_provider.fetch_candles(symbol, timeframe, limit=limit)
+    def rng(self, user_id: int) -> random.Random:
+        rng = self._rngs.get(user_id)
+        if rng is None:
+            rng = self._rngs[user_id] = random.Random(f"{self.seed}:{user_id}")
+        return rng
 
-    async def get_positions(self) -> list[Position]:
-        return list(self._positions.values())
+    def quote(self, symbol: str, side: str) -> float:
+        last = self.hub.last_price(self.source, symbol)
+        if last is None:
+            raise RuntimeError(f"No fresh market price for {symbol}")
+        half_spread = (self.hub.last_spread(self.source, symbol) or 0.0) / 2
+        return last * (1 + half_spread) if side == "BUY" else last * (1 - half_spread)
 
-    async def get_spread(self, symbol: str) -> float:
-        return await self.data_provider.get_spread(symbol)
+    def positions(self, user_id: int) -> list[Position]:
+        return list(self._positions.get(user_id, {}).values())
 
-    async def place_order(self, intent: OrderIntent) -> Fill:
-        candles = await self.fetch_candles(intent.symbol, "1m", limit=1)
-        if not candles:
-            raise RuntimeError("No candles available for fill")
-        price = candles[-1].close
-        slip = price * (self.slippage_bps / 10000.0) * random.uniform(0.5, 1.5)
-        fill_price = price + slip if intent.side == "BUY" else price - slip
+    def execute(self, user_id: int, intent: OrderIntent) -> Fill:
+        buy = intent.side == "BUY"
+        price = self.quote(intent.symbol, intent.side)
+        slip = price * (self.slippage_bps / 10000.0) * self.rng(user_id).uniform(0.5, 1.5)
+        fill_price = price + slip if buy else price - slip
+        if intent.price is not None and (fill_price > intent.price if buy else fill_price < intent.price):
+            raise RuntimeError(f"Paper limit {intent.side} {intent.symbol} @ {intent.price} not marketable at {fill_price}")
         fee = fill_price * (self.fee_bps / 10000.0)
-        final_price = fill_price + fee if intent.side == "BUY" else fill_price - fee
         fill = Fill(
-            order_id=f"paper-{int(time.time() * 1000)}",
+            order_id=f"{self._order_prefix}-{next(self._order_ids)}",
             symbol=intent.symbol,
             side=intent.side,
             qty=intent.qty,
-            price=final_price,
+            price=fill_price + fee if buy else fill_price - fee,
         )
-        self._apply_fill(fill)
-        logger.info("Paper fill: {}", fill)
+        self._apply_fill(user_id, fill)
+        self.fills += 1
+        logger.debug("Paper fill for user {}: {}", user_id, fill)
         return fill
 
-    def _apply_fill(self, fill: Fill) -> None:
-        pos = self._positions.get(fill.symbol)
-        if not pos:
-            qty = fill.qty if fill.side == "BUY" else -fill.qty
-            self._positions[fill.symbol] = Position(fill.symbol, qty, fill.price)
-            return
-        new_qty = pos.qty + (fill.qty if fill.side == "BUY" else -fill.qty)
-        if new_qty == 0:
-            self._positions.pop(fill.symbol, None)
-            return
-        avg_price = ((pos.avg_price * pos.qty) + (fill.price * fill.qty)) / new_qty
-        self._positions[fill.symbol] = Position(fill.symbol, new_qty, avg_price)
+    def _apply_fill(self, user_id: int, fill: Fill) -> None:
+        positions = self._positions.setdefault(user_id, {})
+        pos = positions.get(fill.symbol)
+        qty, avg_price = apply_fill(pos.qty, pos.avg_price, fill) if pos else apply_fill(0.0, 0.0, fill)
+        if qty:
+            positions[fill.symbol] = Position(fill.symbol, qty, avg_price)
+        else:
+            positions.pop(fill.symbol, None)
+
+
+class PaperAdapter(BrokerAdapter):
+    def __init__(self, data_provider: BrokerAdapter, exchange: PaperExchange, user_id: int) -> None:
+        self.data_provider = data_provider
+        self.exchange = exchange
+        self.user_id = user_id
+
+    async def fetch_candles(self, symbol: str, timeframe: str, limit: int = 200) -> CandleSeries:
+        return await self.data_provider.fetch_candles(symbol, timeframe, limit=limit)
+
+    async def get_positions(self) -> list[Position]:
+        return self.exchange.positions(self.user_id)
+
+    async def get_spread(self, symbol: str) -> float:
+        return await self.data_provider.get_spread(symbol)
+
+    async def get_spreads(self, symbols: list[str]) -> dict[str, float]:
+        return await self.data_provider.get_spreads(symbols)
+
+    async def place_order(self, intent: OrderIntent) -> Fill:
+        if self.exchange.hub.last_price(self.exchange.source, intent.symbol) is None:
+            await self.data_provider.fetch_candles(intent.symbol, "1m", limit=1)
+        return self.exchange.execute(self.user_id, intent)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Callable
+
+PRIORITY_ORDER = 0
+PRIORITY_ACCOUNT = 1
+PRIORITY_MARKET_DATA = 2
+PRIORITY_BACKFILL = 3
+
+_FIXED_WEIGHTS = {
+    "/api/v3/klines": 2,
+    "/api/v3/exchangeInfo": 20,
+    "/api/v3/order": 1,
+    "/api/v3/account": 20,
+}
+
+
+def request_weight(path: str, params: dict[str, Any] | None = None) -> int:
+    params = params or {}
+    if path == "/api/v3/depth":
+        limit = int(params.get("limit", 100))
+        if limit <= 100:
+            return 5
+        if limit <= 500:
+            return 25
+        if limit <= 1000:
+            return 50
+        return 250
+    if path in ("/api/v3/ticker/bookTicker", "/api/v3/ticker/price"):
+        return 2 if "symbol" in params else 4
+    return _FIXED_WEIGHTS.get(path, 1)
+
+
+class WeightLimiter:
+    def __init__(
+        self,
+        limit: int = 6000,
+        window: float = 60.0,
+        headroom: float = 0.9,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = max(1.0, limit * headroom)
+        self.rate = self.capacity / window
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._queue: list[tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self.granted = 0
+        self.queued = 0
+        self.throttled = 0
+
+    async def acquire(self, weight: int, priority: int = PRIORITY_MARKET_DATA) -> None:
+        weight = min(float(weight), self.capacity)
+        self._refill()
+        if not self._queue and self._tokens >= weight and self._clock() >= self._blocked_until:
+            self._tokens -= weight
+            self.granted += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._seq), weight, future))
+        self.queued += 1
+        self._drain()
+        await future
+
+    def observe(self, used_weight: int, limit: int | None = None) -> None:
+        self._refill()
+        capacity = self.capacity if limit is None else min(self.capacity, float(limit))
+        self._tokens = min(self._tokens, capacity - used_weight)
+        self._drain()
+
+    def penalize(self, seconds: float) -> None:
+        self.throttled += 1
+        self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+        self._tokens = min(self._tokens, 0.0)
+        self._drain()
+
+    def stats(self) -> dict[str, float]:
+        self._refill()
+        return {
+            "budget": round(self._tokens, 1),
+            "capacity": round(self.capacity, 1),
+            "queue_depth": sum(1 for *_, f in self._queue if not f.done()),
+            "granted": self.granted,
+            "queued": self.queued,
+            "throttled": self.throttled,
+        }
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _drain(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._refill()
+        now = self._clock()
+        while self._queue:
+            _, _, weight, future = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+            if now < self._blocked_until or self._tokens < weight:
+                break
+            heapq.heappop(self._queue)
+            self._tokens -= weight
+            self.granted += 1
+            future.set_result(None)
+        if not self._queue:
+            return
+        weight = self._queue[0][2]
+        delay = max(self._blocked_until - now, (weight - self._tokens) / self.rate, 0.001)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._drain)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from typing import Any, Callable
+
+from loguru import logger
+
+from adapters.binance_rest import BinanceAPIError, BinanceRestClient
+from data.store import AsyncStore
+
+
+@dataclass(frozen=True)
+class SymbolFilters:
+    symbol: str
+    step_size: Decimal = Decimal(0)
+    min_qty: Decimal = Decimal(0)
+    tick_size: Decimal = Decimal(0)
+    min_notional: Decimal = Decimal(0)
+
+    def round_qty(self, qty: float) -> Decimal:
+        return _floor(Decimal(str(qty)), self.step_size)
+
+    def round_price(self, price: float) -> Decimal:
+        return _floor(Decimal(str(price)), self.tick_size)
+
+    def validate(self, qty: Decimal, price: Decimal | None = None) -> None:
+        if qty <= 0 or qty < self.min_qty:
+            raise RuntimeError(f"Quantity {qty} below LOT_SIZE minimum {self.min_qty} for {self.symbol}")
+        if price is not None and qty * price < self.min_notional:
+            raise RuntimeError(f"Notional {qty * price} below MIN_NOTIONAL {self.min_notional} for {self.symbol}")
+
+    def to_dict(self) -> dict[str, str]:
+        return {k: str(v) for k, v in asdict(self).items()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str]) -> SymbolFilters:
+        return cls(
+            symbol=data["symbol"],
+            step_size=Decimal(data["step_size"]),
+            min_qty=Decimal(data["min_qty"]),
+            tick_size=Decimal(data["tick_size"]),
+            min_notional=Decimal(data["min_notional"]),
+        )
+
+    @classmethod
+    def from_exchange_info(cls, info: dict[str, Any]) -> SymbolFilters:
+        filters = {f["filterType"]: f for f in info.get("filters", [])}
+        lot = filters.get("LOT_SIZE", {})
+        price = filters.get("PRICE_FILTER", {})
+        notional = filters.get("NOTIONAL") or filters.get("MIN_NOTIONAL") or {}
+        return cls(
+            symbol=info["symbol"],
+            step_size=Decimal(lot.get("stepSize", "0")),
+            min_qty=Decimal(lot.get("minQty", "0")),
+            tick_size=Decimal(price.get("tickSize", "0")),
+            min_notional=Decimal(notional.get("minNotional", "0")),
+        )
+
+
+class SymbolFilterCache:
+    def __init__(
+        self,
+        store: AsyncStore | None = None,
+        refresh_interval: int = 86400,
+        key: str = "binance.exchange_filters",
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.store = store
+        self.refresh_interval = refresh_interval
+        self.key = key
+        self.clock = clock
+        self._filters: dict[str, SymbolFilters] = {}
+        self._unknown: dict[str, float] = {}
+        self._loaded_at = 0.0
+        self._restored = False
+        self._lock = asyncio.Lock()
+
+    def get(self, symbol: str) -> SymbolFilters:
+        filters = self._filters.get(symbol)
+        if filters is None:
+            raise RuntimeError(f"Exchange filters not loaded for {symbol}")
+        return filters
+
+    def is_fresh(self, symbols: list[str]) -> bool:
+        if self.clock() - self._loaded_at >= self.refresh_interval:
+            return False
+        return all(symbol in self._filters for symbol in symbols)
+
+    async def preload(self, client: BinanceRestClient, symbols: list[str]) -> list[str]:
+        await self._load(client, [symbol for symbol in symbols if not self._is_unknown(symbol)])
+        unknown = [symbol for symbol in symbols if self._is_unknown(symbol)]
+        if unknown:
+            logger.warning("Skipping unknown Binance symbols: {}", ", ".join(unknown))
+        return unknown
+
+    async def _load(self, client: BinanceRestClient, symbols: list[str]) -> None:
+        if not symbols or self.is_fresh(symbols):
+            return
+        async with self._lock:
+            if not self._restored:
+                await self._restore()
+            if self.is_fresh(symbols):
+                return
+            known = sorted(self._filters)
+            new = sorted(set(symbols) - set(known))
+            try:
+                infos = await self._fetch(client, sorted(set(known) | set(new)))
+            except BinanceAPIError as exc:
+                if exc.code != -1121:
+                    raise
+                infos = await self._fetch(client, known) if known else []
+                for symbol in new:
+                    infos.extend(await self._fetch_one(client, symbol))
+            except Exception as exc:
+                if not all(symbol in self._filters for symbol in symbols):
+                    raise
+                logger.warning("Exchange filter refresh failed, keeping cached filters: {}", exc)
+                return
+            for info in infos:
+                self._filters[info["symbol"]] = SymbolFilters.from_exchange_info(info)
+            self._loaded_at = self.clock()
+            for symbol in symbols:
+                if symbol not in self._filters:
+                    self._unknown[symbol] = self._loaded_at + self.refresh_interval
+            await self._persist()
+
+    async def _fetch(self, client: BinanceRestClient, symbols: list[str]) -> list[dict[str, Any]]:
+        data = await client.get_exchange_info(symbols)
+        return list(data.get("symbols", []))
+
+    async def _fetch_one(self, client: BinanceRestClient, symbol: str) -> list[dict[str, Any]]:
+        try:
+            return await self._fetch(client, [symbol])
+        except BinanceAPIError as exc:
+            if exc.code != -1121:
+                raise
+            logger.warning("Binance rejected unknown symbol {}", symbol)
+            return []
+
+    def _is_unknown(self, symbol: str) -> bool:
+        expires = self._unknown.get(symbol)
+        if expires is None:
+            return False
+        if self.clock() < expires:
+            return True
+        del self._unknown[symbol]
+        return False
+
+    async def _restore(self) -> None:
+        self._restored = True
+        if self.store is None:
+            return
+        row = await self.store.get_meta(self.key)
+        if row is None:
+            return
+        value, updated_at = row
+        self._filters = {s: SymbolFilters.from_dict(f) for s, f in json.loads(value).items()}
+        self._loaded_at = float(updated_at)
+
+    async def _persist(self) -> None:
+        if self.store is None:
+            return
+        value = json.dumps({s: f.to_dict() for s, f in self._filters.items()})
+        await self.store.set_meta(self.key, value, int(self._loaded_at))
+
+
+def _floor(value: Decimal, step: Decimal) -> Decimal:
+    if step <= 0:
+        return value
+    return (value // step) * step
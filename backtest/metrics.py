@@ -8,7 +8,17 @@ from engine.models import TradeRecord
 @dataclass
 class BacktestMetrics:
     total_trades: int
+    net_pnl: float = 0.0
 
 
-def compute_metrics(trades: list[TradeRecord]) -> BacktestMetrics:
-    return BacktestMetrics(total_trades=len(trades))
+def compute_metrics(trades: list[TradeRecord], last_price: float | None = None) -> BacktestMetrics:
+    if not trades:
+        return BacktestMetrics(total_trades=0)
+    mark = last_price if last_price is not None else trades[-1].price
+    cash = 0.0
+    position = 0.0
+    for t in trades:
+        signed = t.qty if t.side == "BUY" else -t.qty
+        cash -= signed * t.price
+        position += signed
+    return BacktestMetrics(total_trades=len(trades), net_pnl=cash + position * mark)
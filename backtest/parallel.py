@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from backtest.metrics import BacktestMetrics, compute_metrics
+from backtest.runner import backtest_series
+from data.candle_store import CandleStore, import_csv
+from engine.models import TradeRecord
+from services.config_service import RuntimeConfig
+
+_CSV_TIMEFRAME = "csv"
+
+
+@dataclass
+class BacktestRun:
+    symbol: str
+    config_index: int
+    config: RuntimeConfig
+    trades: list[TradeRecord]
+    metrics: BacktestMetrics
+
+
+@dataclass
+class ShardTiming:
+    shard: int
+    symbol: str
+    configs: int
+    seconds: float
+
+
+@dataclass
+class ParallelBacktestResult:
+    runs: list[BacktestRun]
+    timings: list[ShardTiming]
+
+
+def run_parallel_backtest(
+    datasets: dict[str, str],
+    configs: list[RuntimeConfig],
+    workers: int | None = None,
+    chunk_size: int | None = None,
+) -> ParallelBacktestResult:
+    with tempfile.TemporaryDirectory(prefix="backtest-") as tmp:
+        store = CandleStore(tmp)
+        for symbol, path in datasets.items():
+            import_csv(store, path, symbol, _CSV_TIMEFRAME)
+        return run_store_parallel(tmp, list(datasets), _CSV_TIMEFRAME, configs, workers=workers, chunk_size=chunk_size)
+
+
+def run_store_parallel(
+    store_root: str,
+    symbols: list[str],
+    timeframe: str,
+    configs: list[RuntimeConfig],
+    workers: int | None = None,
+    chunk_size: int | None = None,
+) -> ParallelBacktestResult:
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(configs) * len(symbols) // workers))
+    shards = []
+    for symbol in symbols:
+        for start in range(0, len(configs), chunk_size):
+            indexed = list(enumerate(configs))[start : start + chunk_size]
+            shards.append((len(shards), store_root, symbol, timeframe, indexed))
+
+    if workers <= 1:
+        outputs = [_run_shard(*shard) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(_run_shard, *zip(*shards)))
+
+    runs = [run for shard_runs, _ in outputs for run in shard_runs]
+    runs.sort(key=lambda r: (symbols.index(r.symbol), r.config_index))
+    timings = sorted((timing for _, timing in outputs), key=lambda t: t.shard)
+    return ParallelBacktestResult(runs=runs, timings=timings)
+
+
+def _run_shard(
+    shard: int,
+    store_root: str,
+    symbol: str,
+    timeframe: str,
+    indexed_configs: list[tuple[int, RuntimeConfig]],
+) -> tuple[list[BacktestRun], ShardTiming]:
+    started = time.perf_counter()
+    candles = CandleStore(store_root).read(symbol, timeframe)
+    last_price = float(candles.close[-1]) if len(candles) else None
+    runs = []
+    for index, config in indexed_configs:
+        config = config.model_copy(update={"symbols": [symbol]})
+        trades = backtest_series(candles, config)
+        runs.append(BacktestRun(symbol, index, config, trades, compute_metrics(trades, last_price=last_price)))
+    timing = ShardTiming(shard=shard, symbol=symbol, configs=len(indexed_configs), seconds=time.perf_counter() - started)
+    return runs, timing
@@ -1,7 +1,22 @@
 from __future__ import annotations
 
 from backtest.metrics import BacktestMetrics
+from backtest.parallel import ShardTiming
+from backtest.sweep import SweepResult
 
 
 def render_report(metrics: BacktestMetrics) -> str:
-    return f"Total trades: {metrics.total_trades}" 
+    return f"Total trades: {metrics.total_trades}\nNet PnL: {metrics.net_pnl:.4f}"
+
+
+def render_sweep(results: list[SweepResult], top: int = 10) -> str:
+    lines = ["fast slow atr mult trades net_pnl"]
+    for r in results[:top]:
+        lines.append(
+            f"{r.fast_ma} {r.slow_ma} {r.atr_period} {r.atr_multiplier:g} {r.total_trades} {r.net_pnl:.4f}"
+        )
+    return "\n".join(lines)
+
+
+def render_timings(timings: list[ShardTiming]) -> str:
+    return "\n".join(f"shard {t.shard} {t.symbol}: {t.configs} configs in {t.seconds:.2f}s" for t in timings)
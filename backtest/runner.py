@@ -1,39 +1,40 @@
 from __future__ import annotations
 
-import pandas as pd
-
-from engine.models import Candle, TradeRecord
+from data.candle_store import CandleStore, load_csv
+from engine.models import CandleSeries, TradeRecord
 from services.config_service import RuntimeConfig
+from strategies.base import Strategy
 from strategies.ma_atr import MovingAverageAtrStrategy
 
 
 def run_backtest(csv_path: str, config: RuntimeConfig) -> list[TradeRecord]:
-    df = pd.read_csv(csv_path)
-    candles = [
-        Candle(
-            ts=int(row["timestamp"]),
-            open=float(row["open"]),
-            high=float(row["high"]),
-            low=float(row["low"]),
-            close=float(row["close"]),
-            volume=float(row.get("volume", 0)),
-        )
-        for _, row in df.iterrows()
-    ]
-    strategy = MovingAverageAtrStrategy()
+    return backtest_series(load_csv(csv_path), config)
+
+
+def run_store_backtest(
+    store: CandleStore,
+    symbol: str,
+    config: RuntimeConfig,
+    start_ts: int | None = None,
+    end_ts: int | None = None,
+) -> list[TradeRecord]:
+    candles = store.read(symbol, config.timeframe, start_ts=start_ts, end_ts=end_ts)
+    return backtest_series(candles, config.model_copy(update={"symbols": [symbol]}))
+
+
+def backtest_series(candles: CandleSeries, config: RuntimeConfig, strategy: Strategy | None = None) -> list[TradeRecord]:
+    strategy = strategy or MovingAverageAtrStrategy()
+    start = config.slow_ma + config.atr_period
     trades: list[TradeRecord] = []
-    for i in range(config.slow_ma + config.atr_period, len(candles)):
-        window = candles[: i + 1]
-        signal = strategy.generate(window, config)
-        if not signal:
+    for i, signal in strategy.stream(candles, config):
+        if i < start:
             continue
-        last = window[-1]
         trades.append(
             TradeRecord(
                 symbol=config.symbols[0],
                 side=signal.side,
                 qty=1.0,
-                price=last.close,
+                price=float(candles.close[i]),
                 mode="backtest",
                 adapter="csv",
                 order_id=None,
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from backtest.runner import load_csv
+from engine.models import CandleSeries
+from services.config_service import RuntimeConfig
+
+
+@dataclass
+class SweepResult:
+    fast_ma: int
+    slow_ma: int
+    atr_period: int
+    atr_multiplier: float
+    total_trades: int
+    net_pnl: float
+
+
+def sweep_csv(
+    csv_path: str,
+    config: RuntimeConfig,
+    fast_values: Sequence[int],
+    slow_values: Sequence[int],
+    atr_periods: Sequence[int],
+    atr_multipliers: Sequence[float],
+    rank_by: str = "net_pnl",
+) -> list[SweepResult]:
+    return run_sweep(load_csv(csv_path), config, fast_values, slow_values, atr_periods, atr_multipliers, rank_by)
+
+
+def run_sweep(
+    candles: CandleSeries,
+    config: RuntimeConfig,
+    fast_values: Sequence[int],
+    slow_values: Sequence[int],
+    atr_periods: Sequence[int],
+    atr_multipliers: Sequence[float],
+    rank_by: str = "net_pnl",
+) -> list[SweepResult]:
+    n = len(candles)
+    if n < 2:
+        return []
+    close = candles.close
+    last_close = float(close[-1])
+    fast = _rolling_means(close, fast_values)
+    slow = _rolling_means(close, slow_values)
+    atr = _rolling_means(_true_range(candles), atr_periods)
+    atr_arr = np.asarray(atr_periods)
+    multipliers = np.asarray(atr_multipliers, dtype=np.float64)
+
+    results: list[SweepResult] = []
+    with np.errstate(invalid="ignore"):
+        for fi, f in enumerate(fast_values):
+            diff = fast[fi][None, :] - slow
+            prev, cur = diff[:, :-1], diff[:, 1:]
+            side = ((prev <= 0) & (cur > 0)).astype(np.int8) - ((prev >= 0) & (cur < 0)).astype(np.int8)
+            rows, cols = np.nonzero(side)
+            bounds = np.searchsorted(rows, np.arange(len(slow_values) + 1))
+            for si, s in enumerate(slow_values):
+                idx = cols[bounds[si] : bounds[si + 1]] + 1
+                sides = side[si, idx - 1].astype(np.float64)
+                starts = np.maximum(s + atr_arr, np.maximum(np.maximum(f, s), atr_arr) + 1)
+                mask = idx[None, :] >= starts[:, None]
+                trades = mask.sum(axis=1)
+                net = (mask * (sides * (last_close - close[idx]))).sum(axis=1)
+                for ai, a in enumerate(atr_periods):
+                    for m in multipliers:
+                        results.append(
+                            SweepResult(
+                                fast_ma=int(f),
+                                slow_ma=int(s),
+                                atr_period=int(a),
+                                atr_multiplier=float(m),
+                                total_trades=int(trades[ai]),
+                                net_pnl=float(net[ai]),
+                            )
+                        )
+    results.sort(key=lambda r: getattr(r, rank_by), reverse=True)
+    return results
+
+
+def _rolling_means(values: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    base = values[0]
+    csum = np.concatenate(([0.0], np.cumsum(values - base)))
+    out = np.full((len(windows), len(values)), np.nan)
+    for row, window in enumerate(windows):
+        if 0 < window <= len(values):
+            out[row, window - 1 :] = (csum[window:] - csum[:-window]) / window + base
+    return out
+
+
+def _true_range(candles: CandleSeries) -> np.ndarray:
+    tr = candles.high - candles.low
+    prev_close = candles.close[:-1]
+    tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(candles.high[1:] - prev_close), np.abs(candles.low[1:] - prev_close)))
+    return tr
@@ -7,7 +7,8 @@ from loguru import logger
 
 from bot.middleware import AdminOnlyMiddleware, ThrottleMiddleware
 from bot.routers import build_router
-from data.store import create_store
+from data.store import AsyncStore, create_store
+from data.write_behind import FillJournal, WriteBehind
 from services.config_service import BotSettings, ConfigService
 from services.notifier import Notifier
 from services.orchestrator import EngineOrchestrator
@@ -15,8 +16,27 @@ from services.orchestrator import EngineOrchestrator
 
 async def main() -> None:
     settings = BotSettings()
-    store = create_store(settings.DATABASE_URL or None, settings.DATABASE_PATH)
-    config_service = ConfigService(store, settings)
+    store = create_store(
+        settings.DATABASE_URL or None,
+        settings.DATABASE_PATH,
+        sqlite_cache_size_kb=settings.SQLITE_CACHE_SIZE_KB,
+        pool_min_size=settings.DB_POOL_MIN_SIZE,
+        pool_max_size=settings.DB_POOL_MAX_SIZE,
+        pool_max_idle=settings.DB_POOL_MAX_IDLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    db = AsyncStore(store, max_workers=settings.DB_EXECUTOR_WORKERS)
+    writes = WriteBehind(
+        db,
+        FillJournal(settings.WRITE_JOURNAL_PATH),
+        max_batch=settings.WRITE_BATCH_SIZE,
+        flush_interval=settings.WRITE_FLUSH_INTERVAL,
+        max_attempts=settings.WRITE_MAX_ATTEMPTS,
+        dead_letter=FillJournal(settings.WRITE_DEAD_LETTER_PATH),
+        flush_timeout=settings.WRITE_FLUSH_TIMEOUT,
+    )
+    await writes.recover()
+    config_service = ConfigService(db, settings)
     notifier = Notifier()
 
     bot = Bot(token=settings.TELEGRAM_BOT_TOKEN)
@@ -26,13 +46,18 @@ async def main() -> None:
     dp.message.middleware(ThrottleMiddleware())
     dp.callback_query.middleware(ThrottleMiddleware())
 
-    orchestrator = EngineOrchestrator(store, settings, notifier)
-    router = build_router(orchestrator, store, config_service)
+    orchestrator = EngineOrchestrator(db, settings, notifier, config_service, writes)
+    router = build_router(orchestrator, db, config_service)
     dp.include_router(router)
 
     await notifier.start(bot)
     logger.info("Bot starting")
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        await orchestrator.close()
+        await writes.close()
+        db.close()
 
 
 if __name__ == "__main__":
@@ -9,15 +9,15 @@ from aiogram.types import Message, CallbackQuery
 from services.config_service import BotSettings
 
 
-def _is_admin(user_id: int, settings: BotSettings) -> bool:
+def is_admin(user_id: int, settings: BotSettings) -> bool:
     ids = {int(x.strip()) for x in settings.ADMIN_TELEGRAM_IDS.split(",") if x.strip()}
     return user_id in ids
 
 
-def _is_allowed(user_id: int, settings: BotSettings) -> bool:
+def is_allowed(user_id: int, settings: BotSettings) -> bool:
     if settings.ALLOW_ALL_USERS:
         return True
-    return _is_admin(user_id, settings)
+    return is_admin(user_id, settings)
 
 
 class AdminOnlyMiddleware(BaseMiddleware):
@@ -30,7 +30,7 @@ class AdminOnlyMiddleware(BaseMiddleware):
             user = event.from_user
         elif isinstance(event, CallbackQuery):
             user = event.from_user
-        if user and not _is_allowed(user.id, self.settings):
+        if user and not is_allowed(user.id, self.settings):
             if isinstance(event, Message):
                 await event.answer("Access denied. This bot is admin-only.")
             elif isinstance(event, CallbackQuery):
@@ -5,31 +5,37 @@ from aiogram.filters import CommandStart, Command
 from aiogram.types import Message, CallbackQuery
 
 from bot import keyboards, messages
+from bot.middleware import is_admin
 from backtest.metrics import compute_metrics
 from backtest.report import render_report
-from backtest.runner import run_backtest
+from backtest.runner import run_backtest, run_store_backtest
+import asyncio
 import json
+import time
 
-from data.store import BaseStore
+from data.candle_store import CandleStore, import_csv, resolve_import_path
+from data.store import AsyncStore
 from engine.state import EngineStateStore
 from services.config_service import ConfigService
 from services.crypto import build_fernet, encrypt
+from services.kline_downloader import KlineDownloader
 from services.orchestrator import EngineOrchestrator
 
 
 def build_router(
     orchestrator: EngineOrchestrator,
-    store: BaseStore,
+    store: AsyncStore,
     config_service: ConfigService,
 ) -> Router:
     router = Router()
     pending_setting: dict[int, str] = {}
     pending_credentials: dict[int, dict[str, str]] = {}
     fernet = build_fernet(orchestrator.settings.CREDENTIAL_ENCRYPTION_KEY)
+    candle_store = CandleStore(orchestrator.settings.CANDLE_STORE_PATH)
 
     @router.message(CommandStart())
     async def start_cmd(message: Message) -> None:
-        store.ensure_user(message.from_user.id, message.from_user.username)
+        await store.ensure_user(message.from_user.id, message.from_user.username)
         await message.answer(messages.main_menu_text(), reply_markup=keyboards.main_menu())
 
     @router.callback_query(lambda c: c.data == "main_menu")
@@ -39,10 +45,12 @@ def build_router(
     @router.callback_query(lambda c: c.data == "status")
     async def status_cb(query: CallbackQuery) -> None:
         user_id = query.from_user.id
-        config = config_service.load(user_id)
-        state = EngineStateStore(store, user_id).load()
-        positions = store.list_positions(user_id)
-        trades = store.list_trades(user_id, limit=1)
+        config, state, positions, trades = await asyncio.gather(
+            config_service.load(user_id),
+            EngineStateStore(store, user_id).load(),
+            store.list_positions(user_id),
+            store.list_trades(user_id, limit=1),
+        )
         await query.message.edit_text(
             messages.status_text(config, state, positions, trades[0] if trades else None),
             reply_markup=keyboards.main_menu(),
@@ -51,7 +59,7 @@ def build_router(
     @router.callback_query(lambda c: c.data == "start_paper")
     async def start_paper_cb(query: CallbackQuery) -> None:
         user_id = query.from_user.id
-        config_service.update_for_user(user_id, "MODE", "paper")
+        await config_service.update_for_user(user_id, "MODE", "paper")
         await orchestrator.start(user_id, chat_id=str(query.message.chat.id))
         await query.answer("Engine started (paper)")
 
@@ -62,7 +70,7 @@ def build_router(
     @router.callback_query(lambda c: c.data == "confirm_live")
     async def confirm_live_cb(query: CallbackQuery) -> None:
         user_id = query.from_user.id
-        config_service.update_for_user(user_id, "MODE", "live")
+        await config_service.update_for_user(user_id, "MODE", "live")
         await orchestrator.start(user_id, chat_id=str(query.message.chat.id))
         await query.message.edit_text("Live trading enabled.", reply_markup=keyboards.main_menu())
 
@@ -73,18 +81,26 @@ def build_router(
 
     @router.callback_query(lambda c: c.data == "backtest")
     async def backtest_cb(query: CallbackQuery) -> None:
-        await query.message.answer("Backtest requested. Use /backtest CSV_PATH.")
+        await query.message.answer("Backtest requested. Use /backtest CSV_PATH or /backtest SYMBOL.")
 
     @router.message(Command("backtest"))
     async def backtest_cmd(message: Message) -> None:
         parts = message.text.split(maxsplit=1)
         if len(parts) < 2:
-            await message.answer("Usage: /backtest /path/to/file.csv")
+            await message.answer("Usage: /backtest file.csv or /backtest SYMBOL")
             return
-        path = parts[1].strip()
+        target = parts[1].strip()
         try:
-            config = config_service.load(message.from_user.id)
-            trades = run_backtest(path, config)
+            config = await config_service.load(message.from_user.id)
+            if target.lower().endswith(".csv"):
+                path = resolve_import_path(orchestrator.settings.CSV_IMPORT_DIR, target)
+                trades = await asyncio.to_thread(run_backtest, str(path), config)
+            else:
+                symbol = target.upper()
+                if not candle_store.exists(symbol, config.timeframe):
+                    await message.answer(f"No stored candles for {symbol} {config.timeframe}. Use /download or /import_csv first.")
+                    return
+                trades = await asyncio.to_thread(run_store_backtest, candle_store, symbol, config)
             metrics = compute_metrics(trades)
             await message.answer(render_report(metrics))
         except FileNotFoundError:
@@ -92,6 +108,65 @@ def build_router(
         except Exception as exc:
             await message.answer(f"Backtest failed: {exc}")
 
+    @router.message(Command("import_csv"))
+    async def import_csv_cmd(message: Message) -> None:
+        if not is_admin(message.from_user.id, orchestrator.settings):
+            await message.answer(messages.access_denied_text())
+            return
+        parts = message.text.split()
+        if len(parts) != 4:
+            await message.answer("Usage: /import_csv file.csv SYMBOL TIMEFRAME")
+            return
+        _, path, symbol, timeframe = parts
+        try:
+            path = resolve_import_path(orchestrator.settings.CSV_IMPORT_DIR, path)
+            added = await asyncio.to_thread(import_csv, candle_store, str(path), symbol.upper(), timeframe)
+            await message.answer(f"Imported {added} candles for {symbol.upper()} {timeframe}.")
+        except FileNotFoundError:
+            await message.answer("CSV file not found.")
+        except Exception as exc:
+            await message.answer(f"Import failed: {exc}")
+
+    @router.message(Command("download"))
+    async def download_cmd(message: Message) -> None:
+        if not is_admin(message.from_user.id, orchestrator.settings):
+            await message.answer(messages.access_denied_text())
+            return
+        parts = message.text.split()
+        if len(parts) != 4 or not parts[3].isdigit():
+            await message.answer("Usage: /download SYMBOL TIMEFRAME DAYS")
+            return
+        _, symbol, timeframe, days = parts
+        downloader = KlineDownloader(
+            orchestrator.public_binance(),
+            candle_store,
+            concurrency=orchestrator.settings.KLINE_DOWNLOAD_CONCURRENCY,
+        )
+        try:
+            added = await downloader.download(symbol, timeframe, int(time.time()) - int(days) * 86400)
+            await message.answer(f"Downloaded {added} candles for {symbol.upper()} {timeframe}.")
+        except Exception as exc:
+            await message.answer(f"Download failed: {exc}")
+
+    @router.message(Command("dbstats"))
+    async def dbstats_cmd(message: Message) -> None:
+        if not is_admin(message.from_user.id, orchestrator.settings):
+            await message.answer(messages.access_denied_text())
+            return
+        stats = await store.pool_stats()
+        lines = [f"{k}: {v}" for k, v in sorted(stats.items())] or ["no pool statistics"]
+        queue = [f"{k}: {v}" for k, v in sorted(orchestrator.writes.stats().items())]
+        await message.answer("DB pool:\n" + "\n".join(lines) + "\n\nWrite queue:\n" + "\n".join(queue))
+
+    @router.message(Command("apistats"))
+    async def apistats_cmd(message: Message) -> None:
+        if not is_admin(message.from_user.id, orchestrator.settings):
+            await message.answer(messages.access_denied_text())
+            return
+        stats = orchestrator.binance_limiter.stats()
+        lines = [f"{k}: {v}" for k, v in sorted(stats.items())]
+        await message.answer("Binance request weight:\n" + "\n".join(lines))
+
     @router.callback_query(lambda c: c.data == "settings")
     async def settings_cb(query: CallbackQuery) -> None:
         await query.message.edit_text(messages.settings_text(), reply_markup=keyboards.settings_menu())
@@ -103,7 +178,7 @@ def build_router(
     @router.callback_query(lambda c: c.data.startswith("adapter:"))
     async def adapter_set_cb(query: CallbackQuery) -> None:
         adapter = query.data.split(":", 1)[1]
-        config_service.update_for_user(query.from_user.id, "ADAPTER", adapter)
+        await config_service.update_for_user(query.from_user.id, "ADAPTER", adapter)
         await query.message.edit_text(f"Adapter set to {adapter}", reply_markup=keyboards.settings_menu())
 
     @router.callback_query(lambda c: c.data == "set_symbols")
@@ -118,7 +193,7 @@ def build_router(
     @router.callback_query(lambda c: c.data.startswith("timeframe:"))
     async def timeframe_set_cb(query: CallbackQuery) -> None:
         tf = query.data.split(":", 1)[1]
-        config_service.update_for_user(query.from_user.id, "TIMEFRAME", tf)
+        await config_service.update_for_user(query.from_user.id, "TIMEFRAME", tf)
         await query.message.edit_text(f"Timeframe set to {tf}", reply_markup=keyboards.settings_menu())
 
     @router.callback_query(lambda c: c.data == "set_risk")
@@ -134,7 +209,7 @@ def build_router(
 
     @router.callback_query(lambda c: c.data == "last_trades")
     async def last_trades_cb(query: CallbackQuery) -> None:
-        trades = store.list_trades(query.from_user.id, limit=5)
+        trades = await store.list_trades(query.from_user.id, limit=5)
         lines = [f"{t['symbol']} {t['side']} {t['qty']} @ {t['price']}" for t in trades] or ["none"]
         await query.message.answer("Last trades:\n" + "\n".join(lines))
 
@@ -167,7 +242,7 @@ def build_router(
                 else:
                     cred_state["api_secret"] = text
                     payload = json.dumps({"api_key": cred_state["api_key"], "api_secret": cred_state["api_secret"]})
-                    store.set_credentials(user_id, "binance", encrypt(fernet, payload))
+                    await store.set_credentials(user_id, "binance", encrypt(fernet, payload))
                     pending_credentials.pop(user_id, None)
                     await message.answer("Binance credentials saved.")
             elif cred_state["adapter"] == "mt5":
@@ -188,7 +263,7 @@ def build_router(
                             "server": cred_state["server"],
                         }
                     )
-                    store.set_credentials(user_id, "mt5", encrypt(fernet, payload))
+                    await store.set_credentials(user_id, "mt5", encrypt(fernet, payload))
                     pending_credentials.pop(user_id, None)
                     await message.answer("MT5 credentials saved.")
             try:
@@ -201,7 +276,7 @@ def build_router(
         if not key:
             return
         value = message.text.strip()
-        config_service.update_for_user(user_id, key, value)
+        await config_service.update_for_user(user_id, key, value)
         await message.answer(f"Updated {key}")
 
     return router
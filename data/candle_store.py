@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from engine.models import CandleSeries
+
+_MAGIC = b"TGCANDLE"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIqqq")
+_COLUMNS = (
+    ("ts", np.int64),
+    ("open", np.float64),
+    ("high", np.float64),
+    ("low", np.float64),
+    ("close", np.float64),
+    ("volume", np.float64),
+)
+
+
+class CandleStore:
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def path(self, symbol: str, timeframe: str) -> Path:
+        return self.root / symbol.upper() / timeframe
+
+    def exists(self, symbol: str, timeframe: str) -> bool:
+        return (self.path(symbol, timeframe) / "header.bin").exists()
+
+    def info(self, symbol: str, timeframe: str) -> tuple[int, int | None, int | None]:
+        header = self.path(symbol, timeframe) / "header.bin"
+        if not header.exists():
+            return 0, None, None
+        magic, version, _, count, first_ts, last_ts = _HEADER.unpack(header.read_bytes())
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Unsupported candle file: {header}")
+        if count == 0:
+            return 0, None, None
+        return count, first_ts, last_ts
+
+    def last_ts(self, symbol: str, timeframe: str) -> int | None:
+        return self.info(symbol, timeframe)[2]
+
+    def append(self, symbol: str, timeframe: str, candles: CandleSeries) -> int:
+        count, first_ts, last_ts = self.info(symbol, timeframe)
+        order = np.argsort(candles.ts, kind="stable")
+        ts = candles.ts[order]
+        keep = np.concatenate(([True], ts[1:] != ts[:-1])) if len(ts) else np.zeros(0, dtype=bool)
+        if last_ts is not None:
+            keep &= (ts < first_ts) | (ts > last_ts)
+        rows = order[keep]
+        if not len(rows):
+            return 0
+        path = self.path(symbol, timeframe)
+        path.mkdir(parents=True, exist_ok=True)
+        head = int(np.searchsorted(candles.ts[rows], first_ts)) if first_ts is not None else 0
+        if head:
+            self._prepend(path, count, candles, rows[:head])
+        for (name, dtype), column in zip(_COLUMNS, candles.columns()):
+            with open(path / f"{name}.bin", "ab") as fh:
+                fh.truncate((count + head) * np.dtype(dtype).itemsize)
+                fh.write(np.ascontiguousarray(column[rows[head:]], dtype=dtype).tobytes())
+                fh.flush()
+                os.fsync(fh.fileno())
+        new_first = int(candles.ts[rows[0]]) if first_ts is None or head else first_ts
+        new_last = int(candles.ts[rows[-1]]) if head < len(rows) else last_ts
+        self._write_header(path, count + len(rows), new_first, new_last)
+        return len(rows)
+
+    def read(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_ts: int | None = None,
+        end_ts: int | None = None,
+    ) -> CandleSeries:
+        count = self.info(symbol, timeframe)[0]
+        if count == 0:
+            return CandleSeries.empty()
+        path = self.path(symbol, timeframe)
+        columns = [np.memmap(path / f"{name}.bin", dtype=dtype, mode="r", shape=(count,)) for name, dtype in _COLUMNS]
+        series = CandleSeries(*columns)
+        lo = int(np.searchsorted(series.ts, start_ts, side="left")) if start_ts is not None else 0
+        hi = int(np.searchsorted(series.ts, end_ts, side="right")) if end_ts is not None else count
+        return series[lo:hi]
+
+    def _prepend(self, path: Path, count: int, candles: CandleSeries, rows: np.ndarray) -> None:
+        for (name, dtype), column in zip(_COLUMNS, candles.columns()):
+            existing = np.fromfile(path / f"{name}.bin", dtype=dtype, count=count)
+            with open(path / f"{name}.bin.tmp", "wb") as fh:
+                fh.write(np.ascontiguousarray(column[rows], dtype=dtype).tobytes())
+                fh.write(existing.tobytes())
+                fh.flush()
+                os.fsync(fh.fileno())
+        for name, _ in _COLUMNS:
+            os.replace(path / f"{name}.bin.tmp", path / f"{name}.bin")
+
+    def _write_header(self, path: Path, count: int, first_ts: int, last_ts: int) -> None:
+        tmp = path / "header.bin.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(_HEADER.pack(_MAGIC, _VERSION, 0, count, first_ts, last_ts))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path / "header.bin")
+
+
+def load_csv(csv_path: str) -> CandleSeries:
+    dtypes = {name: dtype for name, dtype in _COLUMNS if name != "ts"}
+    dtypes["timestamp"] = np.int64
+    df = pd.read_csv(csv_path, usecols=lambda c: c in dtypes, dtype=dtypes)
+    return CandleSeries.from_frame(df)
+
+
+def resolve_import_path(import_dir: str | Path, csv_path: str) -> Path:
+    root = Path(import_dir).resolve()
+    path = (root / csv_path).resolve()
+    if not path.is_relative_to(root):
+        raise ValueError(f"CSV path must be inside {root}")
+    return path
+
+
+def import_csv(store: CandleStore, csv_path: str, symbol: str, timeframe: str) -> int:
+    return store.append(symbol, timeframe, load_csv(csv_path))
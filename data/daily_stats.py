@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+DAY_SECONDS = 86400
+
+
+def day_start(ts: int) -> int:
+    return ts - (ts % DAY_SECONDS)
+
+
+@dataclass
+class DailyStats:
+    trade_count: int = 0
+    realized_pnl: float = 0.0
+    gross_notional: float = 0.0
+    positions: dict[str, list[float]] = field(default_factory=dict)
+
+    @property
+    def pnl_pct(self) -> float:
+        if not self.trade_count:
+            return 0.0
+        denom = self.gross_notional if self.gross_notional > 0 else 1.0
+        return (self.realized_pnl / denom) * 100.0
+
+    def apply(self, symbol: str, side: str, qty: float, price: float) -> None:
+        qty = float(qty)
+        price = float(price)
+        self.trade_count += 1
+        self.gross_notional += abs(qty * price)
+        pos_qty, pos_avg = self.positions.get(symbol, (0.0, 0.0))
+        if side == "BUY":
+            if pos_qty < 0:
+                cover = min(qty, abs(pos_qty))
+                self.realized_pnl += (pos_avg - price) * cover
+                pos_qty += cover
+                qty -= cover
+            if qty > 0:
+                new_qty = pos_qty + qty
+                pos_avg = ((pos_avg * pos_qty) + (price * qty)) / new_qty if new_qty else 0.0
+                pos_qty = new_qty
+        else:
+            if pos_qty > 0:
+                sell = min(qty, pos_qty)
+                self.realized_pnl += (price - pos_avg) * sell
+                pos_qty -= sell
+                qty -= sell
+            if qty > 0:
+                new_qty = pos_qty - qty
+                pos_avg = price if new_qty != 0 else 0.0
+                pos_qty = new_qty
+        self.positions[symbol] = [pos_qty, pos_avg]
+
+    def apply_all(self, trades: Iterable[Any]) -> DailyStats:
+        for t in trades:
+            self.apply(t["symbol"], t["side"], t["qty"], t["price"])
+        return self
+
+    def positions_json(self) -> str:
+        return json.dumps(self.positions)
+
+    @classmethod
+    def from_row(cls, row: Any) -> DailyStats:
+        return cls(
+            trade_count=int(row["trade_count"]),
+            realized_pnl=float(row["realized_pnl"]),
+            gross_notional=float(row["gross_notional"]),
+            positions=json.loads(row["positions"]),
+        )
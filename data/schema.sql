@@ -39,7 +39,8 @@ CREATE TABLE IF NOT EXISTS trades (
   mode TEXT NOT NULL,
   adapter TEXT NOT NULL,
   created_at INTEGER NOT NULL,
-  order_id TEXT
+  order_id TEXT,
+  client_id TEXT
 );
 
 CREATE TABLE IF NOT EXISTS positions (
@@ -57,3 +58,29 @@ CREATE TABLE IF NOT EXISTS risk_events (
   reason TEXT NOT NULL,
   created_at INTEGER NOT NULL
 );
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+  user_id INTEGER NOT NULL,
+  key TEXT NOT NULL,
+  created_at INTEGER NOT NULL,
+  PRIMARY KEY (user_id, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created ON idempotency_keys (user_id, created_at);
+
+CREATE TABLE IF NOT EXISTS daily_stats (
+  user_id INTEGER NOT NULL,
+  day INTEGER NOT NULL,
+  trade_count INTEGER NOT NULL,
+  realized_pnl REAL NOT NULL,
+  gross_notional REAL NOT NULL,
+  positions TEXT NOT NULL,
+  updated_at INTEGER NOT NULL,
+  PRIMARY KEY (user_id, day)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL,
+  updated_at INTEGER NOT NULL
+);
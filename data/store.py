@@ -1,13 +1,85 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, TypeVar
 
-import psycopg
 from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
+
+from data.daily_stats import DAY_SECONDS, DailyStats, day_start
+from data.writes import PositionWrite, RiskEventWrite, TradeWrite, Write, split_writes
+
+T = TypeVar("T")
+
+def _sqlite_add_column(conn: sqlite3.Connection, table: str, column: str, decl: str) -> None:
+    if not any(r["name"] == column for r in conn.execute(f"PRAGMA table_info({table})").fetchall()):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+_SQLITE_MIGRATIONS: tuple[tuple[int, tuple[str | Callable[[sqlite3.Connection], None], ...]], ...] = (
+    (
+        1,
+        (
+            "INSERT OR IGNORE INTO idempotency_keys (user_id, key, created_at) "
+            "SELECT s.user_id, k.value, CAST(strftime('%s', 'now') AS INTEGER) FROM user_settings s, json_each(s.value) k "
+            "WHERE s.key='IDEMPOTENCY_KEYS' AND json_type(s.value)='array'",
+            "DELETE FROM user_settings WHERE key='IDEMPOTENCY_KEYS'",
+        ),
+    ),
+    (
+        2,
+        (
+            "DELETE FROM positions WHERE id NOT IN (SELECT MAX(id) FROM positions GROUP BY user_id, symbol)",
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_positions_user_symbol ON positions (user_id, symbol)",
+            "CREATE INDEX IF NOT EXISTS idx_trades_user_created ON trades (user_id, created_at, symbol, side, qty, price)",
+            "CREATE INDEX IF NOT EXISTS idx_risk_events_user_created ON risk_events (user_id, created_at)",
+        ),
+    ),
+    (
+        3,
+        (
+            lambda conn: _sqlite_add_column(conn, "trades", "client_id", "TEXT"),
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_trades_client_id ON trades (client_id)",
+        ),
+    ),
+)
+
+_PG_MIGRATIONS: tuple[tuple[int, tuple[str, ...]], ...] = (
+    (
+        1,
+        (
+            "INSERT INTO idempotency_keys (user_id, key, created_at) "
+            "SELECT s.user_id, k.value, EXTRACT(EPOCH FROM now())::BIGINT "
+            "FROM (SELECT user_id, value::jsonb AS keys FROM user_settings WHERE key='IDEMPOTENCY_KEYS') s, "
+            "jsonb_array_elements_text(CASE WHEN jsonb_typeof(s.keys)='array' THEN s.keys ELSE '[]'::jsonb END) k "
+            "ON CONFLICT DO NOTHING",
+            "DELETE FROM user_settings WHERE key='IDEMPOTENCY_KEYS'",
+        ),
+    ),
+    (
+        2,
+        (
+            "DELETE FROM positions p USING positions q WHERE p.user_id=q.user_id AND p.symbol=q.symbol AND p.id < q.id",
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_positions_user_symbol ON positions (user_id, symbol)",
+            "CREATE INDEX IF NOT EXISTS idx_trades_user_created ON trades (user_id, created_at) INCLUDE (symbol, side, qty, price)",
+            "CREATE INDEX IF NOT EXISTS idx_risk_events_user_created ON risk_events (user_id, created_at)",
+        ),
+    ),
+    (
+        3,
+        (
+            "ALTER TABLE trades ADD COLUMN IF NOT EXISTS client_id TEXT",
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_trades_client_id ON trades (client_id)",
+        ),
+    ),
+)
 
 
 class BaseStore:
@@ -20,6 +92,9 @@ class BaseStore:
     def get_setting(self, user_id: int, key: str, default: Any = None) -> Any:
         raise NotImplementedError
 
+    def get_settings(self, user_id: int) -> dict[str, Any]:
+        raise NotImplementedError
+
     def set_engine_state(self, user_id: int, **kwargs: Any) -> None:
         raise NotImplementedError
 
@@ -38,6 +113,9 @@ class BaseStore:
     def compute_daily_pnl_pct(self, user_id: int, since_ts: int) -> float:
         raise NotImplementedError
 
+    def get_daily_stats(self, user_id: int, day: int) -> DailyStats:
+        raise NotImplementedError
+
     def upsert_position(self, user_id: int, symbol: str, qty: float, avg_price: float) -> None:
         raise NotImplementedError
 
@@ -56,22 +134,85 @@ class BaseStore:
     def get_credentials(self, user_id: int, adapter: str) -> str | None:
         raise NotImplementedError
 
+    def claim_idempotency_key(self, user_id: int, key: str, now: int, ttl: int) -> bool:
+        raise NotImplementedError
+
+    def purge_idempotency_keys(self, user_id: int, before_ts: int) -> int:
+        raise NotImplementedError
+
+    def write_batch(self, writes: list[Write]) -> None:
+        raise NotImplementedError
+
+    def existing_trade_ids(self, client_ids: list[str]) -> set[str]:
+        raise NotImplementedError
+
+    def get_meta(self, key: str) -> tuple[str, int] | None:
+        raise NotImplementedError
+
+    def set_meta(self, key: str, value: str, updated_at: int) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def pool_stats(self) -> dict[str, int]:
+        return {}
+
 
 class SQLiteStore(BaseStore):
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, cache_size_kb: int = 16384) -> None:
         self.db_path = db_path
+        self.cache_size_kb = cache_size_kb
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self._ensure_schema()
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, cached_statements=256, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
         return conn
 
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def pool_stats(self) -> dict[str, int]:
+        with self._connections_lock:
+            return {"connections": len(self._connections)}
+
     def _ensure_schema(self) -> None:
         schema_path = Path(__file__).with_name("schema.sql")
         with self._connect() as conn:
             self._migrate_sqlite(conn)
             conn.executescript(schema_path.read_text())
+            self._apply_migrations(conn)
+
+    def _apply_migrations(self, conn: sqlite3.Connection) -> None:
+        for version, statements in _SQLITE_MIGRATIONS:
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                conn.rollback()
+                continue
+            for stmt in statements:
+                if callable(stmt):
+                    stmt(conn)
+                else:
+                    conn.execute(stmt)
+            conn.execute(f"PRAGMA user_version={version}")
+            conn.commit()
 
     def _table_has_column(self, conn: sqlite3.Connection, table: str, column: str) -> bool:
         rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
@@ -144,6 +285,14 @@ class SQLiteStore(BaseStore):
                 return default
             return json.loads(row["value"])
 
+    def get_settings(self, user_id: int) -> dict[str, Any]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT key, value FROM user_settings WHERE user_id=?",
+                (user_id,),
+            ).fetchall()
+            return {r["key"]: json.loads(r["value"]) for r in rows}
+
     def set_engine_state(self, user_id: int, **kwargs: Any) -> None:
         values = list(kwargs.values())
         with self._connect() as conn:
@@ -161,12 +310,97 @@ class SQLiteStore(BaseStore):
             return dict(row) if row else {}
 
     def add_trade(self, user_id: int, symbol: str, side: str, qty: float, price: float, mode: str, adapter: str, order_id: str | None) -> None:
+        self.write_batch([TradeWrite(user_id, symbol, side, qty, price, mode, adapter, order_id, int(time.time()))])
+
+    def _backfill_daily_stats(self, conn: sqlite3.Connection, user_id: int, day: int) -> DailyStats:
+        trades = conn.execute(
+            "SELECT symbol, side, qty, price FROM trades WHERE user_id=? AND created_at >= ? AND created_at < ? ORDER BY created_at, id",
+            (user_id, day, day + DAY_SECONDS),
+        ).fetchall()
+        return DailyStats().apply_all(trades)
+
+    def _daily_stats_for_update(self, conn: sqlite3.Connection, user_id: int, day: int) -> DailyStats:
+        select = "SELECT trade_count, realized_pnl, gross_notional, positions FROM daily_stats WHERE user_id=? AND day=?"
+        row = conn.execute(select, (user_id, day)).fetchone()
+        if row:
+            return DailyStats.from_row(row)
+        stats = self._backfill_daily_stats(conn, user_id, day)
+        conn.execute(
+            "INSERT INTO daily_stats (user_id, day, trade_count, realized_pnl, gross_notional, positions, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(user_id, day) DO NOTHING",
+            (user_id, day, stats.trade_count, stats.realized_pnl, stats.gross_notional, stats.positions_json(), int(time.time())),
+        )
+        return DailyStats.from_row(conn.execute(select, (user_id, day)).fetchone())
+
+    def _save_daily_stats(self, conn: sqlite3.Connection, user_id: int, day: int, stats: DailyStats, now: int) -> None:
+        conn.execute(
+            "UPDATE daily_stats SET trade_count=?, realized_pnl=?, gross_notional=?, positions=?, updated_at=? "
+            "WHERE user_id=? AND day=?",
+            (stats.trade_count, stats.realized_pnl, stats.gross_notional, stats.positions_json(), now, user_id, day),
+        )
+
+    def get_daily_stats(self, user_id: int, day: int) -> DailyStats:
         with self._connect() as conn:
-            conn.execute(
-                "INSERT INTO trades (user_id, symbol, side, qty, price, mode, adapter, created_at, order_id) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                (user_id, symbol, side, qty, price, mode, adapter, int(time.time()), order_id),
-            )
+            row = conn.execute(
+                "SELECT trade_count, realized_pnl, gross_notional, positions FROM daily_stats WHERE user_id=? AND day=?",
+                (user_id, day),
+            ).fetchone()
+            return DailyStats.from_row(row) if row else self._backfill_daily_stats(conn, user_id, day)
+
+    def _apply_trades(self, conn: sqlite3.Connection, trades: list[TradeWrite]) -> dict[tuple[int, int], DailyStats]:
+        stats: dict[tuple[int, int], DailyStats] = {}
+        for t in trades:
+            key = (t.user_id, day_start(t.created_at))
+            if key not in stats:
+                stats[key] = self._daily_stats_for_update(conn, *key)
+            stats[key].apply(t.symbol, t.side, t.qty, t.price)
+        return stats
+
+    def write_batch(self, writes: list[Write]) -> None:
+        trades, positions, events, states = split_writes(writes)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if trades:
+                self._insert_trades(conn, trades)
+            if positions:
+                conn.executemany(
+                    "INSERT INTO positions (user_id, symbol, qty, avg_price, updated_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(user_id, symbol) DO UPDATE SET qty=excluded.qty, avg_price=excluded.avg_price, updated_at=excluded.updated_at",
+                    [(p.user_id, p.symbol, p.qty, p.avg_price, p.updated_at) for p in positions],
+                )
+            if events:
+                conn.executemany(
+                    "INSERT INTO risk_events (user_id, reason, created_at) VALUES (?, ?, ?)",
+                    [(e.user_id, e.reason, e.created_at) for e in events],
+                )
+            for user_id, values in states.items():
+                conn.execute(
+                    f"UPDATE engine_state SET {', '.join([f'{k}=?' for k in values.keys()])} WHERE user_id=?",
+                    list(values.values()) + [user_id],
+                )
+
+    def _insert_trades(self, conn: sqlite3.Connection, trades: list[TradeWrite]) -> None:
+        stats = self._apply_trades(conn, trades)
+        conn.executemany(
+            "INSERT INTO trades (user_id, symbol, side, qty, price, mode, adapter, created_at, order_id, client_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [_trade_row(t) for t in trades],
+        )
+        now = int(time.time())
+        for (user_id, day), day_stats in stats.items():
+            self._save_daily_stats(conn, user_id, day, day_stats, now)
+
+    def existing_trade_ids(self, client_ids: list[str]) -> set[str]:
+        found: set[str] = set()
+        with self._connect() as conn:
+            for start in range(0, len(client_ids), 500):
+                chunk = client_ids[start : start + 500]
+                rows = conn.execute(
+                    f"SELECT client_id FROM trades WHERE client_id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                found.update(r["client_id"] for r in rows)
+        return found
 
     def list_trades(self, user_id: int, limit: int = 5) -> list[dict[str, Any]]:
         with self._connect() as conn:
@@ -185,25 +419,20 @@ class SQLiteStore(BaseStore):
             return [dict(r) for r in rows]
 
     def compute_daily_pnl_pct(self, user_id: int, since_ts: int) -> float:
-        trades = self.list_trades_since(user_id, since_ts)
+        with self._connect() as conn:
+            trades = conn.execute(
+                "SELECT symbol, side, qty, price FROM trades WHERE user_id=? AND created_at >= ? ORDER BY created_at DESC",
+                (user_id, since_ts),
+            ).fetchall()
         return _compute_pnl_pct(trades)
 
     def upsert_position(self, user_id: int, symbol: str, qty: float, avg_price: float) -> None:
         with self._connect() as conn:
-            row = conn.execute(
-                "SELECT id FROM positions WHERE user_id=? AND symbol=?",
-                (user_id, symbol),
-            ).fetchone()
-            if row:
-                conn.execute(
-                    "UPDATE positions SET qty=?, avg_price=?, updated_at=? WHERE user_id=? AND symbol=?",
-                    (qty, avg_price, int(time.time()), user_id, symbol),
-                )
-            else:
-                conn.execute(
-                    "INSERT INTO positions (user_id, symbol, qty, avg_price, updated_at) VALUES (?, ?, ?, ?, ?)",
-                    (user_id, symbol, qty, avg_price, int(time.time())),
-                )
+            conn.execute(
+                "INSERT INTO positions (user_id, symbol, qty, avg_price, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(user_id, symbol) DO UPDATE SET qty=excluded.qty, avg_price=excluded.avg_price, updated_at=excluded.updated_at",
+                (user_id, symbol, qty, avg_price, int(time.time())),
+            )
 
     def list_positions(self, user_id: int) -> list[dict[str, Any]]:
         with self._connect() as conn:
@@ -244,14 +473,81 @@ class SQLiteStore(BaseStore):
             ).fetchone()
             return row["data_encrypted"] if row else None
 
+    def claim_idempotency_key(self, user_id: int, key: str, now: int, ttl: int) -> bool:
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO idempotency_keys (user_id, key, created_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id, key) DO UPDATE SET created_at=excluded.created_at "
+                "WHERE idempotency_keys.created_at <= ?",
+                (user_id, key, now, now - ttl),
+            )
+            return cur.rowcount == 1
+
+    def purge_idempotency_keys(self, user_id: int, before_ts: int) -> int:
+        with self._connect() as conn:
+            cur = conn.execute(
+                "DELETE FROM idempotency_keys WHERE user_id=? AND created_at <= ?",
+                (user_id, before_ts),
+            )
+            return cur.rowcount
+
+    def get_meta(self, key: str) -> tuple[str, int] | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, updated_at FROM meta WHERE key=?", (key,)).fetchone()
+            return (row["value"], row["updated_at"]) if row else None
+
+    def set_meta(self, key: str, value: str, updated_at: int) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO meta (key, value, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value=excluded.value, updated_at=excluded.updated_at",
+                (key, value, updated_at),
+            )
+
 
 class PostgresStore(BaseStore):
-    def __init__(self, dsn: str) -> None:
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle: float = 300.0,
+        max_lifetime: float = 3600.0,
+        timeout: float = 30.0,
+    ) -> None:
         self.dsn = dsn
+        self.pool = ConnectionPool(
+            dsn,
+            min_size=min_size,
+            max_size=max_size,
+            max_idle=max_idle,
+            max_lifetime=max_lifetime,
+            timeout=timeout,
+            kwargs={"row_factory": dict_row},
+            check=ConnectionPool.check_connection,
+            name="store",
+            open=True,
+        )
         self._ensure_schema()
 
     def _connect(self):
-        return psycopg.connect(self.dsn, row_factory=dict_row)
+        return self.pool.connection()
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def pool_stats(self) -> dict[str, int]:
+        stats = self.pool.get_stats()
+        return {
+            "connections": stats.get("pool_size", 0),
+            "available": stats.get("pool_available", 0),
+            "waiting": stats.get("requests_waiting", 0),
+            "min_size": stats.get("pool_min", 0),
+            "max_size": stats.get("pool_max", 0),
+            "requests": stats.get("requests_num", 0),
+            "errors": stats.get("requests_errors", 0),
+            "connections_lost": stats.get("connections_lost", 0),
+        }
 
     def _ensure_schema(self) -> None:
         schema_path = Path(__file__).with_name("schema_pg.sql")
@@ -259,6 +555,21 @@ class PostgresStore(BaseStore):
             statements = [s.strip() for s in schema_path.read_text().split(";") if s.strip()]
             for stmt in statements:
                 conn.execute(stmt)
+            self._apply_migrations(conn)
+
+    def _apply_migrations(self, conn) -> None:
+        conn.execute("CREATE TABLE IF NOT EXISTS schema_migrations (version INTEGER PRIMARY KEY, applied_at BIGINT NOT NULL)")
+        conn.execute("SELECT pg_advisory_xact_lock(hashtext('schema_migrations'))")
+        applied = {r["version"] for r in conn.execute("SELECT version FROM schema_migrations").fetchall()}
+        for version, statements in _PG_MIGRATIONS:
+            if version in applied:
+                continue
+            for stmt in statements:
+                conn.execute(stmt)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, applied_at) VALUES (%s, %s)",
+                (version, int(time.time())),
+            )
 
     def ensure_user(self, user_id: int, username: str | None) -> None:
         with self._connect() as conn:
@@ -287,7 +598,15 @@ class PostgresStore(BaseStore):
             ).fetchone()
             if not row:
                 return default
-            return json.loads(row[0])
+            return json.loads(row["value"])
+
+    def get_settings(self, user_id: int) -> dict[str, Any]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT key, value FROM user_settings WHERE user_id=%s",
+                (user_id,),
+            ).fetchall()
+            return {r["key"]: json.loads(r["value"]) for r in rows}
 
     def set_engine_state(self, user_id: int, **kwargs: Any) -> None:
         values = list(kwargs.values())
@@ -306,12 +625,93 @@ class PostgresStore(BaseStore):
             return dict(row) if row else {}
 
     def add_trade(self, user_id: int, symbol: str, side: str, qty: float, price: float, mode: str, adapter: str, order_id: str | None) -> None:
+        self.write_batch([TradeWrite(user_id, symbol, side, qty, price, mode, adapter, order_id, int(time.time()))])
+
+    def _backfill_daily_stats(self, conn, user_id: int, day: int) -> DailyStats:
+        trades = conn.execute(
+            "SELECT symbol, side, qty, price FROM trades WHERE user_id=%s AND created_at >= %s AND created_at < %s ORDER BY created_at, id",
+            (user_id, day, day + DAY_SECONDS),
+        ).fetchall()
+        return DailyStats().apply_all(trades)
+
+    def _daily_stats_for_update(self, conn, user_id: int, day: int) -> DailyStats:
+        select = "SELECT trade_count, realized_pnl, gross_notional, positions FROM daily_stats WHERE user_id=%s AND day=%s FOR UPDATE"
+        row = conn.execute(select, (user_id, day)).fetchone()
+        if row:
+            return DailyStats.from_row(row)
+        stats = self._backfill_daily_stats(conn, user_id, day)
+        conn.execute(
+            "INSERT INTO daily_stats (user_id, day, trade_count, realized_pnl, gross_notional, positions, updated_at) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s) ON CONFLICT (user_id, day) DO NOTHING",
+            (user_id, day, stats.trade_count, stats.realized_pnl, stats.gross_notional, stats.positions_json(), int(time.time())),
+        )
+        return DailyStats.from_row(conn.execute(select, (user_id, day)).fetchone())
+
+    def _save_daily_stats(self, conn, user_id: int, day: int, stats: DailyStats, now: int) -> None:
+        conn.execute(
+            "UPDATE daily_stats SET trade_count=%s, realized_pnl=%s, gross_notional=%s, positions=%s, updated_at=%s "
+            "WHERE user_id=%s AND day=%s",
+            (stats.trade_count, stats.realized_pnl, stats.gross_notional, stats.positions_json(), now, user_id, day),
+        )
+
+    def get_daily_stats(self, user_id: int, day: int) -> DailyStats:
         with self._connect() as conn:
-            conn.execute(
-                "INSERT INTO trades (user_id, symbol, side, qty, price, mode, adapter, created_at, order_id) "
-                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
-                (user_id, symbol, side, qty, price, mode, adapter, int(time.time()), order_id),
-            )
+            row = conn.execute(
+                "SELECT trade_count, realized_pnl, gross_notional, positions FROM daily_stats WHERE user_id=%s AND day=%s",
+                (user_id, day),
+            ).fetchone()
+            return DailyStats.from_row(row) if row else self._backfill_daily_stats(conn, user_id, day)
+
+    def _apply_trades(self, conn, trades: list[TradeWrite]) -> dict[tuple[int, int], DailyStats]:
+        stats: dict[tuple[int, int], DailyStats] = {}
+        for t in trades:
+            key = (t.user_id, day_start(t.created_at))
+            if key not in stats:
+                stats[key] = self._daily_stats_for_update(conn, *key)
+            stats[key].apply(t.symbol, t.side, t.qty, t.price)
+        return stats
+
+    def write_batch(self, writes: list[Write]) -> None:
+        trades, positions, events, states = split_writes(writes)
+        with self._connect() as conn:
+            if trades:
+                self._insert_trades(conn, trades)
+            with conn.cursor() as cur:
+                if positions:
+                    cur.executemany(
+                        "INSERT INTO positions (user_id, symbol, qty, avg_price, updated_at) VALUES (%s, %s, %s, %s, %s) "
+                        "ON CONFLICT (user_id, symbol) DO UPDATE SET qty=excluded.qty, avg_price=excluded.avg_price, updated_at=excluded.updated_at",
+                        [(p.user_id, p.symbol, p.qty, p.avg_price, p.updated_at) for p in positions],
+                    )
+                if events:
+                    with cur.copy("COPY risk_events (user_id, reason, created_at) FROM STDIN") as copy:
+                        for e in events:
+                            copy.write_row((e.user_id, e.reason, e.created_at))
+            for user_id, values in states.items():
+                conn.execute(
+                    f"UPDATE engine_state SET {', '.join([f'{k}=%s' for k in values.keys()])} WHERE user_id=%s",
+                    list(values.values()) + [user_id],
+                )
+
+    def _insert_trades(self, conn, trades: list[TradeWrite]) -> None:
+        stats = self._apply_trades(conn, trades)
+        with conn.cursor() as cur:
+            with cur.copy(
+                "COPY trades (user_id, symbol, side, qty, price, mode, adapter, created_at, order_id, client_id) FROM STDIN"
+            ) as copy:
+                for t in trades:
+                    copy.write_row(_trade_row(t))
+        now = int(time.time())
+        for (user_id, day), day_stats in stats.items():
+            self._save_daily_stats(conn, user_id, day, day_stats, now)
+
+    def existing_trade_ids(self, client_ids: list[str]) -> set[str]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT client_id FROM trades WHERE client_id = ANY(%s)",
+                (client_ids,),
+            ).fetchall()
+            return {r["client_id"] for r in rows}
 
     def list_trades(self, user_id: int, limit: int = 5) -> list[dict[str, Any]]:
         with self._connect() as conn:
@@ -330,25 +730,20 @@ class PostgresStore(BaseStore):
             return [dict(r) for r in rows]
 
     def compute_daily_pnl_pct(self, user_id: int, since_ts: int) -> float:
-        trades = self.list_trades_since(user_id, since_ts)
+        with self._connect() as conn:
+            trades = conn.execute(
+                "SELECT symbol, side, qty, price FROM trades WHERE user_id=%s AND created_at >= %s ORDER BY created_at DESC",
+                (user_id, since_ts),
+            ).fetchall()
         return _compute_pnl_pct(trades)
 
     def upsert_position(self, user_id: int, symbol: str, qty: float, avg_price: float) -> None:
         with self._connect() as conn:
-            row = conn.execute(
-                "SELECT id FROM positions WHERE user_id=%s AND symbol=%s",
-                (user_id, symbol),
-            ).fetchone()
-            if row:
-                conn.execute(
-                    "UPDATE positions SET qty=%s, avg_price=%s, updated_at=%s WHERE user_id=%s AND symbol=%s",
-                    (qty, avg_price, int(time.time()), user_id, symbol),
-                )
-            else:
-                conn.execute(
-                    "INSERT INTO positions (user_id, symbol, qty, avg_price, updated_at) VALUES (%s, %s, %s, %s, %s)",
-                    (user_id, symbol, qty, avg_price, int(time.time())),
-                )
+            conn.execute(
+                "INSERT INTO positions (user_id, symbol, qty, avg_price, updated_at) VALUES (%s, %s, %s, %s, %s) "
+                "ON CONFLICT (user_id, symbol) DO UPDATE SET qty=excluded.qty, avg_price=excluded.avg_price, updated_at=excluded.updated_at",
+                (user_id, symbol, qty, avg_price, int(time.time())),
+            )
 
     def list_positions(self, user_id: int) -> list[dict[str, Any]]:
         with self._connect() as conn:
@@ -387,49 +782,149 @@ class PostgresStore(BaseStore):
                 "SELECT data_encrypted FROM credentials WHERE user_id=%s AND adapter=%s",
                 (user_id, adapter),
             ).fetchone()
-            return row[0] if row else None
+            return row["data_encrypted"] if row else None
+
+    def claim_idempotency_key(self, user_id: int, key: str, now: int, ttl: int) -> bool:
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO idempotency_keys (user_id, key, created_at) VALUES (%s, %s, %s) "
+                "ON CONFLICT (user_id, key) DO UPDATE SET created_at=excluded.created_at "
+                "WHERE idempotency_keys.created_at <= %s",
+                (user_id, key, now, now - ttl),
+            )
+            return cur.rowcount == 1
+
+    def purge_idempotency_keys(self, user_id: int, before_ts: int) -> int:
+        with self._connect() as conn:
+            cur = conn.execute(
+                "DELETE FROM idempotency_keys WHERE user_id=%s AND created_at <= %s",
+                (user_id, before_ts),
+            )
+            return cur.rowcount
+
+    def get_meta(self, key: str) -> tuple[str, int] | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, updated_at FROM meta WHERE key=%s", (key,)).fetchone()
+            return (row["value"], row["updated_at"]) if row else None
+
+    def set_meta(self, key: str, value: str, updated_at: int) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO meta (key, value, updated_at) VALUES (%s, %s, %s) "
+                "ON CONFLICT (key) DO UPDATE SET value=excluded.value, updated_at=excluded.updated_at",
+                (key, value, updated_at),
+            )
+
+
+class AsyncStore:
+    def __init__(self, store: BaseStore, max_workers: int = 8) -> None:
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="store")
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def ensure_user(self, user_id: int, username: str | None) -> None:
+        await self.run(self.store.ensure_user, user_id, username)
+
+    async def set_setting(self, user_id: int, key: str, value: Any) -> None:
+        await self.run(self.store.set_setting, user_id, key, value)
+
+    async def get_setting(self, user_id: int, key: str, default: Any = None) -> Any:
+        return await self.run(self.store.get_setting, user_id, key, default)
+
+    async def get_settings(self, user_id: int) -> dict[str, Any]:
+        return await self.run(self.store.get_settings, user_id)
+
+    async def set_engine_state(self, user_id: int, **kwargs: Any) -> None:
+        await self.run(self.store.set_engine_state, user_id, **kwargs)
+
+    async def get_engine_state(self, user_id: int) -> dict[str, Any]:
+        return await self.run(self.store.get_engine_state, user_id)
+
+    async def add_trade(self, user_id: int, symbol: str, side: str, qty: float, price: float, mode: str, adapter: str, order_id: str | None) -> None:
+        await self.run(self.store.add_trade, user_id, symbol, side, qty, price, mode, adapter, order_id)
+
+    async def list_trades(self, user_id: int, limit: int = 5) -> list[dict[str, Any]]:
+        return await self.run(self.store.list_trades, user_id, limit)
+
+    async def list_trades_since(self, user_id: int, since_ts: int) -> list[dict[str, Any]]:
+        return await self.run(self.store.list_trades_since, user_id, since_ts)
+
+    async def compute_daily_pnl_pct(self, user_id: int, since_ts: int) -> float:
+        return await self.run(self.store.compute_daily_pnl_pct, user_id, since_ts)
+
+    async def get_daily_stats(self, user_id: int, day: int) -> DailyStats:
+        return await self.run(self.store.get_daily_stats, user_id, day)
+
+    async def upsert_position(self, user_id: int, symbol: str, qty: float, avg_price: float) -> None:
+        await self.run(self.store.upsert_position, user_id, symbol, qty, avg_price)
+
+    async def list_positions(self, user_id: int) -> list[dict[str, Any]]:
+        return await self.run(self.store.list_positions, user_id)
+
+    async def add_risk_event(self, user_id: int, reason: str) -> None:
+        await self.run(self.store.add_risk_event, user_id, reason)
+
+    async def list_risk_events(self, user_id: int, limit: int = 5) -> list[dict[str, Any]]:
+        return await self.run(self.store.list_risk_events, user_id, limit)
+
+    async def set_credentials(self, user_id: int, adapter: str, data_encrypted: str) -> None:
+        await self.run(self.store.set_credentials, user_id, adapter, data_encrypted)
+
+    async def get_credentials(self, user_id: int, adapter: str) -> str | None:
+        return await self.run(self.store.get_credentials, user_id, adapter)
+
+    async def claim_idempotency_key(self, user_id: int, key: str, now: int, ttl: int) -> bool:
+        return await self.run(self.store.claim_idempotency_key, user_id, key, now, ttl)
+
+    async def purge_idempotency_keys(self, user_id: int, before_ts: int) -> int:
+        return await self.run(self.store.purge_idempotency_keys, user_id, before_ts)
+
+    async def write_batch(self, writes: list[Write]) -> None:
+        await self.run(self.store.write_batch, writes)
+
+    async def existing_trade_ids(self, client_ids: list[str]) -> set[str]:
+        return await self.run(self.store.existing_trade_ids, client_ids)
+
+    async def get_meta(self, key: str) -> tuple[str, int] | None:
+        return await self.run(self.store.get_meta, key)
+
+    async def set_meta(self, key: str, value: str, updated_at: int) -> None:
+        await self.run(self.store.set_meta, key, value, updated_at)
+
+    async def pool_stats(self) -> dict[str, int]:
+        return await self.run(self.store.pool_stats)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.store.close()
+
+
+def _trade_row(t: TradeWrite) -> tuple:
+    return (t.user_id, t.symbol, t.side, t.qty, t.price, t.mode, t.adapter, t.created_at, t.order_id, t.client_id)
 
 
 def _compute_pnl_pct(trades: list[dict[str, Any]]) -> float:
-    if not trades:
-        return 0.0
-    trades = list(reversed(trades))
-    positions: dict[str, dict[str, float]] = {}
-    realized = 0.0
-    gross_notional = 0.0
-    for t in trades:
-        symbol = t["symbol"]
-        side = t["side"]
-        qty = float(t["qty"])
-        price = float(t["price"])
-        gross_notional += abs(qty * price)
-        pos = positions.get(symbol, {"qty": 0.0, "avg": 0.0})
-        if side == "BUY":
-            if pos["qty"] < 0:
-                cover = min(qty, abs(pos["qty"]))
-                realized += (pos["avg"] - price) * cover
-                pos["qty"] += cover
-                qty -= cover
-            if qty > 0:
-                new_qty = pos["qty"] + qty
-                pos["avg"] = ((pos["avg"] * pos["qty"]) + (price * qty)) / new_qty if new_qty else 0.0
-                pos["qty"] = new_qty
-        else:
-            if pos["qty"] > 0:
-                sell = min(qty, pos["qty"])
-                realized += (price - pos["avg"]) * sell
-                pos["qty"] -= sell
-                qty -= sell
-            if qty > 0:
-                new_qty = pos["qty"] - qty
-                pos["avg"] = price if new_qty != 0 else 0.0
-                pos["qty"] = new_qty
-        positions[symbol] = pos
-    denom = gross_notional if gross_notional > 0 else 1.0
-    return (realized / denom) * 100.0
-
-
-def create_store(database_url: str | None, sqlite_path: str) -> BaseStore:
+    return DailyStats().apply_all(reversed(trades)).pnl_pct
+
+
+def create_store(
+    database_url: str | None,
+    sqlite_path: str,
+    sqlite_cache_size_kb: int = 16384,
+    pool_min_size: int = 1,
+    pool_max_size: int = 10,
+    pool_max_idle: float = 300.0,
+    pool_timeout: float = 30.0,
+) -> BaseStore:
     if database_url:
-        return PostgresStore(database_url)
-    return SQLiteStore(sqlite_path)
+        return PostgresStore(
+            database_url,
+            min_size=pool_min_size,
+            max_size=pool_max_size,
+            max_idle=pool_max_idle,
+            timeout=pool_timeout,
+        )
+    return SQLiteStore(sqlite_path, cache_size_kb=sqlite_cache_size_kb)
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from pathlib import Path
+from typing import Iterable
+
+from loguru import logger
+
+from data.store import AsyncStore
+from data.writes import TradeWrite, Write, decode_write, encode_write
+
+
+class FillJournal:
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries = len(self.path.read_bytes().splitlines()) if self.path.exists() else 0
+        self._base = 0
+
+    def append(self, writes: list[Write]) -> int:
+        data = "".join(encode_write(w) + "\n" for w in writes).encode()
+        with self._lock:
+            with open(self.path, "ab") as fh:
+                fh.write(data)
+                fh.flush()
+                os.fsync(fh.fileno())
+            self._entries += len(writes)
+            return self._entries
+
+    def read(self) -> list[Write]:
+        with self._lock:
+            if not self.path.exists():
+                return []
+            lines = self.path.read_text().splitlines()
+        writes = []
+        for line in lines:
+            try:
+                writes.append(decode_write(line))
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Skipping unreadable journal entry in {}", self.path)
+        return writes
+
+    def truncate(self, upto: int | None = None) -> None:
+        with self._lock:
+            upto = self._entries if upto is None else min(upto, self._entries)
+            drop = upto - self._base
+            if drop <= 0 and upto < self._entries:
+                return
+            self._base = upto
+            if not self.path.exists():
+                return
+            if upto == self._entries:
+                with open(self.path, "r+b") as fh:
+                    fh.truncate(0)
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                return
+            keep = self.path.read_bytes().splitlines(keepends=True)[drop:]
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp, "wb") as fh:
+                fh.write(b"".join(keep))
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, self.path)
+
+
+class WriteBehind:
+    def __init__(
+        self,
+        store: AsyncStore,
+        journal: FillJournal | None = None,
+        max_batch: int = 500,
+        flush_interval: float = 0.05,
+        retry_delay: float = 0.5,
+        max_retry_delay: float = 30.0,
+        max_attempts: int = 5,
+        dead_letter: FillJournal | None = None,
+        flush_timeout: float = 30.0,
+    ) -> None:
+        self.store = store
+        self.journal = journal
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.max_attempts = max_attempts
+        self.dead_letter = dead_letter
+        self.flush_timeout = flush_timeout
+        self._pending: list[tuple[int, list[Write], tuple[int, ...]]] = []
+        self._submitted = 0
+        self._committed = 0
+        self._outstanding: dict[int, int] = {}
+        self._journal_end = 0
+        self._appending = 0
+        self._released = False
+        self._queued = 0
+        self._waiters: list[tuple[int, asyncio.Future]] = []
+        self._ready = asyncio.Event()
+        self._urgent = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self.batches = 0
+        self.writes = 0
+        self.failures = 0
+        self.dead_lettered = 0
+        self.last_error: str | None = None
+
+    async def recover(self) -> int:
+        if self.journal is None:
+            return 0
+        writes = await self.store.run(self.journal.read)
+        if not writes:
+            return 0
+        client_ids = [w.client_id for w in writes if isinstance(w, TradeWrite) and w.client_id]
+        committed = await self.store.existing_trade_ids(client_ids) if client_ids else set()
+        replay = [w for w in writes if not (isinstance(w, TradeWrite) and w.client_id in committed)]
+        if replay:
+            await self.store.write_batch(replay)
+        await self.store.run(self.journal.truncate)
+        logger.info("Recovered {} journaled writes ({} replayed)", len(writes), len(replay))
+        return len(replay)
+
+    async def journal_writes(self, writes: list[Write]) -> int:
+        if self.journal is None or not writes:
+            return 0
+        self._appending += 1
+        try:
+            entry = await self.store.run(self.journal.append, writes)
+        finally:
+            self._appending -= 1
+        self._outstanding[entry] = entry - len(writes)
+        self._journal_end = max(self._journal_end, entry)
+        return entry
+
+    async def put(self, write: Write, durable: bool = False) -> None:
+        await self.put_many([write], durable=durable)
+
+    async def put_many(self, writes: list[Write], durable: bool = False, entries: Iterable[int] = ()) -> None:
+        if self._closing:
+            raise RuntimeError("WriteBehind is closed")
+        if not writes:
+            return
+        entries = tuple(entry for entry in entries if entry)
+        if durable and self.journal is not None:
+            entries += (await self.journal_writes(writes),)
+        self._submitted += 1
+        self._pending.append((self._submitted, list(writes), entries))
+        self._queued += len(writes)
+        self._ensure_task()
+        self._ready.set()
+        if self._queued >= self.max_batch:
+            self._urgent.set()
+
+    async def flush(self, timeout: float | None = None) -> None:
+        target = self._submitted
+        if self._committed >= target:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((target, future))
+        self._ensure_task()
+        self._urgent.set()
+        timeout = self.flush_timeout if timeout is None else timeout
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"Write queue flush timed out after {timeout:.0f}s ({self._queued} writes pending)") from None
+
+    async def close(self) -> None:
+        self._closing = True
+        if self._task is None:
+            return
+        self._ready.set()
+        self._urgent.set()
+        await self._task
+        self._task = None
+        await self._truncate_journal()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": self._queued,
+            "batches": self.batches,
+            "writes": self.writes,
+            "failures": self.failures,
+            "dead_lettered": self.dead_lettered,
+        }
+
+    def _ensure_task(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        delay = self.retry_delay
+        attempts = 0
+        while True:
+            if not self._pending:
+                if self._closing:
+                    return
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            if not self._urgent.is_set() and self._queued < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._urgent.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._urgent.clear()
+            batch = self._next_batch()
+            size = sum(len(group) for _, group, _ in batch)
+            try:
+                await self.store.write_batch([write for _, group, _ in batch for write in group])
+            except Exception as exc:
+                self.failures += 1
+                self.last_error = str(exc)
+                attempts += 1
+                if attempts < self.max_attempts:
+                    logger.opt(exception=exc).error("Write batch of {} failed, retrying in {:.1f}s", size, delay)
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self.max_retry_delay)
+                    self._urgent.set()
+                    continue
+                logger.opt(exception=exc).error("Write batch of {} failed {} times, retrying per group", size, attempts)
+                await self._isolate(batch)
+            delay = self.retry_delay
+            attempts = 0
+            del self._pending[: len(batch)]
+            self._queued -= size
+            self._committed = batch[-1][0]
+            self.batches += 1
+            self.writes += size
+            for _, _, entries in batch:
+                for entry in entries:
+                    self._outstanding.pop(entry, None)
+                    self._released = True
+            await self._truncate_journal()
+            self._release()
+
+    async def _truncate_journal(self) -> None:
+        if self.journal is None or not self._released or self._appending:
+            return
+        self._released = False
+        upto = min(self._outstanding.values(), default=self._journal_end)
+        await self.store.run(self.journal.truncate, upto)
+
+    async def _isolate(self, batch: list[tuple[int, list[Write], tuple[int, ...]]]) -> None:
+        for _, group, _ in batch:
+            try:
+                await self.store.write_batch(group)
+            except Exception as exc:
+                self.failures += 1
+                self.dead_lettered += len(group)
+                self.last_error = str(exc)
+                logger.opt(exception=exc).error("Dead-lettering {} writes: {}", len(group), [encode_write(w) for w in group])
+                if self.dead_letter is not None:
+                    await self.store.run(self.dead_letter.append, group)
+
+    def _next_batch(self) -> list[tuple[int, list[Write], tuple[int, ...]]]:
+        batch = self._pending[:1]
+        size = len(batch[0][1])
+        for item in self._pending[1:]:
+            size += len(item[1])
+            if size > self.max_batch:
+                break
+            batch.append(item)
+        return batch
+
+    def _release(self) -> None:
+        waiting = []
+        for target, future in self._waiters:
+            if target <= self._committed:
+                if not future.done():
+                    future.set_result(None)
+            else:
+                waiting.append((target, future))
+        self._waiters = waiting
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any, Union
+
+
+@dataclass
+class TradeWrite:
+    user_id: int
+    symbol: str
+    side: str
+    qty: float
+    price: float
+    mode: str
+    adapter: str
+    order_id: str | None
+    created_at: int
+    client_id: str | None = None
+
+
+@dataclass
+class PositionWrite:
+    user_id: int
+    symbol: str
+    qty: float
+    avg_price: float
+    updated_at: int
+
+
+@dataclass
+class RiskEventWrite:
+    user_id: int
+    reason: str
+    created_at: int
+
+
+@dataclass
+class EngineStateWrite:
+    user_id: int
+    values: dict[str, Any] = field(default_factory=dict)
+
+
+Write = Union[TradeWrite, PositionWrite, RiskEventWrite, EngineStateWrite]
+
+_TYPES: dict[str, type] = {
+    "trade": TradeWrite,
+    "position": PositionWrite,
+    "risk_event": RiskEventWrite,
+    "engine_state": EngineStateWrite,
+}
+_NAMES = {cls: name for name, cls in _TYPES.items()}
+
+
+def encode_write(write: Write) -> str:
+    return json.dumps({"type": _NAMES[type(write)], **asdict(write)})
+
+
+def decode_write(line: str) -> Write:
+    data = json.loads(line)
+    return _TYPES[data.pop("type")](**data)
+
+
+def split_writes(
+    writes: list[Write],
+) -> tuple[list[TradeWrite], list[PositionWrite], list[RiskEventWrite], dict[int, dict[str, Any]]]:
+    trades: list[TradeWrite] = []
+    positions: list[PositionWrite] = []
+    events: list[RiskEventWrite] = []
+    states: dict[int, dict[str, Any]] = {}
+    for write in writes:
+        if isinstance(write, TradeWrite):
+            trades.append(write)
+        elif isinstance(write, PositionWrite):
+            positions.append(write)
+        elif isinstance(write, RiskEventWrite):
+            events.append(write)
+        else:
+            states.setdefault(write.user_id, {}).update(write.values)
+    return trades, positions, events, states
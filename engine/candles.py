@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Callable
+
+import numpy as np
+from loguru import logger
+
+from adapters.base import BrokerAdapter
+from data.candle_store import CandleStore
+from engine.models import CandleSeries
+from services.scheduler import timeframe_seconds
+
+
+class CandleBuffer:
+    def __init__(
+        self,
+        adapter: BrokerAdapter,
+        symbol: str,
+        timeframe: str,
+        capacity: int = 200,
+        clock: Callable[[], float] = time.time,
+        history: CandleStore | None = None,
+    ) -> None:
+        self.adapter = adapter
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.capacity = capacity
+        self.clock = clock
+        self.history = history
+        self._step = timeframe_seconds(timeframe)
+        self._store = CandleSeries.empty(capacity * 2)
+        self._start = 0
+        self._stop = 0
+
+    @property
+    def last_ts(self) -> int | None:
+        return int(self._store.ts[self._stop - 1]) if self._stop > self._start else None
+
+    def view(self) -> CandleSeries:
+        return self._store[self._start : self._stop]
+
+    async def refresh(self) -> CandleSeries:
+        last_ts = self.last_ts
+        if last_ts is None and self.history is not None:
+            last_ts = await self._warm_up()
+        if last_ts is None:
+            return await self._backfill()
+        behind = (int(self.clock()) - last_ts) // self._step
+        if behind + 1 >= self.capacity:
+            return await self._backfill()
+        fresh = await self.adapter.fetch_candles(self.symbol, self.timeframe, limit=max(2, behind + 1))
+        if not len(fresh):
+            return self.view()
+        fresh = fresh[-self.capacity :]
+        if fresh.ts[0] > last_ts + self._step:
+            logger.warning("Candle gap for {} {} after {}, backfilling", self.symbol, self.timeframe, last_ts)
+            return await self._backfill()
+        keep = self._start + int(np.searchsorted(self._store.ts[self._start : self._stop], fresh.ts[0]))
+        self._write(keep, fresh)
+        return self.view()
+
+    async def _warm_up(self) -> int | None:
+        start_ts = int(self.clock()) - self.capacity * self._step
+        stored = await asyncio.to_thread(self.history.read, self.symbol, self.timeframe, start_ts)
+        if len(stored):
+            self._write(0, stored[-self.capacity :])
+        return self.last_ts
+
+    async def _backfill(self) -> CandleSeries:
+        candles = await self.adapter.fetch_candles(self.symbol, self.timeframe, limit=self.capacity)
+        self._start = self._stop = 0
+        self._write(0, candles[-self.capacity :])
+        return self.view()
+
+    def _write(self, at: int, fresh: CandleSeries) -> None:
+        if at + len(fresh) > len(self._store):
+            kept = self._store[max(self._start, at - self.capacity) : at]
+            store = CandleSeries.empty(self.capacity * 2)
+            for dst, src in zip(store.columns(), kept.columns()):
+                dst[: len(kept)] = src
+            self._store, self._start, at = store, 0, len(kept)
+        for dst, src in zip(self._store.columns(), fresh.columns()):
+            dst[at : at + len(fresh)] = src
+        self._stop = at + len(fresh)
+        self._start = max(self._start, self._stop - self.capacity)
+
+
+class CandleCache:
+    def __init__(self, adapter: BrokerAdapter, capacity: int = 200, history: CandleStore | None = None) -> None:
+        self.adapter = adapter
+        self.capacity = capacity
+        self.history = history
+        self._buffers: dict[tuple[str, str], CandleBuffer] = {}
+
+    async def get(self, symbol: str, timeframe: str) -> CandleSeries:
+        buffer = self._buffers.get((symbol, timeframe))
+        if buffer is None:
+            buffer = CandleBuffer(self.adapter, symbol, timeframe, capacity=self.capacity, history=self.history)
+            self._buffers[(symbol, timeframe)] = buffer
+        return await buffer.refresh()
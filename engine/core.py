@@ -6,12 +6,17 @@ import time
 from loguru import logger
 
 from adapters.base import BrokerAdapter
-from data.store import BaseStore
+from data.candle_store import CandleStore
+from data.daily_stats import DAY_SECONDS, day_start
+from data.store import AsyncStore
+from data.write_behind import WriteBehind
+from engine.candles import CandleCache
 from engine.idempotency import Idempotency
 from engine.models import OrderIntent
 from engine.state import EngineStateStore
+from engine.unit_of_work import TickUnit
 from risk.manager import RiskManager
-from services.config_service import ConfigService
+from services.config_service import ConfigService, RuntimeConfig
 from services.notifier import Notifier
 from services.scheduler import wait_next_tick
 from strategies.base import Strategy
@@ -21,22 +26,29 @@ class TradingEngine:
     def __init__(
         self,
         adapter: BrokerAdapter,
-        store: BaseStore,
+        store: AsyncStore,
         config_service: ConfigService,
         notifier: Notifier,
         strategy: Strategy,
         user_id: int,
+        market_data: BrokerAdapter | None = None,
+        writes: WriteBehind | None = None,
+        candle_store: CandleStore | None = None,
     ) -> None:
         self.adapter = adapter
+        self.market_data = market_data or adapter
         self.store = store
         self.config_service = config_service
         self.notifier = notifier
         self.strategy = strategy
         self.user_id = user_id
+        self.writes = writes or WriteBehind(store)
         self.state_store = EngineStateStore(store, user_id)
-        self.idempotency = Idempotency(store, user_id)
+        self.idempotency = Idempotency(store, user_id, ttl=config_service.base.IDEMPOTENCY_TTL)
         self.risk = RiskManager(store)
+        self.candles = CandleCache(self.market_data, history=candle_store)
         self._running = False
+        self._order_lock = asyncio.Lock()
         self._last_error_notify_ts = 0
         self._last_summary_day = None
 
@@ -44,100 +56,146 @@ class TradingEngine:
         self._running = True
         while self._running:
             await self.run_once(chat_id=chat_id)
-            config = self.config_service.load()
+            config = await self.config_service.load(self.user_id)
             await wait_next_tick(config.timeframe)
 
     def stop(self) -> None:
         self._running = False
 
     async def run_once(self, chat_id: str | None = None) -> None:
-        config = self.config_service.load(self.user_id)
-        state = self.state_store.load()
-        self._maybe_send_daily_summary(chat_id)
+        config = await self.config_service.load(self.user_id)
+        state = await self.state_store.load()
+        await self._maybe_send_daily_summary(chat_id)
         if state.kill_switch:
             if not state.paused:
-                self.state_store.update(paused=1)
+                await self.state_store.update(paused=1)
             return
         if state.paused:
             return
 
+        unit: TickUnit | None = None
+        spreads = asyncio.create_task(self._prefetch_spreads(config.symbols))
         try:
-            positions = self.store.list_positions(self.user_id)
-            open_positions = [p for p in positions if p.get("qty") not in (0, 0.0)]
-            for symbol in config.symbols:
-                candles = await self.adapter.fetch_candles(symbol, config.timeframe, limit=200)
-                if not candles:
-                    continue
-                last_candle = candles[-1]
-                self.state_store.update(last_candle_ts=last_candle.ts)
-                signal = self.strategy.generate(candles, config)
-                if not signal:
-                    continue
-                key = f"{symbol}:{last_candle.ts}:{signal.side}"
-                if not self.idempotency.check_and_add(key):
-                    logger.info("Idempotency hit for {}", key)
-                    continue
-
-                spread = await self.adapter.get_spread(symbol)
-                decision = self.risk.evaluate(
-                    user_id=self.user_id,
-                    symbol=symbol,
-                    signal=signal,
-                    last_price=last_candle.close,
-                    open_positions=len(open_positions),
-                    config=config,
-                    spread=spread,
+            try:
+                positions, stats = await asyncio.gather(
+                    self.store.list_positions(self.user_id),
+                    self.store.get_daily_stats(self.user_id, day_start(int(time.time()))),
                 )
-                if not decision.allowed:
-                    self.store.add_risk_event(self.user_id, decision.reason or "risk blocked")
-                    if decision.circuit_breaker:
-                        self.state_store.update(kill_switch=1, paused=1)
-                    if chat_id:
-                        await self.notifier.send(chat_id, f"Risk blocked: {decision.reason}")
-                    continue
-
-                intent = OrderIntent(
-                    symbol=symbol,
-                    side=signal.side,
-                    qty=decision.qty or 0.0,
-                    price=None,
-                    stop_loss=signal.stop_loss,
+                unit = TickUnit(self.user_id, positions, stats)
+                unknown = await self.adapter.prepare(config.symbols)
+                results: list = [RuntimeError(f"Symbol not found: {symbol}") for symbol in unknown]
+                semaphore = asyncio.Semaphore(max(1, config.symbol_concurrency))
+                results += await asyncio.gather(
+                    *(
+                        self._run_symbol(symbol, config, unit, semaphore, spreads, chat_id)
+                        for symbol in config.symbols
+                        if symbol not in unknown
+                    ),
+                    return_exceptions=True,
                 )
-                fill = await self.adapter.place_order(intent)
-                self.store.add_trade(
-                    user_id=self.user_id,
-                    symbol=fill.symbol,
-                    side=fill.side,
-                    qty=fill.qty,
-                    price=fill.price,
-                    mode=config.mode,
-                    adapter=config.adapter,
-                    order_id=fill.order_id,
-                )
-                existing = self.store.list_positions(self.user_id)
-                pos = next((p for p in existing if p["symbol"] == fill.symbol), None)
-                if pos:
-                    new_qty = pos["qty"] + (fill.qty if fill.side == "BUY" else -fill.qty)
-                    if new_qty == 0:
-                        self.store.upsert_position(self.user_id, fill.symbol, 0.0, fill.price)
-                    else:
-                        avg_price = ((pos["avg_price"] * pos["qty"]) + (fill.price * fill.qty)) / new_qty
-                        self.store.upsert_position(self.user_id, fill.symbol, new_qty, avg_price)
-                else:
-                    qty = fill.qty if fill.side == "BUY" else -fill.qty
-                    self.store.upsert_position(self.user_id, fill.symbol, qty, fill.price)
+            except Exception as exc:
+                results = [exc]
+            for result in results:
+                if isinstance(result, Exception):
+                    await self._report_error(result, chat_id, unit)
+        finally:
+            spreads.cancel()
+            if unit is not None:
+                await self._commit(unit, chat_id)
 
-                if chat_id:
-                    await self.notifier.send(chat_id, f"Trade executed: {fill.symbol} {fill.side} {fill.qty} @ {fill.price}")
+    async def _prefetch_spreads(self, symbols: list[str]) -> tuple[dict[str, tuple[float, float]], float]:
+        try:
+            quotes = await self.market_data.get_spread_quotes(symbols)
         except Exception as exc:
-            logger.exception("Engine error: {}", exc)
-            self.state_store.update(last_error=str(exc))
-            now = int(time.time())
-            if chat_id and now - self._last_error_notify_ts > 60:
-                await self.notifier.send(chat_id, f"Engine error: {exc}")
-                self._last_error_notify_ts = now
-
-    def _maybe_send_daily_summary(self, chat_id: str | None) -> None:
+            logger.warning("Spread prefetch failed: {}", exc)
+            quotes = {}
+        return quotes, time.monotonic()
+
+    async def _spread(self, symbol: str, prefetched: asyncio.Task) -> float:
+        quotes, received_at = await prefetched
+        if symbol in quotes:
+            spread, age = quotes[symbol]
+            if age + time.monotonic() - received_at < self.config_service.base.SPREAD_CACHE_TTL:
+                return spread
+        return await self.market_data.get_spread(symbol)
+
+    async def _commit(self, unit: TickUnit, chat_id: str | None = None) -> None:
+        await self.writes.put_many(unit.writes(), entries=unit.journal_entries)
+        try:
+            await self.writes.flush()
+        except RuntimeError as exc:
+            await self._report_error(exc, chat_id)
+
+    async def _run_symbol(
+        self,
+        symbol: str,
+        config: RuntimeConfig,
+        unit: TickUnit,
+        semaphore: asyncio.Semaphore,
+        spreads: asyncio.Task,
+        chat_id: str | None,
+    ) -> None:
+        async with semaphore:
+            candles = await self.candles.get(symbol, config.timeframe)
+            if not candles:
+                return
+            last_candle = candles[-1]
+            unit.update_state(last_candle_ts=last_candle.ts)
+            signal = self.strategy.generate(candles, config, key=f"{symbol}:{config.timeframe}")
+            if not signal:
+                return
+            key = f"{symbol}:{last_candle.ts}:{signal.side}"
+            if not await self.idempotency.check_and_add(key):
+                logger.info("Idempotency hit for {}", key)
+                return
+            spread = await self._spread(symbol, spreads)
+
+        async with self._order_lock:
+            decision = await self.risk.evaluate(
+                user_id=self.user_id,
+                symbol=symbol,
+                signal=signal,
+                last_price=last_candle.close,
+                open_positions=len(unit.open_symbols),
+                config=config,
+                spread=spread,
+                stats=unit.stats,
+            )
+            if not decision.allowed:
+                unit.record_risk_event(decision.reason or "risk blocked")
+                if decision.circuit_breaker:
+                    unit.update_state(kill_switch=1, paused=1)
+                if chat_id:
+                    await self.notifier.send(chat_id, f"Risk blocked: {decision.reason}")
+                return
+
+            intent = OrderIntent(
+                symbol=symbol,
+                side=signal.side,
+                qty=decision.qty or 0.0,
+                price=None,
+                stop_loss=signal.stop_loss,
+                ref_price=last_candle.close,
+            )
+            fill = await self.adapter.place_order(intent)
+            writes = unit.record_fill(fill, config.mode, config.adapter)
+            unit.journal_entries.append(await self.writes.journal_writes(writes))
+
+        if chat_id:
+            await self.notifier.send(chat_id, f"Trade executed: {fill.symbol} {fill.side} {fill.qty} @ {fill.price}")
+
+    async def _report_error(self, exc: Exception, chat_id: str | None, unit: TickUnit | None = None) -> None:
+        logger.opt(exception=exc).error("Engine error: {}", exc)
+        if unit is not None:
+            unit.update_state(last_error=str(exc))
+        else:
+            await self.state_store.update(last_error=str(exc))
+        now = int(time.time())
+        if chat_id and now - self._last_error_notify_ts > 60:
+            await self.notifier.send(chat_id, f"Engine error: {exc}")
+            self._last_error_notify_ts = now
+
+    async def _maybe_send_daily_summary(self, chat_id: str | None) -> None:
         if not chat_id:
             return
         day = int(time.time()) // 86400
@@ -147,6 +205,5 @@ class TradingEngine:
         if day == self._last_summary_day:
             return
         self._last_summary_day = day
-        day_start = int(time.time()) - (int(time.time()) % 86400)
-        trades = self.store.list_trades_since(self.user_id, day_start)
-        asyncio.create_task(self.notifier.send(chat_id, f"Daily summary: {len(trades)} trades"))
+        stats = await self.store.get_daily_stats(self.user_id, (day - 1) * DAY_SECONDS)
+        await self.notifier.send(chat_id, f"Daily summary: {stats.trade_count} trades")
@@ -1,38 +1,54 @@
 from __future__ import annotations
 
-from typing import Iterable
+import time
+from collections import OrderedDict
+from typing import Callable
 
-from data.store import BaseStore
+from data.store import AsyncStore
 
 
 class Idempotency:
-    def __init__(self, store: BaseStore, user_id: int, max_keys: int = 100) -> None:
+    def __init__(
+        self,
+        store: AsyncStore,
+        user_id: int,
+        ttl: int = 604800,
+        cache_size: int = 1024,
+        purge_interval: int = 3600,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
         self.store = store
         self.user_id = user_id
-        self.max_keys = max_keys
-
-    def _load(self) -> list[str]:
-        keys = self.store.get_setting(self.user_id, "IDEMPOTENCY_KEYS", [])
-        if not isinstance(keys, list):
-            return []
-        return keys
-
-    def _save(self, keys: list[str]) -> None:
-        self.store.set_setting(self.user_id, "IDEMPOTENCY_KEYS", keys)
-
-    def exists(self, key: str) -> bool:
-        return key in self._load()
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.purge_interval = purge_interval
+        self._clock = clock
+        self._seen: OrderedDict[str, int] = OrderedDict()
+        self._next_purge = 0
+
+    def _cached(self, key: str, now: int) -> bool:
+        seen_at = self._seen.get(key)
+        if seen_at is None:
+            return False
+        if seen_at <= now - self.ttl:
+            del self._seen[key]
+            return False
+        self._seen.move_to_end(key)
+        return True
 
-    def add(self, key: str) -> None:
-        keys = self._load()
-        if key in keys:
-            return
-        keys.append(key)
-        keys = keys[-self.max_keys :]
-        self._save(keys)
+    def _remember(self, key: str, now: int) -> None:
+        self._seen[key] = now
+        self._seen.move_to_end(key)
+        while len(self._seen) > self.cache_size:
+            self._seen.popitem(last=False)
 
-    def check_and_add(self, key: str) -> bool:
-        if self.exists(key):
+    async def check_and_add(self, key: str) -> bool:
+        now = int(self._clock())
+        if self._cached(key, now):
             return False
-        self.add(key)
-        return True
+        claimed = await self.store.claim_idempotency_key(self.user_id, key, now, self.ttl)
+        self._remember(key, now)
+        if now >= self._next_purge:
+            self._next_purge = now + self.purge_interval
+            await self.store.purge_idempotency_keys(self.user_id, now - self.ttl)
+        return claimed
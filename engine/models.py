@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Literal
+from typing import Any, Iterable, Iterator, Literal
+
+import numpy as np
 
 
 @dataclass
@@ -14,6 +16,75 @@ class Candle:
     volume: float
 
 
+class CandleSeries:
+    __slots__ = ("ts", "open", "high", "low", "close", "volume")
+
+    def __init__(
+        self,
+        ts: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+    ) -> None:
+        self.ts = np.asarray(ts, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.float64)
+
+    @classmethod
+    def empty(cls, size: int = 0) -> CandleSeries:
+        return cls(*(np.zeros(size, dtype=np.int64 if i == 0 else np.float64) for i in range(6)))
+
+    @classmethod
+    def from_candles(cls, candles: Iterable[Candle]) -> CandleSeries:
+        rows = [(c.ts, c.open, c.high, c.low, c.close, c.volume) for c in candles]
+        if not rows:
+            return cls.empty()
+        ts, open_, high, low, close, volume = zip(*rows)
+        return cls(ts, open_, high, low, close, volume)
+
+    @classmethod
+    def from_frame(cls, df: Any) -> CandleSeries:
+        volume = df["volume"].to_numpy() if "volume" in df else np.zeros(len(df))
+        return cls(
+            df["timestamp"].to_numpy(),
+            df["open"].to_numpy(),
+            df["high"].to_numpy(),
+            df["low"].to_numpy(),
+            df["close"].to_numpy(),
+            volume,
+        )
+
+    def columns(self) -> tuple[np.ndarray, ...]:
+        return (self.ts, self.open, self.high, self.low, self.close, self.volume)
+
+    def concat(self, other: CandleSeries) -> CandleSeries:
+        return CandleSeries(*(np.concatenate(pair) for pair in zip(self.columns(), other.columns())))
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CandleSeries(*(col[index] for col in self.columns()))
+        return Candle(
+            ts=int(self.ts[index]),
+            open=float(self.open[index]),
+            high=float(self.high[index]),
+            low=float(self.low[index]),
+            close=float(self.close[index]),
+            volume=float(self.volume[index]),
+        )
+
+    def __iter__(self) -> Iterator[Candle]:
+        for row in zip(*(col.tolist() for col in self.columns())):
+            yield Candle(*row)
+
+
 @dataclass
 class Signal:
     side: Literal["BUY", "SELL"]
@@ -28,6 +99,7 @@ class OrderIntent:
     qty: float
     price: float | None
     stop_loss: float
+    ref_price: float | None = None
 
 
 @dataclass
@@ -55,6 +127,18 @@ class Position:
     avg_price: float
 
 
+def apply_fill(qty: float, avg_price: float, fill: Fill) -> tuple[float, float]:
+    signed = fill.qty if fill.side == "BUY" else -fill.qty
+    new_qty = qty + signed
+    if abs(new_qty) < 1e-12:
+        return 0.0, fill.price
+    if qty * signed > 0:
+        return new_qty, (avg_price * abs(qty) + fill.price * fill.qty) / abs(new_qty)
+    if qty * new_qty > 0:
+        return new_qty, avg_price
+    return new_qty, fill.price
+
+
 @dataclass
 class TradeRecord:
     symbol: str
@@ -3,7 +3,7 @@ from __future__ import annotations
 import time
 from dataclasses import dataclass
 
-from data.store import BaseStore
+from data.store import AsyncStore
 
 
 @dataclass
@@ -15,12 +15,12 @@ class EngineState:
 
 
 class EngineStateStore:
-    def __init__(self, store: BaseStore, user_id: int) -> None:
+    def __init__(self, store: AsyncStore, user_id: int) -> None:
         self.store = store
         self.user_id = user_id
 
-    def load(self) -> EngineState:
-        row = self.store.get_engine_state(self.user_id)
+    async def load(self) -> EngineState:
+        row = await self.store.get_engine_state(self.user_id)
         return EngineState(
             last_candle_ts=row.get("last_candle_ts"),
             last_error=row.get("last_error"),
@@ -28,6 +28,6 @@ class EngineStateStore:
             paused=bool(row.get("paused")),
         )
 
-    def update(self, **kwargs) -> None:
+    async def update(self, **kwargs) -> None:
         kwargs["updated_at"] = int(time.time())
-        self.store.set_engine_state(self.user_id, **kwargs)
+        await self.store.set_engine_state(self.user_id, **kwargs)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import time
+import uuid
+from typing import Any
+
+from data.daily_stats import DailyStats
+from data.writes import EngineStateWrite, PositionWrite, RiskEventWrite, TradeWrite, Write
+from engine.models import Fill, apply_fill
+
+
+class TickUnit:
+    def __init__(self, user_id: int, positions: list[dict[str, Any]], stats: DailyStats) -> None:
+        self.user_id = user_id
+        self.positions = {p["symbol"]: (float(p["qty"]), float(p["avg_price"])) for p in positions}
+        self.stats = stats
+        self.state: dict[str, Any] = {}
+        self.journal_entries: list[int] = []
+        self._writes: list[Write] = []
+
+    @property
+    def open_symbols(self) -> set[str]:
+        return {symbol for symbol, (qty, _) in self.positions.items() if qty}
+
+    def update_state(self, **kwargs: Any) -> None:
+        self.state.update(kwargs)
+
+    def record_risk_event(self, reason: str) -> None:
+        self._writes.append(RiskEventWrite(self.user_id, reason, int(time.time())))
+
+    def record_fill(self, fill: Fill, mode: str, adapter: str) -> list[Write]:
+        now = int(time.time())
+        qty, avg_price = self.positions.get(fill.symbol, (0.0, 0.0))
+        new_qty, avg_price = apply_fill(qty, avg_price, fill)
+        self.positions[fill.symbol] = (new_qty, avg_price)
+        self.stats.apply(fill.symbol, fill.side, fill.qty, fill.price)
+        writes: list[Write] = [
+            TradeWrite(
+                user_id=self.user_id,
+                symbol=fill.symbol,
+                side=fill.side,
+                qty=fill.qty,
+                price=fill.price,
+                mode=mode,
+                adapter=adapter,
+                order_id=fill.order_id,
+                created_at=now,
+                client_id=uuid.uuid4().hex,
+            ),
+            PositionWrite(self.user_id, fill.symbol, new_qty, avg_price, now),
+        ]
+        self._writes.extend(writes)
+        return writes
+
+    def writes(self) -> list[Write]:
+        writes = list(self._writes)
+        if self.state:
+            writes.append(EngineStateWrite(self.user_id, {**self.state, "updated_at": int(time.time())}))
+        return writes
@@ -3,7 +3,8 @@ from __future__ import annotations
 import time
 from dataclasses import dataclass
 
-from data.store import BaseStore
+from data.daily_stats import DailyStats, day_start
+from data.store import AsyncStore
 from engine.models import OrderIntent, Signal
 from services.config_service import RuntimeConfig
 
@@ -17,11 +18,11 @@ class RiskDecision:
 
 
 class RiskManager:
-    def __init__(self, store: BaseStore) -> None:
+    def __init__(self, store: AsyncStore) -> None:
         self.store = store
         self._last_notify_ts: dict[str, int] = {}
 
-    def evaluate(
+    async def evaluate(
         self,
         user_id: int,
         symbol: str,
@@ -30,18 +31,19 @@ class RiskManager:
         open_positions: int,
         config: RuntimeConfig,
         spread: float,
+        stats: DailyStats | None = None,
     ) -> RiskDecision:
         if spread > config.max_spread:
             return RiskDecision(False, f"Spread too high: {spread:.6f}", None)
         if open_positions >= config.max_open_positions:
             return RiskDecision(False, "Max open positions reached", None)
 
-        day_start = int(time.time()) - (int(time.time()) % 86400)
-        trades_today = self.store.list_trades_since(user_id, day_start)
-        if len(trades_today) >= config.max_trades_per_day:
+        if stats is None:
+            stats = await self.store.get_daily_stats(user_id, day_start(int(time.time())))
+        if stats.trade_count >= config.max_trades_per_day:
             return RiskDecision(False, "Max trades per day reached", None)
 
-        pnl_pct = self.store.compute_daily_pnl_pct(user_id, day_start)
+        pnl_pct = stats.pnl_pct
         if pnl_pct <= -abs(config.max_daily_loss_pct):
             return RiskDecision(
                 False,
@@ -6,7 +6,7 @@ from typing import Any
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from data.store import BaseStore
+from data.store import AsyncStore
 
 
 class BotSettings(BaseSettings):
@@ -27,8 +27,26 @@ class BotSettings(BaseSettings):
     MAX_TRADES_PER_DAY: int = 3
     MAX_OPEN_POSITIONS: int = 1
     MAX_SPREAD: float = 0.0002
+    SYMBOL_CONCURRENCY: int = 8
+    SPREAD_CACHE_TTL: float = 0.5
+    IDEMPOTENCY_TTL: int = 604800
+    WRITE_JOURNAL_PATH: str = "./fills.journal"
+    WRITE_BATCH_SIZE: int = 500
+    WRITE_FLUSH_INTERVAL: float = 0.05
+    WRITE_MAX_ATTEMPTS: int = 5
+    WRITE_FLUSH_TIMEOUT: float = 30.0
+    WRITE_DEAD_LETTER_PATH: str = "./fills.deadletter"
     BINANCE_API_KEY: str = ""
     BINANCE_API_SECRET: str = ""
+    BINANCE_BASE_URL: str = "https://api.binance.com"
+    BINANCE_TIMEOUT: float = 10.0
+    BINANCE_MAX_CONNECTIONS: int = 20
+    BINANCE_WEIGHT_LIMIT: int = 6000
+    EXCHANGE_INFO_REFRESH_INTERVAL: int = 86400
+    KLINE_DOWNLOAD_CONCURRENCY: int = 4
+    PAPER_SLIPPAGE_BPS: float = 2.0
+    PAPER_FEE_BPS: float = 1.0
+    PAPER_SEED: int = 0
     MT5_LOGIN: str = ""
     MT5_PASSWORD: str = ""
     MT5_SERVER: str = ""
@@ -36,6 +54,14 @@ class BotSettings(BaseSettings):
     TELEGRAM_CHAT_ID: str = ""
     DATABASE_PATH: str = "./bot.db"
     DATABASE_URL: str = ""
+    SQLITE_CACHE_SIZE_KB: int = 16384
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_MAX_IDLE: float = 300.0
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_EXECUTOR_WORKERS: int = 8
+    CANDLE_STORE_PATH: str = "./candles"
+    CSV_IMPORT_DIR: str = "./imports"
     CREDENTIAL_ENCRYPTION_KEY: str = ""
     ALLOW_ALL_USERS: bool = True
 
@@ -55,16 +81,33 @@ class RuntimeConfig(BaseModel):
     max_open_positions: int
     max_spread: float
     symbol_map: dict[str, str]
+    symbol_concurrency: int = 8
 
 
 class ConfigService:
-    def __init__(self, store: BaseStore, base: BotSettings) -> None:
+    def __init__(self, store: AsyncStore, base: BotSettings) -> None:
         self.store = store
         self.base = base
+        self._cache: dict[int, RuntimeConfig] = {}
+        self._versions: dict[int, int] = {}
 
-    def load(self, user_id: int) -> RuntimeConfig:
+    async def load(self, user_id: int) -> RuntimeConfig:
+        config = self._cache.get(user_id)
+        if config is not None:
+            return config.model_copy(deep=True)
+        version = self._versions.get(user_id, 0)
+        config = self._build(await self.store.get_settings(user_id))
+        if self._versions.get(user_id, 0) == version:
+            self._cache[user_id] = config
+        return config.model_copy(deep=True)
+
+    def invalidate(self, user_id: int) -> None:
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        self._cache.pop(user_id, None)
+
+    def _build(self, settings: dict[str, Any]) -> RuntimeConfig:
         def _get(key: str, default: Any) -> Any:
-            return self.store.get_setting(user_id, key, default)
+            return settings.get(key, default)
 
         symbol_map_raw = _get("SYMBOL_MAP", self.base.SYMBOL_MAP)
         try:
@@ -86,10 +129,14 @@ class ConfigService:
             max_open_positions=int(_get("MAX_OPEN_POSITIONS", self.base.MAX_OPEN_POSITIONS)),
             max_spread=float(_get("MAX_SPREAD", self.base.MAX_SPREAD)),
             symbol_map=symbol_map,
+            symbol_concurrency=int(_get("SYMBOL_CONCURRENCY", self.base.SYMBOL_CONCURRENCY)),
         )
 
     def update(self, key: str, value: Any) -> None:
         raise ValueError("Use update_for_user")
 
-    def update_for_user(self, user_id: int, key: str, value: Any) -> None:
-        self.store.set_setting(user_id, key, value)
+    async def update_for_user(self, user_id: int, key: str, value: Any) -> None:
+        try:
+            await self.store.set_setting(user_id, key, value)
+        finally:
+            self.invalidate(user_id)
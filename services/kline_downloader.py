@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Callable
+
+from loguru import logger
+
+from adapters.binance_spot import BinanceSpotAdapter
+from data.candle_store import CandleStore
+from engine.models import CandleSeries
+from services.scheduler import timeframe_seconds
+
+
+class KlineDownloader:
+    def __init__(
+        self,
+        adapter: BinanceSpotAdapter,
+        store: CandleStore,
+        page_size: int = 1000,
+        concurrency: int = 4,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.adapter = adapter
+        self.store = store
+        self.page_size = page_size
+        self.concurrency = max(1, concurrency)
+        self.clock = clock
+
+    def pages(self, symbol: str, timeframe: str, start_ts: int, end_ts: int | None = None) -> list[tuple[int, int]]:
+        step = timeframe_seconds(timeframe)
+        last_closed = (int(self.clock()) // step - 1) * step
+        end_ts = last_closed if end_ts is None else min(end_ts, last_closed)
+        start_ts = -(-start_ts // step) * step
+        _, first_ts, last_ts = self.store.info(symbol, timeframe)
+        spans = [(start_ts, end_ts)]
+        if first_ts is not None:
+            spans = [(start_ts, min(end_ts, first_ts - step)), (max(start_ts, last_ts + step), end_ts)]
+        span = self.page_size * step
+        return [(ts, min(ts + span - step, stop)) for lo, stop in spans for ts in range(lo, stop + 1, span)]
+
+    async def download(self, symbol: str, timeframe: str, start_ts: int, end_ts: int | None = None) -> int:
+        symbol = symbol.upper()
+        pages = self.pages(symbol, timeframe, start_ts, end_ts)
+        first_ts = self.store.info(symbol, timeframe)[1]
+        backfill = sum(1 for _, end in pages if first_ts is not None and end < first_ts)
+        history = CandleSeries.empty()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending: deque[asyncio.Task] = deque()
+        added = done = 0
+
+        async def fetch(start: int, end: int) -> CandleSeries:
+            async with semaphore:
+                return await self.adapter.fetch_candle_range(symbol, timeframe, start, end, limit=self.page_size)
+
+        async def collect() -> int:
+            nonlocal history, done
+            candles = await pending.popleft()
+            done += 1
+            if done > backfill:
+                return await self._store(symbol, timeframe, candles)
+            history = history.concat(candles)
+            return await self._store(symbol, timeframe, history) if done == backfill else 0
+
+        try:
+            for start, end in pages:
+                pending.append(asyncio.create_task(fetch(start, end)))
+                if len(pending) >= self.concurrency * 2:
+                    added += await collect()
+            while pending:
+                added += await collect()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        logger.info("Downloaded {} {} candles for {} in {} pages", added, timeframe, symbol, len(pages))
+        return added
+
+    async def _store(self, symbol: str, timeframe: str, candles: CandleSeries) -> int:
+        if not len(candles):
+            return 0
+        return await asyncio.to_thread(self.store.append, symbol, timeframe, candles)
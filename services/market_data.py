@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from adapters.base import BrokerAdapter
+from engine.models import CandleSeries, Fill, OrderIntent, Position
+from services.scheduler import timeframe_seconds
+
+
+class MarketDataHub:
+    def __init__(self, spread_ttl: float = 1.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.spread_ttl = spread_ttl
+        self.clock = clock
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._spreads: dict[tuple[str, str], tuple[float, float]] = {}
+        self._prices: dict[tuple[str, str], tuple[float, float, int]] = {}
+
+    def feed(self, source: str, provider: BrokerAdapter) -> MarketDataFeed:
+        return MarketDataFeed(self, source, provider)
+
+    async def fetch_candles(
+        self, source: str, provider: BrokerAdapter, symbol: str, timeframe: str, limit: int
+    ) -> CandleSeries:
+        key = ("candles", source, symbol, timeframe, limit)
+        candles = await self._coalesce(key, lambda: provider.fetch_candles(symbol, timeframe, limit=limit))
+        if len(candles):
+            self._prices[(source, symbol)] = (float(candles.close[-1]), self.clock(), timeframe_seconds(timeframe))
+        return candles
+
+    def last_price(self, source: str, symbol: str) -> float | None:
+        cached = self._prices.get((source, symbol))
+        if cached is None or self.clock() - cached[1] > cached[2]:
+            return None
+        return cached[0]
+
+    def last_spread(self, source: str, symbol: str) -> float | None:
+        cached = self._spreads.get((source, symbol))
+        return cached[0] if cached else None
+
+    async def get_spread(self, source: str, provider: BrokerAdapter, symbol: str) -> float:
+        return (await self.get_spreads(source, provider, [symbol]))[symbol]
+
+    async def get_spreads(self, source: str, provider: BrokerAdapter, symbols: list[str]) -> dict[str, float]:
+        quotes = await self.get_spread_quotes(source, provider, symbols)
+        return {symbol: spread for symbol, (spread, _) in quotes.items()}
+
+    async def get_spread_quotes(
+        self, source: str, provider: BrokerAdapter, symbols: list[str]
+    ) -> dict[str, tuple[float, float]]:
+        now = self.clock()
+        quotes: dict[str, tuple[float, float]] = {}
+        missing = []
+        for symbol in symbols:
+            cached = self._spreads.get((source, symbol))
+            if cached and now - cached[1] < self.spread_ttl:
+                quotes[symbol] = cached
+            else:
+                missing.append(symbol)
+        if missing:
+            key = ("spreads", source, tuple(sorted(set(missing))))
+            fetched = await self._coalesce(key, lambda: self._fetch_spreads(source, provider, list(key[2])))
+            for symbol in missing:
+                if symbol not in fetched:
+                    raise RuntimeError(f"No spread returned for {symbol}")
+                quotes[symbol] = fetched[symbol]
+        return quotes
+
+    async def _fetch_spreads(
+        self, source: str, provider: BrokerAdapter, symbols: list[str]
+    ) -> dict[str, tuple[float, float]]:
+        spreads = await provider.get_spreads(symbols)
+        now = self.clock()
+        fetched = {symbol: (spread, now) for symbol, spread in spreads.items()}
+        for symbol, quote in fetched.items():
+            self._spreads[(source, symbol)] = quote
+        return fetched
+
+    async def _coalesce(self, key: tuple, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: tuple, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+
+class MarketDataFeed(BrokerAdapter):
+    def __init__(self, hub: MarketDataHub, source: str, provider: BrokerAdapter) -> None:
+        self.hub = hub
+        self.source = source
+        self.provider = provider
+
+    async def fetch_candles(self, symbol: str, timeframe: str, limit: int = 200) -> CandleSeries:
+        return await self.hub.fetch_candles(self.source, self.provider, symbol, timeframe, limit)
+
+    async def get_positions(self) -> list[Position]:
+        return []
+
+    async def get_spread(self, symbol: str) -> float:
+        return await self.hub.get_spread(self.source, self.provider, symbol)
+
+    async def get_spreads(self, symbols: list[str]) -> dict[str, float]:
+        return await self.hub.get_spreads(self.source, self.provider, symbols)
+
+    async def get_spread_quotes(self, symbols: list[str]) -> dict[str, tuple[float, float]]:
+        quotes = await self.hub.get_spread_quotes(self.source, self.provider, symbols)
+        now = self.hub.clock()
+        return {symbol: (spread, now - fetched_at) for symbol, (spread, fetched_at) in quotes.items()}
+
+    async def place_order(self, intent: OrderIntent) -> Fill:
+        raise RuntimeError("Market data feed cannot place orders")
@@ -2,55 +2,127 @@ from __future__ import annotations
 
 import asyncio
 
+import httpx
 from loguru import logger
 
 import json
 
+from adapters.binance_rest import create_http_client
 from adapters.binance_spot import BinanceSpotAdapter
-from adapters.mt5_terminal import MT5Adapter
-from adapters.paper import PaperAdapter
-from data.store import BaseStore
+from adapters.rate_limit import WeightLimiter
+from adapters.symbol_filters import SymbolFilterCache
+from adapters.mt5_executor import MT5Executor, shared_executor
+from adapters.mt5_terminal import MT5Adapter, mt5
+from adapters.paper import PaperAdapter, PaperExchange
+from data.candle_store import CandleStore
+from data.store import AsyncStore
+from data.write_behind import WriteBehind
 from engine.core import TradingEngine
 from engine.state import EngineStateStore
-from services.config_service import BotSettings, ConfigService
+from services.config_service import BotSettings, ConfigService, RuntimeConfig
 from services.crypto import decrypt, build_fernet
+from services.market_data import MarketDataHub
 from services.notifier import Notifier
 from strategies.ma_atr import MovingAverageAtrStrategy
 
 
 class EngineOrchestrator:
-    def __init__(self, store: BaseStore, settings: BotSettings, notifier: Notifier) -> None:
+    def __init__(
+        self,
+        store: AsyncStore,
+        settings: BotSettings,
+        notifier: Notifier,
+        config_service: ConfigService | None = None,
+        writes: WriteBehind | None = None,
+    ) -> None:
         self.store = store
         self.settings = settings
         self.notifier = notifier
-        self.config_service = ConfigService(store, settings)
+        self.config_service = config_service or ConfigService(store, settings)
+        self.writes = writes or WriteBehind(store)
         self._tasks: dict[int, asyncio.Task] = {}
         self._engines: dict[int, TradingEngine] = {}
         self._fernet = build_fernet(settings.CREDENTIAL_ENCRYPTION_KEY)
+        self.market_data = MarketDataHub(spread_ttl=settings.SPREAD_CACHE_TTL)
+        self.paper = PaperExchange(
+            self.market_data,
+            "binance",
+            slippage_bps=settings.PAPER_SLIPPAGE_BPS,
+            fee_bps=settings.PAPER_FEE_BPS,
+            seed=settings.PAPER_SEED,
+        )
+        self._public_binance: BinanceSpotAdapter | None = None
+        self._binance_http: httpx.AsyncClient | None = None
+        self._mt5_executor: MT5Executor | None = None
+        self.binance_limiter = WeightLimiter(settings.BINANCE_WEIGHT_LIMIT)
+        self.candle_store = CandleStore(settings.CANDLE_STORE_PATH)
+        self.binance_filters = SymbolFilterCache(store, refresh_interval=settings.EXCHANGE_INFO_REFRESH_INTERVAL)
 
-    def _load_credentials(self, user_id: int, adapter: str) -> dict:
-        blob = self.store.get_credentials(user_id, adapter)
+    async def _load_credentials(self, user_id: int, adapter: str) -> dict:
+        blob = await self.store.get_credentials(user_id, adapter)
         if not blob:
             return {}
         data = json.loads(decrypt(self._fernet, blob))
         return data
 
-    def _build_adapter(self, user_id: int):
-        config = self.config_service.load(user_id)
+    def _http(self) -> httpx.AsyncClient:
+        if self._binance_http is None:
+            self._binance_http = create_http_client(
+                self.settings.BINANCE_BASE_URL,
+                timeout=self.settings.BINANCE_TIMEOUT,
+                max_connections=self.settings.BINANCE_MAX_CONNECTIONS,
+            )
+        return self._binance_http
+
+    async def close(self) -> None:
+        if self._binance_http is not None:
+            await self._binance_http.aclose()
+            self._binance_http = None
+        if self._mt5_executor is not None:
+            await asyncio.to_thread(self._mt5_executor.shutdown)
+            self._mt5_executor = None
+
+    def _mt5(self) -> MT5Executor:
+        if self._mt5_executor is None:
+            if mt5 is None:
+                raise RuntimeError("MetaTrader5 package not installed")
+            self._mt5_executor = shared_executor(mt5)
+        return self._mt5_executor
+
+    def public_binance(self) -> BinanceSpotAdapter:
+        if self._public_binance is None:
+            self._public_binance = BinanceSpotAdapter("", "", http=self._http(), limiter=self.binance_limiter)
+        return self._public_binance
+
+    def _binance_feed(self):
+        return self.market_data.feed("binance", self.public_binance())
+
+    def _build_market_data(self, config: RuntimeConfig):
+        if config.adapter in ("binance", "paper"):
+            return self._binance_feed()
+        return None
+
+    async def _build_adapter(self, user_id: int, config: RuntimeConfig):
         if config.adapter == "binance":
-            creds = self._load_credentials(user_id, "binance")
-            return BinanceSpotAdapter(creds.get("api_key", ""), creds.get("api_secret", ""))
+            creds = await self._load_credentials(user_id, "binance")
+            return BinanceSpotAdapter(
+                creds.get("api_key", ""),
+                creds.get("api_secret", ""),
+                http=self._http(),
+                limiter=self.binance_limiter,
+                filters=self.binance_filters,
+            )
         if config.adapter == "mt5":
-            creds = self._load_credentials(user_id, "mt5")
+            creds = await self._load_credentials(user_id, "mt5")
             return MT5Adapter(
                 str(creds.get("login", "")),
                 str(creds.get("password", "")),
                 str(creds.get("server", "")),
                 config.symbol_map,
+                executor=self._mt5(),
             )
         if config.adapter == "paper":
-            data_provider = BinanceSpotAdapter("", "")
-            return PaperAdapter(data_provider)
+            return PaperAdapter(self._binance_feed(), self.paper, user_id)
         raise ValueError(f"Unknown adapter: {config.adapter}")
 
     async def start(self, user_id: int, chat_id: str | None = None) -> None:
@@ -58,16 +130,27 @@ class EngineOrchestrator:
         if task and not task.done():
             return
         state_store = EngineStateStore(self.store, user_id)
-        state_store.update(paused=0)
-        adapter = self._build_adapter(user_id)
-        engine = TradingEngine(adapter, self.store, self.config_service, self.notifier, MovingAverageAtrStrategy(), user_id=user_id)
+        await state_store.update(paused=0)
+        config = await self.config_service.load(user_id)
+        adapter = await self._build_adapter(user_id, config)
+        engine = TradingEngine(
+            adapter,
+            self.store,
+            self.config_service,
+            self.notifier,
+            MovingAverageAtrStrategy(),
+            user_id=user_id,
+            market_data=self._build_market_data(config),
+            writes=self.writes,
+            candle_store=self.candle_store if config.adapter in ("binance", "paper") else None,
+        )
         self._engines[user_id] = engine
         self._tasks[user_id] = asyncio.create_task(engine.run_forever(chat_id=chat_id))
         logger.info("Engine started for user {}", user_id)
 
     async def pause(self, user_id: int) -> None:
         state_store = EngineStateStore(self.store, user_id)
-        state_store.update(paused=1)
+        await state_store.update(paused=1)
         logger.info("Engine paused for user {}", user_id)
 
     async def stop(self, user_id: int) -> None:
@@ -78,15 +161,15 @@ class EngineOrchestrator:
         if task:
             await asyncio.sleep(0)
         state_store = EngineStateStore(self.store, user_id)
-        state_store.update(paused=1)
+        await state_store.update(paused=1)
         logger.info("Engine stopped for user {}", user_id)
 
     async def kill(self, user_id: int) -> None:
         state_store = EngineStateStore(self.store, user_id)
-        state_store.update(kill_switch=1, paused=1)
+        await state_store.update(kill_switch=1, paused=1)
         logger.warning("Kill switch engaged for user {}", user_id)
 
     async def resume(self, user_id: int, chat_id: str | None = None) -> None:
         state_store = EngineStateStore(self.store, user_id)
-        state_store.update(kill_switch=0, paused=0)
+        await state_store.update(kill_switch=0, paused=0)
         await self.start(user_id, chat_id=chat_id)
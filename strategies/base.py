@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from typing import Iterator
 
-from engine.models import Candle, Signal
+from engine.models import CandleSeries, Signal
 from services.config_service import RuntimeConfig
 
 
 class Strategy(ABC):
     @abstractmethod
-    def generate(self, candles: list[Candle], config: RuntimeConfig) -> Signal | None:
+    def generate(self, candles: CandleSeries, config: RuntimeConfig, key: str | None = None) -> Signal | None:
         raise NotImplementedError
+
+    def stream(self, candles: CandleSeries, config: RuntimeConfig) -> Iterator[tuple[int, Signal]]:
+        for i in range(len(candles)):
+            signal = self.generate(candles[: i + 1], config)
+            if signal:
+                yield i, signal
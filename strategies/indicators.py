@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+
+
+class RollingMean:
+    """Constant-time rolling mean mirroring pandas' Kahan-compensated ``roll_mean``."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self._values: deque[float] = deque()
+        self._nobs = 0
+        self._sum = 0.0
+        self._neg_ct = 0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._same = 0
+        self._prev = math.nan
+        self._checkpoint: tuple | None = None
+        self.value = math.nan
+
+    def _state(self) -> tuple:
+        return (self._nobs, self._sum, self._neg_ct, self._comp_add, self._comp_remove, self._same, self._prev, self.value)
+
+    def update(self, value: float) -> float:
+        if not self._values or self.window <= 1:
+            self._values.clear()
+            self._nobs = self._neg_ct = self._same = 0
+            self._sum = self._comp_add = self._comp_remove = 0.0
+            self._prev = value
+        elif len(self._values) >= self.window:
+            self._remove(self._values.popleft())
+        self._checkpoint = self._state()
+        self._values.append(value)
+        self._add(value)
+        self.value = self._mean()
+        return self.value
+
+    def replace_last(self, value: float) -> float:
+        if self._checkpoint is None:
+            return self.update(value)
+        self._values.pop()
+        self._restore(self._checkpoint)
+        if not self._values:
+            self._prev = value
+        self._values.append(value)
+        self._add(value)
+        self.value = self._mean()
+        return self.value
+
+    def _restore(self, state: tuple) -> None:
+        (
+            self._nobs,
+            self._sum,
+            self._neg_ct,
+            self._comp_add,
+            self._comp_remove,
+            self._same,
+            self._prev,
+            self.value,
+        ) = state
+
+    def _add(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs += 1
+        y = value - self._comp_add
+        t = self._sum + y
+        self._comp_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._neg_ct += 1
+        if value == self._prev:
+            self._same += 1
+        else:
+            self._same = 1
+        self._prev = value
+
+    def _remove(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs -= 1
+        y = -value - self._comp_remove
+        t = self._sum + y
+        self._comp_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._neg_ct -= 1
+
+    def _mean(self) -> float:
+        if self._nobs < self.window or self._nobs == 0:
+            return math.nan
+        result = self._sum / self._nobs
+        if self._same >= self._nobs:
+            return self._prev
+        if self._neg_ct == 0 and result < 0:
+            return 0.0
+        if self._neg_ct == self._nobs and result > 0:
+            return 0.0
+        return result
+
+
+class MaAtrState:
+    def __init__(self, fast_ma: int, slow_ma: int, atr_period: int) -> None:
+        self.params = (fast_ma, slow_ma, atr_period)
+        self.fast = RollingMean(fast_ma)
+        self.slow = RollingMean(slow_ma)
+        self.atr = RollingMean(atr_period)
+        self.last_ts: int | None = None
+        self.close = math.nan
+        self.prev_fast = math.nan
+        self.prev_slow = math.nan
+        self._prev_close = math.nan
+        self._checkpoint: tuple[float, float] = (math.nan, math.nan)
+
+    def update(self, ts: int, high: float, low: float, close: float) -> None:
+        if ts == self.last_ts:
+            self.prev_fast, self.prev_slow = self._checkpoint
+            tr = self._true_range(high, low)
+            self.fast.replace_last(close)
+            self.slow.replace_last(close)
+            self.atr.replace_last(tr)
+        else:
+            self._prev_close = self.close
+            self.prev_fast, self.prev_slow = self.fast.value, self.slow.value
+            self._checkpoint = (self.prev_fast, self.prev_slow)
+            tr = self._true_range(high, low)
+            self.fast.update(close)
+            self.slow.update(close)
+            self.atr.update(tr)
+        self.last_ts = ts
+        self.close = close
+
+    def _true_range(self, high: float, low: float) -> float:
+        ranges = [high - low, abs(high - self._prev_close), abs(low - self._prev_close)]
+        return max(r for r in ranges if r == r)
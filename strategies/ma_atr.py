@@ -1,38 +1,67 @@
 from __future__ import annotations
 
-import pandas as pd
+import math
+from typing import Iterator
 
-from engine.models import Candle, Signal
+import numpy as np
+
+from engine.models import CandleSeries, Signal
 from services.config_service import RuntimeConfig
 from strategies.base import Strategy
+from strategies.indicators import MaAtrState
 
 
 class MovingAverageAtrStrategy(Strategy):
-    def generate(self, candles: list[Candle], config: RuntimeConfig) -> Signal | None:
+    def __init__(self) -> None:
+        self._states: dict[str, MaAtrState] = {}
+
+    def generate(self, candles: CandleSeries, config: RuntimeConfig, key: str | None = None) -> Signal | None:
         if len(candles) < max(config.fast_ma, config.slow_ma, config.atr_period) + 2:
             return None
-        df = pd.DataFrame([c.__dict__ for c in candles])
-        df["fast"] = df["close"].rolling(config.fast_ma).mean()
-        df["slow"] = df["close"].rolling(config.slow_ma).mean()
-        df["tr"] = pd.concat(
-            [
-                df["high"] - df["low"],
-                (df["high"] - df["close"].shift()).abs(),
-                (df["low"] - df["close"].shift()).abs(),
-            ],
-            axis=1,
-        ).max(axis=1)
-        df["atr"] = df["tr"].rolling(config.atr_period).mean()
-
-        prev = df.iloc[-2]
-        last = df.iloc[-1]
-        if pd.isna(prev["fast"]) or pd.isna(prev["slow"]) or pd.isna(last["atr"]):
+        state = self._sync(candles, config, key)
+        return self._signal(state, config)
+
+    def stream(self, candles: CandleSeries, config: RuntimeConfig) -> Iterator[tuple[int, Signal]]:
+        state = MaAtrState(config.fast_ma, config.slow_ma, config.atr_period)
+        warmup = max(config.fast_ma, config.slow_ma, config.atr_period) + 2
+        columns = zip(candles.ts.tolist(), candles.high.tolist(), candles.low.tolist(), candles.close.tolist())
+        for i, (ts, high, low, close) in enumerate(columns):
+            state.update(ts, high, low, close)
+            if i + 1 < warmup:
+                continue
+            signal = self._signal(state, config)
+            if signal:
+                yield i, signal
+
+    def _sync(self, candles: CandleSeries, config: RuntimeConfig, key: str | None) -> MaAtrState:
+        params = (config.fast_ma, config.slow_ma, config.atr_period)
+        state = self._states.get(key) if key is not None else None
+        if (
+            state is None
+            or state.params != params
+            or state.last_ts is None
+            or not candles.ts[0] <= state.last_ts <= candles.ts[-1]
+        ):
+            state = MaAtrState(*params)
+            start = 0
+        else:
+            start = int(np.searchsorted(candles.ts, state.last_ts))
+        tail = candles[start:]
+        for ts, high, low, close in zip(tail.ts.tolist(), tail.high.tolist(), tail.low.tolist(), tail.close.tolist()):
+            state.update(ts, high, low, close)
+        if key is not None:
+            self._states[key] = state
+        return state
+
+    def _signal(self, state: MaAtrState, config: RuntimeConfig) -> Signal | None:
+        fast, slow, atr = state.fast.value, state.slow.value, state.atr.value
+        if math.isnan(state.prev_fast) or math.isnan(state.prev_slow) or math.isnan(atr):
             return None
 
-        if prev["fast"] <= prev["slow"] and last["fast"] > last["slow"]:
-            stop_loss = last["close"] - (last["atr"] * config.atr_multiplier)
+        if state.prev_fast <= state.prev_slow and fast > slow:
+            stop_loss = state.close - (atr * config.atr_multiplier)
             return Signal(side="BUY", reason="MA cross up", stop_loss=float(stop_loss))
-        if prev["fast"] >= prev["slow"] and last["fast"] < last["slow"]:
-            stop_loss = last["close"] + (last["atr"] * config.atr_multiplier)
+        if state.prev_fast >= state.prev_slow and fast < slow:
+            stop_loss = state.close + (atr * config.atr_multiplier)
             return Signal(side="SELL", reason="MA cross down", stop_loss=float(stop_loss))
         return None
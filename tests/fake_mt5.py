@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_H1 = 16385
+TRADE_ACTION_DEAL = 1
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+ORDER_TIME_GTC = 0
+ORDER_FILLING_IOC = 1
+TRADE_RETCODE_DONE = 10009
+
+RATE_DTYPE = np.dtype(
+    [
+        ("time", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("tick_volume", "<u8"),
+        ("spread", "<i4"),
+        ("real_volume", "<u8"),
+    ]
+)
+
+threads: set[int] = set()
+calls: list[str] = []
+logins: list[int] = []
+orders: list[dict] = []
+ticks: dict[str, SimpleNamespace] = {}
+_connected = False
+
+
+def reset() -> None:
+    global _connected
+    threads.clear()
+    calls.clear()
+    logins.clear()
+    orders.clear()
+    ticks.clear()
+    _connected = False
+
+
+def _record(name: str) -> None:
+    threads.add(threading.get_ident())
+    calls.append(name)
+
+
+def initialize() -> bool:
+    global _connected
+    _record("initialize")
+    _connected = True
+    return True
+
+
+def login(login: int, password: str = "", server: str = "") -> bool:
+    _record("login")
+    logins.append(login)
+    return password != "bad"
+
+
+def shutdown() -> None:
+    global _connected
+    _record("shutdown")
+    _connected = False
+
+
+def last_error() -> tuple[int, str]:
+    return (-1, "fake error")
+
+
+def copy_rates_from_pos(symbol: str, timeframe: int, start: int, count: int) -> np.ndarray:
+    _record("copy_rates_from_pos")
+    rates = np.zeros(count, dtype=RATE_DTYPE)
+    rates["time"] = np.arange(count) * 60 * timeframe
+    rates["close"] = np.arange(count) + 1.5
+    rates["tick_volume"] = 10
+    return rates
+
+
+def positions_get() -> tuple:
+    _record("positions_get")
+    return (SimpleNamespace(symbol="EURUSD", volume=0.1, price_open=1.1),)
+
+
+def symbol_info(symbol: str) -> SimpleNamespace | None:
+    _record("symbol_info")
+    return SimpleNamespace(visible=False) if symbol in ticks else None
+
+
+def symbol_select(symbol: str, enable: bool) -> bool:
+    _record("symbol_select")
+    return True
+
+
+def symbol_info_tick(symbol: str) -> SimpleNamespace | None:
+    _record("symbol_info_tick")
+    return ticks.get(symbol)
+
+
+def order_send(request: dict) -> SimpleNamespace:
+    _record("order_send")
+    orders.append(request)
+    return SimpleNamespace(retcode=TRADE_RETCODE_DONE, order=len(orders))
@@ -0,0 +1,25 @@
+import asyncio
+
+from adapters.base import BrokerAdapter
+from engine.models import Candle, CandleSeries
+
+
+class CountingProvider(BrokerAdapter):
+    def __init__(self) -> None:
+        self.candle_calls = 0
+        self.spread_calls = 0
+
+    async def fetch_candles(self, symbol, timeframe, limit=200):
+        self.candle_calls += 1
+        await asyncio.sleep(0.01)
+        return CandleSeries.from_candles([Candle(ts=0, open=1.0, high=1.0, low=1.0, close=1.0, volume=1.0)])
+
+    async def get_positions(self):
+        return []
+
+    async def get_spread(self, symbol):
+        self.spread_calls += 1
+        return 0.001
+
+    async def place_order(self, intent):
+        raise NotImplementedError
@@ -0,0 +1,91 @@
+import random
+
+import pandas as pd
+
+from backtest.metrics import compute_metrics
+from backtest.parallel import run_parallel_backtest
+from backtest.runner import load_csv, run_backtest
+from backtest.sweep import sweep_csv
+from services.config_service import RuntimeConfig
+from strategies.base import Strategy
+from strategies.ma_atr import MovingAverageAtrStrategy
+
+
+def _config() -> RuntimeConfig:
+    return RuntimeConfig(
+        mode="backtest",
+        adapter="paper",
+        symbols=["BTCUSDT"],
+        timeframe="1m",
+        fast_ma=5,
+        slow_ma=12,
+        atr_period=6,
+        atr_multiplier=2.0,
+        risk_per_trade_pct=1.0,
+        max_daily_loss_pct=2.0,
+        max_trades_per_day=3,
+        max_open_positions=1,
+        max_spread=0.01,
+        symbol_map={},
+    )
+
+
+def _write_csv(path, bars: int = 600) -> None:
+    rng = random.Random(11)
+    price = 100.0
+    rows = []
+    for i in range(bars):
+        price += rng.gauss(0, 1)
+        rows.append({"timestamp": i * 60, "open": price, "high": price + 1, "low": price - 1, "close": price, "volume": 1})
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def test_streaming_backtest_matches_prefix_replay(tmp_path):
+    path = tmp_path / "bars.csv"
+    _write_csv(path)
+    config = _config()
+    trades = run_backtest(str(path), config)
+
+    candles = load_csv(str(path))
+    strategy = MovingAverageAtrStrategy()
+    expected = [
+        (signal.side, float(candles.close[i]))
+        for i, signal in Strategy.stream(strategy, candles, config)
+        if i >= config.slow_ma + config.atr_period
+    ]
+    assert trades
+    assert [(t.side, t.price) for t in trades] == expected
+
+
+def test_sweep_matches_single_backtests(tmp_path):
+    path = tmp_path / "bars.csv"
+    _write_csv(path)
+    candles = load_csv(str(path))
+    config = _config()
+    results = sweep_csv(str(path), config, [3, 5], [10, 12], [6, 14], [1.5, 2.0])
+    assert len(results) == 16
+    assert [r.net_pnl for r in results] == sorted((r.net_pnl for r in results), reverse=True)
+
+    for r in results:
+        combo = config.model_copy(update={"fast_ma": r.fast_ma, "slow_ma": r.slow_ma, "atr_period": r.atr_period})
+        metrics = compute_metrics(run_backtest(str(path), combo), last_price=float(candles.close[-1]))
+        assert r.total_trades == metrics.total_trades
+        assert abs(r.net_pnl - metrics.net_pnl) < 1e-6
+
+
+def test_parallel_backtest_merges_deterministically(tmp_path):
+    paths = {}
+    for symbol in ("BTCUSDT", "ETHUSDT"):
+        paths[symbol] = str(tmp_path / f"{symbol}.csv")
+        _write_csv(paths[symbol], bars=300)
+    configs = [_config().model_copy(update={"fast_ma": f}) for f in (3, 4, 5)]
+    result = run_parallel_backtest(paths, configs, workers=2, chunk_size=2)
+
+    assert [(r.symbol, r.config_index) for r in result.runs] == [
+        (s, i) for s in ("BTCUSDT", "ETHUSDT") for i in range(3)
+    ]
+    assert [t.shard for t in result.timings] == [0, 1, 2, 3]
+    for run in result.runs:
+        expected = run_backtest(paths[run.symbol], configs[run.config_index])
+        assert [(t.side, t.price) for t in run.trades] == [(t.side, t.price) for t in expected]
+        assert all(t.symbol == run.symbol for t in run.trades)
@@ -0,0 +1,99 @@
+import asyncio
+import hashlib
+import hmac
+from urllib.parse import urlencode
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from adapters.binance_rest import create_http_client
+from adapters.binance_spot import BinanceSpotAdapter
+from adapters.rate_limit import WeightLimiter
+from engine.models import OrderIntent
+
+
+class StubBinance:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.orders: list[dict] = []
+        self.ticker_calls = 0
+        app = web.Application()
+        app.router.add_get("/api/v3/klines", self.klines)
+        app.router.add_get("/api/v3/ticker/bookTicker", self.book_ticker)
+        app.router.add_get("/api/v3/exchangeInfo", self.exchange_info)
+        app.router.add_post("/api/v3/order", self.order)
+        self.server = TestServer(app)
+
+    async def klines(self, request: web.Request) -> web.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+        limit = int(request.query["limit"])
+        rows = [[(1000 + i) * 1000, "1.0", "2.0", "0.5", str(1.5 + i), "10.0", 0, "0", 0, "0", "0", "0"] for i in range(limit)]
+        return web.json_response(rows, headers={"X-MBX-USED-WEIGHT-1M": "5000"})
+
+    async def book_ticker(self, request: web.Request) -> web.Response:
+        self.ticker_calls += 1
+        if self.ticker_calls == 1:
+            return web.json_response({"code": -1003, "msg": "Too many requests"}, status=429, headers={"Retry-After": "0"})
+        if "symbol" in request.query:
+            return web.json_response({"symbol": request.query["symbol"], "bidPrice": "99.0", "askPrice": "100.0"})
+        symbols = request.query["symbols"].strip("[]").replace('"', "").split(",")
+        return web.json_response([{"symbol": s, "bidPrice": "49.0", "askPrice": "50.0"} for s in symbols])
+
+    async def exchange_info(self, request: web.Request) -> web.Response:
+        assert request.query["symbols"] == '["BTCUSDT"]'
+        filters = [{"filterType": "LOT_SIZE", "stepSize": "0.00100000"}]
+        return web.json_response({"symbols": [{"symbol": "BTCUSDT", "filters": filters}]})
+
+    async def order(self, request: web.Request) -> web.Response:
+        params = dict(request.query)
+        signature = params.pop("signature")
+        expected = hmac.new(b"secret", urlencode(params).encode(), hashlib.sha256).hexdigest()
+        if request.headers.get("X-MBX-APIKEY") != "key" or signature != expected:
+            return web.json_response({"code": -1022, "msg": "Signature for this request is not valid."}, status=400)
+        if float(params["quantity"]) <= 0:
+            return web.json_response({"code": -1013, "msg": "Filter failure: LOT_SIZE"}, status=400)
+        self.orders.append(params)
+        return web.json_response({"orderId": 42, "fills": [{"price": "100.5", "qty": params["quantity"]}]})
+
+
+@pytest.mark.asyncio
+async def test_binance_adapter_against_stub_server():
+    stub = StubBinance()
+    await stub.server.start_server()
+    http = create_http_client(str(stub.server.make_url("")), timeout=5.0, max_connections=4)
+    try:
+        limiter = WeightLimiter(limit=6000)
+        adapter = BinanceSpotAdapter("key", "secret", http=http, limiter=limiter)
+        series = await asyncio.gather(*(adapter.fetch_candles("BTCUSDT", "1m", limit=3) for _ in range(12)))
+        assert stub.max_in_flight <= 4
+        assert series[0].ts.tolist() == [1000, 1001, 1002]
+        assert series[0].close.tolist() == [1.5, 2.5, 3.5]
+        assert limiter.stats()["budget"] <= 400
+        assert await adapter.get_spread("BTCUSDT") == pytest.approx(0.01)
+        assert stub.ticker_calls == 2
+        assert limiter.stats()["throttled"] == 1
+        spreads = await adapter.get_spreads(["BTCUSDT", "ETHUSDT", "BNBUSDT"])
+        assert spreads == {"BTCUSDT": pytest.approx(0.02), "ETHUSDT": pytest.approx(0.02), "BNBUSDT": pytest.approx(0.02)}
+        assert stub.ticker_calls == 3
+
+        with pytest.raises(RuntimeError, match="not loaded"):
+            await adapter.place_order(OrderIntent(symbol="BTCUSDT", side="BUY", qty=0.12345, price=None, stop_loss=None))
+        await adapter.prepare(["BTCUSDT"])
+        fill = await adapter.place_order(OrderIntent(symbol="BTCUSDT", side="BUY", qty=0.12345, price=None, stop_loss=None))
+        assert (fill.order_id, fill.qty, fill.price) == ("42", 0.123, 100.5)
+        assert stub.orders[0]["type"] == "MARKET"
+
+        with pytest.raises(RuntimeError, match="LOT_SIZE"):
+            await adapter.place_order(OrderIntent(symbol="BTCUSDT", side="SELL", qty=0.0001, price=None, stop_loss=None))
+        with pytest.raises(RuntimeError, match="Signature"):
+            await BinanceSpotAdapter("key", "wrong", http=http, filters=adapter.filters).place_order(
+                OrderIntent(symbol="BTCUSDT", side="BUY", qty=1.0, price=None, stop_loss=None)
+            )
+    finally:
+        await http.aclose()
+        await stub.server.close()
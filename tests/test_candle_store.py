@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.candle_store import CandleStore, import_csv, resolve_import_path
+from engine.models import CandleSeries
+
+
+def _series(ts: list[int]) -> CandleSeries:
+    values = np.asarray(ts, dtype=np.float64)
+    return CandleSeries(ts, values, values + 1, values - 1, values, np.ones(len(ts)))
+
+
+def test_append_dedupes_and_reads_ranges(tmp_path):
+    store = CandleStore(tmp_path)
+    assert store.append("btcusdt", "1m", _series([0, 60, 120])) == 3
+    assert store.append("BTCUSDT", "1m", _series([120, 60, 180, 240, 240])) == 2
+
+    assert store.info("BTCUSDT", "1m") == (5, 0, 240)
+    candles = store.read("BTCUSDT", "1m")
+    assert not candles.close.flags.owndata
+    assert candles.ts.tolist() == [0, 60, 120, 180, 240]
+    assert store.read("BTCUSDT", "1m", start_ts=60, end_ts=180).ts.tolist() == [60, 120, 180]
+    assert store.read("BTCUSDT", "1m", start_ts=61).ts.tolist() == [120, 180, 240]
+    assert len(store.read("ETHUSDT", "1m")) == 0
+
+
+def test_import_csv(tmp_path):
+    path = tmp_path / "bars.csv"
+    pd.DataFrame(
+        {"timestamp": [0, 60], "open": [1.0, 2.0], "high": [1.5, 2.5], "low": [0.5, 1.5], "close": [1.2, 2.2], "volume": [3, 4]}
+    ).to_csv(path, index=False)
+    store = CandleStore(tmp_path / "store")
+    assert import_csv(store, str(path), "BTCUSDT", "1m") == 2
+    assert import_csv(store, str(path), "BTCUSDT", "1m") == 0
+    candles = store.read("BTCUSDT", "1m")
+    assert candles[-1].close == 2.2
+    assert candles.volume.tolist() == [3.0, 4.0]
+
+
+def test_resolve_import_path_stays_inside_import_dir(tmp_path):
+    assert resolve_import_path(tmp_path, "bars.csv") == (tmp_path / "bars.csv").resolve()
+    assert resolve_import_path(tmp_path, str(tmp_path / "sub" / "bars.csv")) == (tmp_path / "sub" / "bars.csv").resolve()
+    for path in ("../bars.csv", "/etc/passwd", "sub/../../bars.csv"):
+        with pytest.raises(ValueError):
+            resolve_import_path(tmp_path, path)
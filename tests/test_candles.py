@@ -0,0 +1,89 @@
+import pytest
+
+from adapters.base import BrokerAdapter
+from data.candle_store import CandleStore
+from engine.candles import CandleBuffer
+from engine.models import Candle, CandleSeries
+
+
+class HistoryAdapter(BrokerAdapter):
+    def __init__(self, candles: list[Candle]) -> None:
+        self.candles = candles
+        self.limits: list[int] = []
+
+    async def fetch_candles(self, symbol, timeframe, limit=200):
+        self.limits.append(limit)
+        return CandleSeries.from_candles(self.candles[-limit:])
+
+    async def get_positions(self):
+        return []
+
+    async def get_spread(self, symbol):
+        return 0.0
+
+    async def place_order(self, intent):
+        raise NotImplementedError
+
+
+def _bar(ts: int, close: float = 1.0) -> Candle:
+    return Candle(ts=ts, open=close, high=close, low=close, close=close, volume=1.0)
+
+
+@pytest.mark.asyncio
+async def test_buffer_tops_up_with_new_bars_only():
+    adapter = HistoryAdapter([_bar(i * 60) for i in range(10)])
+    now = [9 * 60 + 5]
+    buffer = CandleBuffer(adapter, "BTCUSDT", "1m", capacity=5, clock=lambda: now[0])
+
+    first = await buffer.refresh()
+    assert first.ts.tolist() == [300, 360, 420, 480, 540]
+
+    adapter.candles[-1] = _bar(540, close=2.0)
+    adapter.candles.append(_bar(600))
+    now[0] = 600 + 5
+    second = await buffer.refresh()
+    assert adapter.limits == [5, 2]
+    assert second.ts.tolist() == [360, 420, 480, 540, 600]
+    assert second[-2].close == 2.0
+
+
+@pytest.mark.asyncio
+async def test_buffer_backfills_on_gap():
+    adapter = HistoryAdapter([_bar(i * 60) for i in range(5)])
+    now = [4 * 60]
+    buffer = CandleBuffer(adapter, "BTCUSDT", "1m", capacity=5, clock=lambda: now[0])
+    await buffer.refresh()
+
+    adapter.candles = [_bar(i * 60) for i in range(8, 13)]
+    now[0] = 5 * 60
+    candles = await buffer.refresh()
+    assert adapter.limits == [5, 2, 5]
+    assert candles.ts.tolist() == [480, 540, 600, 660, 720]
+
+
+@pytest.mark.asyncio
+async def test_buffer_rolls_over_storage_without_losing_bars():
+    adapter = HistoryAdapter([_bar(i * 60, close=float(i)) for i in range(5)])
+    now = [4 * 60]
+    buffer = CandleBuffer(adapter, "BTCUSDT", "1m", capacity=5, clock=lambda: now[0])
+    await buffer.refresh()
+    for i in range(5, 40):
+        adapter.candles.append(_bar(i * 60, close=float(i)))
+        now[0] = i * 60
+        candles = await buffer.refresh()
+        assert candles.ts.tolist() == [t * 60 for t in range(i - 4, i + 1)]
+        assert candles.close.tolist() == [float(t) for t in range(i - 4, i + 1)]
+        assert candles[-1].ts == i * 60
+
+
+@pytest.mark.asyncio
+async def test_buffer_warms_up_from_the_candle_store(tmp_path):
+    history = CandleStore(tmp_path)
+    history.append("BTCUSDT", "1m", CandleSeries.from_candles([_bar(i * 60, close=float(i)) for i in range(8)]))
+    adapter = HistoryAdapter([_bar(i * 60, close=float(i)) for i in range(10)])
+    buffer = CandleBuffer(adapter, "BTCUSDT", "1m", capacity=5, clock=lambda: 9 * 60 + 5, history=history)
+
+    candles = await buffer.refresh()
+    assert adapter.limits == [3]
+    assert candles.ts.tolist() == [300, 360, 420, 480, 540]
+    assert candles.close.tolist() == [5.0, 6.0, 7.0, 8.0, 9.0]
@@ -0,0 +1,40 @@
+import pytest
+
+from data.store import AsyncStore, SQLiteStore
+from services.config_service import BotSettings, ConfigService
+
+
+class CountingStore(SQLiteStore):
+    def __init__(self, db_path: str) -> None:
+        super().__init__(db_path)
+        self.bulk_loads = 0
+
+    def get_settings(self, user_id):
+        self.bulk_loads += 1
+        return super().get_settings(user_id)
+
+
+@pytest.mark.asyncio
+async def test_config_is_cached_until_updated(tmp_path):
+    store = CountingStore(str(tmp_path / "c.db"))
+    db = AsyncStore(store, max_workers=2)
+    service = ConfigService(db, BotSettings(_env_file=None))
+    await db.set_setting(1, "SYMBOLS", "ETHUSDT")
+
+    first = await service.load(1)
+    assert first.symbols == ["ETHUSDT"]
+    first.max_trades_per_day = 99
+    first.symbols.append("BTCUSDT")
+    second = await service.load(1)
+    assert second is not first
+    assert (second.max_trades_per_day, second.symbols) == (3, ["ETHUSDT"])
+    assert store.bulk_loads == 1
+
+    await service.update_for_user(1, "FAST_MA", 7)
+    updated = await service.load(1)
+    assert updated.fast_ma == 7
+    assert store.bulk_loads == 2
+
+    await service.load(2)
+    assert store.bulk_loads == 3
+    db.close()
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from adapters.base import BrokerAdapter
+from data.store import AsyncStore, SQLiteStore
+from engine.core import TradingEngine
+from engine.models import Candle, CandleSeries, Fill, OrderIntent, Signal
+from services.config_service import BotSettings, ConfigService
+from services.notifier import Notifier
+from strategies.base import Strategy
+
+
+class FakeAdapter(BrokerAdapter):
+    def __init__(self, delay: float = 0.02) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.orders: list[OrderIntent] = []
+
+    async def fetch_candles(self, symbol, timeframe, limit=200):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return CandleSeries.from_candles([Candle(ts=1000, open=100.0, high=101.0, low=99.0, close=100.0, volume=1.0)])
+
+    async def get_positions(self):
+        return []
+
+    async def get_spread(self, symbol):
+        return 0.0
+
+    async def place_order(self, intent):
+        self.orders.append(intent)
+        return Fill(order_id=str(len(self.orders)), symbol=intent.symbol, side=intent.side, qty=intent.qty, price=100.0)
+
+
+class AlwaysBuy(Strategy):
+    def generate(self, candles, config, key=None):
+        return Signal(side="BUY", reason="test", stop_loss=99.0)
+
+
+class BatchCountingStore(SQLiteStore):
+    def __init__(self, db_path: str) -> None:
+        super().__init__(db_path)
+        self.batches: list[list] = []
+
+    def write_batch(self, writes):
+        self.batches.append(list(writes))
+        super().write_batch(writes)
+
+
+def _engine(tmp_path, adapter, store_cls=SQLiteStore, **settings) -> TradingEngine:
+    store = store_cls(str(tmp_path / "e.db"))
+    store.ensure_user(1, "u")
+    store.set_engine_state(1, paused=0)
+    base = BotSettings(**{"SYMBOLS": "A,B,C,D,E,F", "MAX_SPREAD": 0.01, "MAX_TRADES_PER_DAY": 100, **settings})
+    db = AsyncStore(store)
+    return TradingEngine(adapter, db, ConfigService(db, base), Notifier(), AlwaysBuy(), user_id=1)
+
+
+@pytest.mark.asyncio
+async def test_run_once_fetches_symbols_concurrently(tmp_path):
+    adapter = FakeAdapter()
+    engine = _engine(tmp_path, adapter, SYMBOL_CONCURRENCY=3, MAX_OPEN_POSITIONS=10)
+    await engine.run_once()
+    assert adapter.max_in_flight == 3
+    assert len(adapter.orders) == 6
+
+
+@pytest.mark.asyncio
+async def test_run_once_respects_max_open_positions(tmp_path):
+    adapter = FakeAdapter()
+    engine = _engine(tmp_path, adapter, SYMBOL_CONCURRENCY=6, MAX_OPEN_POSITIONS=2)
+    await engine.run_once()
+    assert len(adapter.orders) == 2
+    open_positions = [p for p in await engine.store.list_positions(1) if p["qty"]]
+    assert len(open_positions) == 2
+
+
+@pytest.mark.asyncio
+async def test_run_once_commits_the_tick_in_one_batch(tmp_path):
+    adapter = FakeAdapter()
+    engine = _engine(tmp_path, adapter, store_cls=BatchCountingStore, MAX_OPEN_POSITIONS=10, MAX_TRADES_PER_DAY=3)
+    await engine.run_once()
+    store = engine.store.store
+    assert len(adapter.orders) == 3
+    assert len(store.batches) == 1
+    assert len(store.list_trades(1, limit=10)) == 3
+    assert len([p for p in store.list_positions(1) if p["qty"]]) == 3
+    assert len(store.list_risk_events(1, limit=10)) == 3
+    assert store.get_engine_state(1)["last_candle_ts"] == 1000
+
+
+class UnknownSymbolAdapter(FakeAdapter):
+    async def prepare(self, symbols):
+        return [symbol for symbol in symbols if symbol == "BAD"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_symbol_only_skips_itself(tmp_path):
+    adapter = UnknownSymbolAdapter()
+    engine = _engine(tmp_path, adapter, SYMBOLS="A,BAD", MAX_OPEN_POSITIONS=10)
+    await engine.run_once()
+    assert [intent.symbol for intent in adapter.orders] == ["A"]
+    assert engine.store.store.get_engine_state(1)["last_error"] == "Symbol not found: BAD"
@@ -1,14 +1,43 @@
-from data.store import SQLiteStore
+import time
+
+import pytest
+
+from data.store import AsyncStore, SQLiteStore
 from engine.idempotency import Idempotency
 
 
-def test_idempotency_check_and_add(tmp_path):
+@pytest.mark.asyncio
+async def test_idempotency_check_and_add(tmp_path):
     db = tmp_path / "test.db"
-    store = SQLiteStore(str(db))
-    idem = Idempotency(store, user_id=1, max_keys=2)
-
-    assert idem.check_and_add("k1")
-    assert not idem.check_and_add("k1")
-    assert idem.check_and_add("k2")
-    assert idem.check_and_add("k3")
-    assert not idem.exists("k1")
+    store = AsyncStore(SQLiteStore(str(db)))
+    now = [1000.0]
+    idem = Idempotency(store, user_id=1, ttl=60, cache_size=2, clock=lambda: now[0])
+
+    assert await idem.check_and_add("k1")
+    assert not await idem.check_and_add("k1")
+    assert await idem.check_and_add("k2")
+    assert await idem.check_and_add("k3")
+    assert not await idem.check_and_add("k1")
+
+    fresh = Idempotency(store, user_id=1, ttl=60, clock=lambda: now[0])
+    assert not await fresh.check_and_add("k2")
+    assert await Idempotency(store, user_id=2, ttl=60, clock=lambda: now[0]).check_and_add("k2")
+
+    now[0] += 61
+    assert await idem.check_and_add("k1")
+    assert await fresh.check_and_add("k2")
+    store.close()
+
+
+def test_legacy_idempotency_keys_are_migrated(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    store = SQLiteStore(path)
+    store.set_setting(1, "IDEMPOTENCY_KEYS", ["a", "b"])
+    store._connect().execute("PRAGMA user_version=0")
+    store.close()
+
+    store = SQLiteStore(path)
+    assert store.get_setting(1, "IDEMPOTENCY_KEYS") is None
+    assert not store.claim_idempotency_key(1, "a", int(time.time()), 60)
+    assert store.claim_idempotency_key(1, "c", int(time.time()), 60)
+    store.close()
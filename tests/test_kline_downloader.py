@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from adapters.binance_spot import BinanceSpotAdapter
+from data.candle_store import CandleStore
+from services.kline_downloader import KlineDownloader
+
+
+class RecordedKlines:
+    def __init__(self, rows: list[list], fail_at: int | None = None) -> None:
+        self.rows = rows
+        self.fail_at = fail_at
+        self.calls: list[tuple[int, int, int]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_klines(self, symbol, interval, limit=500, start_time=None, end_time=None, priority=None):
+        self.calls.append((start_time, end_time, limit))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.005 * (len(self.calls) % 3))
+        self.in_flight -= 1
+        if start_time == self.fail_at:
+            self.fail_at = None
+            raise RuntimeError("connection reset")
+        rows = [r for r in self.rows if start_time - 60_000 <= r[0] <= end_time]
+        return rows[: limit + 1]
+
+
+def _recorded(count: int) -> list[list]:
+    return [[ts * 1000, "1.0", "2.0", "0.5", str(100 + i), "3.0", 0, "0", 0, "0", "0", "0"] for i, ts in enumerate(range(0, count * 60, 60))]
+
+
+@pytest.mark.asyncio
+async def test_downloader_pages_concurrently_dedupes_and_resumes(tmp_path):
+    client = RecordedKlines(_recorded(1000), fail_at=600 * 60_000)
+    adapter = BinanceSpotAdapter()
+    adapter.client = client
+    store = CandleStore(tmp_path)
+    downloader = KlineDownloader(adapter, store, page_size=100, concurrency=3, clock=lambda: 1000 * 60 + 5)
+
+    assert downloader.pages("BTCUSDT", "1m", 30)[:2] == [(60, 6000), (6060, 12000)]
+    with pytest.raises(RuntimeError, match="connection reset"):
+        await downloader.download("btcusdt", "1m", 0)
+    assert store.last_ts("BTCUSDT", "1m") == 599 * 60
+    assert client.max_in_flight <= 3
+
+    client.calls.clear()
+    assert await downloader.download("BTCUSDT", "1m", 0) == 400
+    assert client.calls[0][0] == 600 * 60_000
+    assert len(client.calls) == 4
+    candles = store.read("BTCUSDT", "1m")
+    assert candles.ts.tolist() == list(range(0, 1000 * 60, 60))
+    assert candles.close[-1] == 1099.0
+    assert await downloader.download("BTCUSDT", "1m", 0) == 0
+
+
+@pytest.mark.asyncio
+async def test_downloader_backfills_history_before_the_first_stored_bar(tmp_path):
+    client = RecordedKlines(_recorded(1000))
+    adapter = BinanceSpotAdapter()
+    adapter.client = client
+    store = CandleStore(tmp_path)
+    downloader = KlineDownloader(adapter, store, page_size=100, concurrency=3, clock=lambda: 1000 * 60 + 5)
+
+    assert await downloader.download("BTCUSDT", "1m", 700 * 60, 799 * 60) == 101
+    assert downloader.pages("BTCUSDT", "1m", 450 * 60)[:4] == [(27000, 32940), (33000, 38940), (39000, 41880), (48000, 53940)]
+    assert await downloader.download("BTCUSDT", "1m", 450 * 60) == 450
+    candles = store.read("BTCUSDT", "1m")
+    assert candles.ts.tolist() == list(range(449 * 60, 1000 * 60, 60))
+    assert candles.close.tolist() == [100.0 + i for i in range(449, 1000)]
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from providers import CountingProvider
+from services.market_data import MarketDataHub
+
+
+@pytest.mark.asyncio
+async def test_hub_coalesces_concurrent_candle_fetches():
+    provider = CountingProvider()
+    hub = MarketDataHub()
+    feeds = [hub.feed("binance", provider) for _ in range(50)]
+    results = await asyncio.gather(*(f.fetch_candles("BTCUSDT", "15m", limit=200) for f in feeds))
+    assert provider.candle_calls == 1
+    assert all(r is results[0] for r in results)
+
+    await feeds[0].fetch_candles("BTCUSDT", "15m", limit=2)
+    assert provider.candle_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_hub_caches_spread_for_ttl():
+    provider = CountingProvider()
+    now = [0.0]
+    hub = MarketDataHub(spread_ttl=1.0, clock=lambda: now[0])
+    feed = hub.feed("binance", provider)
+    assert await feed.get_spread("BTCUSDT") == 0.001
+    await feed.get_spread("BTCUSDT")
+    assert provider.spread_calls == 1
+    now[0] = 1.5
+    await feed.get_spread("BTCUSDT")
+    assert provider.spread_calls == 2
+
+
+class BatchProvider(CountingProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[list[str]] = []
+
+    async def get_spreads(self, symbols):
+        self.batches.append(list(symbols))
+        await asyncio.sleep(0.01)
+        return {symbol: 0.002 for symbol in symbols}
+
+
+@pytest.mark.asyncio
+async def test_hub_fetches_missing_spreads_in_one_batch():
+    provider = BatchProvider()
+    now = [0.0]
+    hub = MarketDataHub(spread_ttl=0.5, clock=lambda: now[0])
+    feeds = [hub.feed("binance", provider) for _ in range(10)]
+    results = await asyncio.gather(*(f.get_spreads(["BTCUSDT", "ETHUSDT"]) for f in feeds))
+    assert provider.batches == [["BTCUSDT", "ETHUSDT"]]
+    assert all(r == {"BTCUSDT": 0.002, "ETHUSDT": 0.002} for r in results)
+
+    assert await feeds[0].get_spread("ETHUSDT") == 0.002
+    await feeds[0].get_spreads(["BTCUSDT", "SOLUSDT"])
+    assert provider.batches[-1] == ["SOLUSDT"]
+    now[0] = 0.6
+    await feeds[0].get_spreads(["BTCUSDT", "ETHUSDT", "SOLUSDT"])
+    assert provider.batches[-1] == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    assert provider.spread_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_feed_reports_spread_age_from_cache_time():
+    provider = BatchProvider()
+    now = [10.0]
+    hub = MarketDataHub(spread_ttl=0.5, clock=lambda: now[0])
+    feed = hub.feed("binance", provider)
+    await feed.get_spreads(["BTCUSDT"])
+    now[0] = 10.4
+    quotes = await feed.get_spread_quotes(["BTCUSDT", "ETHUSDT"])
+    assert quotes["BTCUSDT"] == (0.002, pytest.approx(0.4))
+    assert quotes["ETHUSDT"] == (0.002, 0.0)
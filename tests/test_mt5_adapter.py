@@ -0,0 +1,107 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import fake_mt5
+from adapters.mt5_executor import MT5Account, MT5Executor, shared_executor
+from adapters.mt5_terminal import MT5Adapter
+from data.store import AsyncStore, SQLiteStore
+from engine.models import OrderIntent
+from services.config_service import BotSettings
+from services.notifier import Notifier
+from services.orchestrator import EngineOrchestrator
+
+
+@pytest.fixture
+def executor():
+    fake_mt5.reset()
+    fake_mt5.ticks.update(
+        EURUSD=SimpleNamespace(bid=1.0999, ask=1.1001),
+        GBPUSD=SimpleNamespace(bid=1.2499, ask=1.2501),
+    )
+    executor = MT5Executor(fake_mt5)
+    yield executor
+    executor.shutdown()
+
+
+def _adapter(executor, login="1001", password="pw"):
+    return MT5Adapter(login, password, "Demo", {"EURUSD.x": "EURUSD"}, mt5_module=fake_mt5, executor=executor)
+
+
+@pytest.mark.asyncio
+async def test_requests_run_on_one_thread_and_coalesce(executor):
+    adapter = _adapter(executor)
+    series = await asyncio.gather(*(adapter.fetch_candles("EURUSD.x", "1m", limit=50) for _ in range(20)))
+    assert series[0].close[-1] == 50.5
+    assert series[0].ts.dtype == np.int64
+    assert fake_mt5.calls.count("copy_rates_from_pos") < 20
+    assert executor.stats()["coalesced"] > 0
+
+    spreads = await adapter.get_spreads(["EURUSD.x", "GBPUSD"])
+    assert spreads["EURUSD.x"] == pytest.approx(0.0002 / 1.1001)
+    assert (await adapter.get_positions())[0].symbol == "EURUSD"
+
+    fill = await adapter.place_order(OrderIntent(symbol="EURUSD.x", side="SELL", qty=0.1, price=None, stop_loss=None))
+    assert fill.price == 1.0999
+    assert fake_mt5.orders[0]["type"] == fake_mt5.ORDER_TYPE_SELL
+    assert fake_mt5.calls.count("initialize") == 1
+    assert fake_mt5.logins == [1001]
+    assert threading.get_ident() not in fake_mt5.threads
+    assert len(fake_mt5.threads) == 1
+
+
+@pytest.mark.asyncio
+async def test_accounts_switch_and_errors_propagate(executor):
+    first, second = _adapter(executor), _adapter(executor, login="2002")
+    await first.get_spread("GBPUSD")
+    await second.get_spread("GBPUSD")
+    await second.get_spread("GBPUSD")
+    assert fake_mt5.logins == [1001, 2002]
+
+    with pytest.raises(RuntimeError, match="symbol info failed"):
+        await first.place_order(OrderIntent(symbol="XAUUSD", side="BUY", qty=1.0, price=None, stop_loss=None))
+    with pytest.raises(RuntimeError, match="login failed"):
+        await _adapter(executor, login="3003", password="bad").get_spread("EURUSD")
+    assert await first.get_spread("EURUSD") > 0
+    executor.shutdown()
+    assert fake_mt5.calls[-1] == "shutdown"
+    with pytest.raises(RuntimeError, match="shut down"):
+        await first.get_spread("EURUSD")
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_close_shuts_down_mt5_executor(tmp_path, executor):
+    db = AsyncStore(SQLiteStore(str(tmp_path / "o.db")))
+    orchestrator = EngineOrchestrator(db, BotSettings(_env_file=None), Notifier())
+    orchestrator._mt5_executor = executor
+    await _adapter(executor).get_spread("EURUSD")
+    await orchestrator.close()
+    assert fake_mt5.calls[-1] == "shutdown"
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_batches_log_in_once_per_account(executor):
+    release = threading.Event()
+    blocker = executor.submit(lambda mt5: release.wait(5))
+    first, second = MT5Account("1001", "pw", "Demo"), MT5Account("2002", "pw", "Demo")
+    jobs = [
+        executor.submit(lambda mt5, n: n, n, account=account)
+        for n, account in enumerate([first, second, first, second, first])
+    ]
+    release.set()
+    await blocker
+    assert await asyncio.gather(*jobs) == [0, 1, 2, 3, 4]
+    assert fake_mt5.logins == [1001, 2002]
+
+
+def test_shared_executor_is_replaced_after_shutdown():
+    executor = shared_executor(fake_mt5)
+    assert shared_executor(fake_mt5) is executor
+    executor.shutdown()
+    replacement = shared_executor(fake_mt5)
+    assert replacement is not executor
+    replacement.shutdown()
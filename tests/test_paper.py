@@ -0,0 +1,112 @@
+import pytest
+
+from adapters.paper import PaperAdapter, PaperExchange
+from data.daily_stats import DailyStats
+from engine.models import Fill, OrderIntent
+from engine.unit_of_work import TickUnit
+from services.market_data import MarketDataHub
+from providers import CountingProvider
+
+
+def _intent(side: str, qty: float = 1.0, price: float | None = None) -> OrderIntent:
+    return OrderIntent(symbol="BTCUSDT", side=side, qty=qty, price=price, stop_loss=None)
+
+
+async def _hub() -> MarketDataHub:
+    hub = MarketDataHub()
+    await hub.fetch_candles("binance", CountingProvider(), "BTCUSDT", "1m", 1)
+    return hub
+
+
+async def _fills(seed: int) -> list[float]:
+    exchange = PaperExchange(await _hub(), slippage_bps=10.0, fee_bps=0.0, seed=seed)
+    return [exchange.execute(user, _intent("BUY")).price for user in (1, 2, 1, 2)]
+
+
+@pytest.mark.asyncio
+async def test_paper_fills_are_reproducible_per_user():
+    fills = await _fills(7)
+    assert fills == await _fills(7)
+    assert fills != await _fills(8)
+    assert fills[0] != fills[1]
+    assert all(1.0005 <= price <= 1.0015 for price in fills)
+
+
+@pytest.mark.asyncio
+async def test_paper_adapter_fills_from_hub_without_fetching():
+    provider = CountingProvider()
+    hub = MarketDataHub()
+    feed = hub.feed("binance", provider)
+    exchange = PaperExchange(hub, slippage_bps=0.0, fee_bps=10.0)
+    adapter = PaperAdapter(feed, exchange, user_id=1)
+
+    await adapter.fetch_candles("BTCUSDT", "1m")
+    await feed.get_spread("BTCUSDT")
+    calls = (provider.candle_calls, provider.spread_calls)
+
+    buy = await adapter.place_order(_intent("BUY", qty=2.0))
+    assert buy.price == pytest.approx(1.0 * 1.0005 * 1.001)
+    sell = await adapter.place_order(_intent("SELL", qty=0.5, price=0.99))
+    assert sell.price == pytest.approx(1.0 * 0.9995 * 0.999)
+    with pytest.raises(RuntimeError, match="not marketable"):
+        await adapter.place_order(_intent("BUY", price=0.5))
+    assert (provider.candle_calls, provider.spread_calls) == calls
+
+    positions = await adapter.get_positions()
+    assert [(p.symbol, p.qty, p.avg_price) for p in positions] == [("BTCUSDT", 1.5, buy.price)]
+    assert await PaperAdapter(feed, exchange, user_id=2).get_positions() == []
+    assert exchange.fills == 2
+
+
+@pytest.mark.asyncio
+async def test_paper_exchange_sustains_many_fills():
+    exchange = PaperExchange(await _hub())
+    for i in range(20000):
+        exchange.execute(i % 500, _intent("BUY" if i % 1000 < 500 else "SELL", qty=0.01))
+    assert exchange.fills == 20000
+    assert all(exchange.positions(user) == [] for user in range(500))
+
+
+@pytest.mark.asyncio
+async def test_paper_rejects_stale_prices_and_ids_differ_per_process():
+    now = [0.0]
+    hub = MarketDataHub(clock=lambda: now[0])
+    await hub.fetch_candles("binance", CountingProvider(), "BTCUSDT", "1m", 1)
+    first, restarted = PaperExchange(hub), PaperExchange(hub)
+    assert first.execute(1, _intent("BUY")).order_id != restarted.execute(1, _intent("BUY")).order_id
+    now[0] = 61.0
+    with pytest.raises(RuntimeError, match="No fresh market price"):
+        first.execute(1, _intent("SELL"))
+
+
+@pytest.mark.asyncio
+async def test_partial_closes_keep_the_average_price_in_paper_and_persisted_positions():
+    exchange = PaperExchange(await _hub())
+    unit = TickUnit(1, [], DailyStats())
+    fills = [("BUY", 2.0, 100.0), ("BUY", 2.0, 110.0), ("SELL", 1.0, 120.0), ("SELL", 5.0, 90.0), ("BUY", 1.0, 80.0)]
+    expected = [(2.0, 100.0), (4.0, 105.0), (3.0, 105.0), (-2.0, 90.0), (-1.0, 90.0)]
+    for (side, qty, price), (exp_qty, exp_avg) in zip(fills, expected):
+        fill = Fill(order_id="x", symbol="BTCUSDT", side=side, qty=qty, price=price)
+        exchange._apply_fill(1, fill)
+        unit.record_fill(fill, "paper", "paper")
+        position = exchange.positions(1)[0]
+        assert (position.qty, position.avg_price) == (exp_qty, pytest.approx(exp_avg))
+        assert unit.positions["BTCUSDT"] == (exp_qty, pytest.approx(exp_avg))
+    exchange._apply_fill(1, Fill(order_id="y", symbol="BTCUSDT", side="BUY", qty=1.0, price=70.0))
+    assert exchange.positions(1) == []
+
+
+@pytest.mark.asyncio
+async def test_paper_adapter_refreshes_stale_prices_before_filling():
+    now = [0.0]
+    provider = CountingProvider()
+    hub = MarketDataHub(clock=lambda: now[0])
+    exchange = PaperExchange(hub, slippage_bps=0.0, fee_bps=0.0)
+    adapter = PaperAdapter(hub.feed("binance", provider), exchange, user_id=1)
+
+    assert (await adapter.place_order(_intent("BUY"))).price == 1.0
+    await adapter.place_order(_intent("BUY"))
+    assert provider.candle_calls == 1
+    now[0] = 61.0
+    assert (await adapter.place_order(_intent("SELL"))).price == 1.0
+    assert provider.candle_calls == 2
@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+import pytest
+
+from adapters.rate_limit import PRIORITY_MARKET_DATA, PRIORITY_ORDER, WeightLimiter, request_weight
+
+
+def test_request_weights_follow_endpoint_tables():
+    assert request_weight("/api/v3/klines", {"limit": 1000}) == 2
+    assert request_weight("/api/v3/depth", {"limit": 5}) == 5
+    assert request_weight("/api/v3/depth", {"limit": 1000}) == 50
+    assert request_weight("/api/v3/ticker/bookTicker", {"symbol": "BTCUSDT"}) == 2
+    assert request_weight("/api/v3/ticker/bookTicker", {"symbols": '["BTCUSDT"]'}) == 4
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_and_serves_orders_first():
+    limiter = WeightLimiter(limit=100, window=1.0, headroom=1.0)
+    await limiter.acquire(100)
+    granted: list[str] = []
+
+    async def request(name: str, priority: int) -> None:
+        await limiter.acquire(40, priority)
+        granted.append(name)
+
+    tasks = [asyncio.create_task(request(f"md{i}", PRIORITY_MARKET_DATA)) for i in range(2)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request("order", PRIORITY_ORDER)))
+    await asyncio.sleep(0)
+    assert limiter.stats()["queue_depth"] == 3
+    await asyncio.gather(*tasks)
+    assert granted == ["order", "md0", "md1"]
+
+
+@pytest.mark.asyncio
+async def test_limiter_corrects_from_used_weight_header():
+    limiter = WeightLimiter(limit=100, window=1.0, headroom=1.0)
+    limiter.observe(95)
+    assert limiter.stats()["budget"] <= 6
+    started = time.perf_counter()
+    await limiter.acquire(30)
+    assert time.perf_counter() - started >= 0.2
@@ -1,6 +1,9 @@
 import time
 
-from data.store import SQLiteStore
+import pytest
+
+from data.daily_stats import day_start
+from data.store import AsyncStore, SQLiteStore
 from engine.models import Signal
 from risk.manager import RiskManager
 from services.config_service import RuntimeConfig
@@ -25,30 +28,57 @@ def _config() -> RuntimeConfig:
     )
 
 
-def test_risk_spread_block(tmp_path):
+@pytest.mark.asyncio
+async def test_risk_spread_block(tmp_path):
     store = SQLiteStore(str(tmp_path / "r.db"))
-    rm = RiskManager(store)
+    rm = RiskManager(AsyncStore(store))
     signal = Signal(side="BUY", reason="test", stop_loss=99.0)
-    decision = rm.evaluate(1, "BTCUSDT", signal, last_price=100.0, open_positions=0, config=_config(), spread=0.01)
+    decision = await rm.evaluate(1, "BTCUSDT", signal, last_price=100.0, open_positions=0, config=_config(), spread=0.01)
     assert not decision.allowed
 
 
-def test_risk_max_trades(tmp_path):
+@pytest.mark.asyncio
+async def test_risk_max_trades(tmp_path):
     store = SQLiteStore(str(tmp_path / "r2.db"))
     store.add_trade(1, "BTCUSDT", "BUY", 1.0, 100.0, "paper", "paper", None)
-    rm = RiskManager(store)
+    rm = RiskManager(AsyncStore(store))
     signal = Signal(side="BUY", reason="test", stop_loss=99.0)
-    decision = rm.evaluate(1, "BTCUSDT", signal, last_price=100.0, open_positions=0, config=_config(), spread=0.0)
+    decision = await rm.evaluate(1, "BTCUSDT", signal, last_price=100.0, open_positions=0, config=_config(), spread=0.0)
     assert not decision.allowed
 
 
-def test_risk_circuit_breaker(tmp_path):
+@pytest.mark.asyncio
+async def test_risk_circuit_breaker(tmp_path):
     store = SQLiteStore(str(tmp_path / "r3.db"))
     store.add_trade(1, "BTCUSDT", "BUY", 1.0, 100.0, "paper", "paper", None)
     store.add_trade(1, "BTCUSDT", "SELL", 1.0, 90.0, "paper", "paper", None)
-    rm = RiskManager(store)
+    rm = RiskManager(AsyncStore(store))
     cfg = _config()
     cfg.max_trades_per_day = 5
     signal = Signal(side="BUY", reason="test", stop_loss=99.0)
-    decision = rm.evaluate(1, "BTCUSDT", signal, last_price=100.0, open_positions=0, config=cfg, spread=0.0)
+    decision = await rm.evaluate(1, "BTCUSDT", signal, last_price=100.0, open_positions=0, config=cfg, spread=0.0)
     assert decision.circuit_breaker
+
+
+def test_daily_stats_are_maintained_incrementally(tmp_path):
+    path = str(tmp_path / "r4.db")
+    store = SQLiteStore(path)
+    fills = [("BTCUSDT", "BUY", 1.0, 100.0), ("ETHUSDT", "SELL", 2.0, 50.0), ("BTCUSDT", "SELL", 1.5, 95.0), ("ETHUSDT", "BUY", 2.0, 45.0)]
+    for symbol, side, qty, price in fills:
+        store.add_trade(1, symbol, side, qty, price, "paper", "paper", None)
+    day = day_start(int(time.time()))
+    stats = store.get_daily_stats(1, day)
+    assert stats.trade_count == 4
+    assert stats.pnl_pct == store.compute_daily_pnl_pct(1, day)
+    store.close()
+
+    store = SQLiteStore(path)
+    conn = store._connect()
+    with conn:
+        conn.execute("DELETE FROM daily_stats")
+    assert store.get_daily_stats(1, day) == stats
+    assert conn.execute("SELECT COUNT(*) FROM daily_stats").fetchone()[0] == 0
+    assert store.get_daily_stats(2, day).trade_count == 0
+    store.add_trade(1, "BTCUSDT", "BUY", 1.0, 100.0, "paper", "paper", None)
+    assert store.get_daily_stats(1, day).trade_count == 5
+    store.close()
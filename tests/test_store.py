@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from data.store import _SQLITE_MIGRATIONS, AsyncStore, SQLiteStore
+
+
+def test_sqlite_store_reuses_connection_per_thread(tmp_path):
+    store = SQLiteStore(str(tmp_path / "s.db"))
+    conn = store._connect()
+    assert store._connect() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(store._connect()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+    store.set_setting(1, "MODE", "paper")
+    assert store.get_setting(1, "MODE") == "paper"
+    store.close()
+    assert store.get_setting(1, "MODE") == "paper"
+
+
+@pytest.mark.asyncio
+async def test_async_store_runs_queries_off_the_event_loop(tmp_path):
+    db = AsyncStore(SQLiteStore(str(tmp_path / "a.db")), max_workers=2)
+    await db.set_setting(1, "MODE", "live")
+    heavy = asyncio.ensure_future(db.run(time.sleep, 0.5))
+    started = time.perf_counter()
+    assert await db.get_setting(1, "MODE") == "live"
+    assert time.perf_counter() - started < 0.25
+    await heavy
+    db.close()
+
+
+def test_sqlite_migrations_dedupe_positions_and_add_indexes(tmp_path):
+    path = str(tmp_path / "m.db")
+    store = SQLiteStore(path)
+    conn = store._connect()
+    conn.execute("DROP INDEX uq_positions_user_symbol")
+    conn.execute("DROP INDEX idx_trades_user_created")
+    conn.execute("PRAGMA user_version=1")
+    for qty in (1.0, 2.0):
+        conn.execute(
+            "INSERT INTO positions (user_id, symbol, qty, avg_price, updated_at) VALUES (1, 'BTCUSDT', ?, 10.0, 0)",
+            (qty,),
+        )
+    conn.commit()
+    store.close()
+
+    store = SQLiteStore(path)
+    conn = store._connect()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == _SQLITE_MIGRATIONS[-1][0]
+    assert [p["qty"] for p in store.list_positions(1)] == [2.0]
+    store.upsert_position(1, "BTCUSDT", 3.0, 11.0)
+    store.upsert_position(1, "ETHUSDT", 1.0, 5.0)
+    assert sorted((p["symbol"], p["qty"]) for p in store.list_positions(1)) == [("BTCUSDT", 3.0), ("ETHUSDT", 1.0)]
+
+    plan = " ".join(
+        r[-1]
+        for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT symbol, side, qty, price FROM trades WHERE user_id=1 AND created_at >= 0 ORDER BY created_at DESC"
+        )
+    )
+    assert "COVERING INDEX idx_trades_user_created" in plan
+    store.close()
+
+
+def test_postgres_store_configures_pool_and_reshapes_stats(monkeypatch):
+    import data.store as store_module
+
+    class FakePool:
+        check_connection = object()
+
+        def __init__(self, dsn, **kwargs):
+            self.dsn = dsn
+            self.kwargs = kwargs
+
+        def get_stats(self):
+            return {"pool_min": 2, "pool_max": 7, "pool_size": 3, "pool_available": 1, "requests_waiting": 4, "requests_num": 50}
+
+    monkeypatch.setattr(store_module, "ConnectionPool", FakePool)
+    monkeypatch.setattr(store_module.PostgresStore, "_ensure_schema", lambda self: None)
+    store = store_module.create_store(
+        "postgresql://bot@db/bot", "unused.db", pool_min_size=2, pool_max_size=7, pool_max_idle=45.0, pool_timeout=5.0
+    )
+    assert isinstance(store, store_module.PostgresStore)
+    kwargs = store.pool.kwargs
+    assert store.pool.dsn == "postgresql://bot@db/bot"
+    assert (kwargs["min_size"], kwargs["max_size"], kwargs["max_idle"], kwargs["timeout"]) == (2, 7, 45.0, 5.0)
+    assert kwargs["check"] is FakePool.check_connection
+    assert store.pool_stats() == {
+        "connections": 3,
+        "available": 1,
+        "waiting": 4,
+        "min_size": 2,
+        "max_size": 7,
+        "requests": 50,
+        "errors": 0,
+        "connections_lost": 0,
+    }
@@ -1,17 +1,23 @@
-from engine.models import Candle
+import math
+import random
+
+import pandas as pd
+
+from engine.models import Candle, CandleSeries
 from services.config_service import RuntimeConfig
+from strategies.indicators import MaAtrState
 from strategies.ma_atr import MovingAverageAtrStrategy
 
 
-def test_ma_atr_signal_generation():
-    config = RuntimeConfig(
+def _config(fast_ma: int = 3, slow_ma: int = 5, atr_period: int = 3) -> RuntimeConfig:
+    return RuntimeConfig(
         mode="paper",
         adapter="paper",
         symbols=["BTCUSDT"],
         timeframe="1m",
-        fast_ma=3,
-        slow_ma=5,
-        atr_period=3,
+        fast_ma=fast_ma,
+        slow_ma=slow_ma,
+        atr_period=atr_period,
         atr_multiplier=2.0,
         risk_per_trade_pct=1.0,
         max_daily_loss_pct=2.0,
@@ -20,11 +26,65 @@ def test_ma_atr_signal_generation():
         max_spread=0.01,
         symbol_map={},
     )
+
+
+def test_ma_atr_signal_generation():
+    config = _config()
     candles = []
     prices = [10, 10, 10, 10, 10, 9, 20]
     for i, p in enumerate(prices):
         candles.append(Candle(ts=1000 + i * 60, open=p, high=p + 0.5, low=p - 0.5, close=p, volume=1))
     strategy = MovingAverageAtrStrategy()
-    signal = strategy.generate(candles, config)
+    signal = strategy.generate(CandleSeries.from_candles(candles), config)
     assert signal is not None
     assert signal.side == "BUY"
+
+
+def _pandas_reference(candles, config):
+    df = pd.DataFrame([c.__dict__ for c in candles])
+    fast = df["close"].rolling(config.fast_ma).mean()
+    slow = df["close"].rolling(config.slow_ma).mean()
+    tr = pd.concat(
+        [
+            df["high"] - df["low"],
+            (df["high"] - df["close"].shift()).abs(),
+            (df["low"] - df["close"].shift()).abs(),
+        ],
+        axis=1,
+    ).max(axis=1)
+    atr = tr.rolling(config.atr_period).mean()
+    return fast.tolist(), slow.tolist(), atr.tolist()
+
+
+def test_incremental_indicators_match_pandas():
+    rng = random.Random(7)
+    price = 100.0
+    candles = []
+    for i in range(400):
+        price += rng.gauss(0, 1)
+        high = price + abs(rng.gauss(0, 0.5))
+        low = price - abs(rng.gauss(0, 0.5))
+        candles.append(Candle(ts=i * 60, open=price, high=high, low=low, close=price, volume=1.0))
+    config = _config(fast_ma=7, slow_ma=25, atr_period=14)
+    fast, slow, atr = _pandas_reference(candles, config)
+
+    state = MaAtrState(config.fast_ma, config.slow_ma, config.atr_period)
+    for i, candle in enumerate(candles):
+        if i % 3 == 0:
+            state.update(candle.ts, candle.high + 5, candle.low, candle.close + 1)
+        state.update(candle.ts, candle.high, candle.low, candle.close)
+        for ours, ref in ((state.fast.value, fast[i]), (state.slow.value, slow[i]), (state.atr.value, atr[i])):
+            assert (math.isnan(ours) and math.isnan(ref)) or ours == ref
+
+
+def test_keyed_generate_matches_stateless():
+    prices = [10, 11, 12, 11, 10, 9, 8, 9, 11, 13, 14, 13, 11, 9, 8, 7, 9, 12, 15, 16]
+    candles = CandleSeries.from_candles(
+        Candle(ts=i * 60, open=p, high=p + 1, low=p - 1, close=p, volume=1) for i, p in enumerate(prices)
+    )
+    config = _config(fast_ma=2, slow_ma=4, atr_period=3)
+    keyed = MovingAverageAtrStrategy()
+    stateless = MovingAverageAtrStrategy()
+    for end in range(1, len(candles) + 1):
+        window = candles[:end]
+        assert keyed.generate(window, config, key="BTCUSDT:1m") == stateless.generate(window, config)
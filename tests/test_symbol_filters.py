@@ -0,0 +1,104 @@
+from decimal import Decimal
+
+import pytest
+
+from adapters.binance_rest import BinanceAPIError
+from adapters.binance_spot import BinanceSpotAdapter
+from adapters.symbol_filters import SymbolFilterCache
+from data.store import AsyncStore, SQLiteStore
+from engine.models import OrderIntent
+
+
+class FakeExchangeInfo:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+        self.orders: list[dict] = []
+
+    async def get_exchange_info(self, symbols=None):
+        self.calls.append(list(symbols))
+        if "BADUSDT" in symbols:
+            raise BinanceAPIError(400, -1121, "Invalid symbol.")
+        return {"symbols": [_info(symbol) for symbol in symbols if symbol != "NOPEUSDT"]}
+
+    async def get_book_tickers(self, symbols=None):
+        return [{"symbol": symbol, "bidPrice": "99.00", "askPrice": "101.00"} for symbol in symbols]
+
+    async def create_order(self, **params):
+        self.orders.append(params)
+        return {"orderId": 7, "fills": [{"price": params.get("price", "100.0"), "qty": params["quantity"]}]}
+
+
+def _info(symbol: str) -> dict:
+    return {
+        "symbol": symbol,
+        "filters": [
+            {"filterType": "PRICE_FILTER", "tickSize": "0.01000000"},
+            {"filterType": "LOT_SIZE", "stepSize": "0.00100000", "minQty": "0.00100000"},
+            {"filterType": "NOTIONAL", "minNotional": "5.00000000"},
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_filters_are_bulk_loaded_persisted_and_refreshed(tmp_path):
+    store = AsyncStore(SQLiteStore(str(tmp_path / "f.db")))
+    now = [1000.0]
+    client = FakeExchangeInfo()
+    cache = SymbolFilterCache(store, refresh_interval=3600, clock=lambda: now[0])
+    await cache.preload(client, ["BTCUSDT", "ETHUSDT"])
+    await cache.preload(client, ["ETHUSDT"])
+    assert client.calls == [["BTCUSDT", "ETHUSDT"]]
+    filters = cache.get("BTCUSDT")
+    assert filters.round_qty(0.12345) == Decimal("0.123")
+    assert filters.round_price(101.239) == Decimal("101.23")
+
+    restarted = SymbolFilterCache(store, refresh_interval=3600, clock=lambda: now[0])
+    await restarted.preload(client, ["BTCUSDT"])
+    assert len(client.calls) == 1
+    assert restarted.get("ETHUSDT") == cache.get("ETHUSDT")
+
+    now[0] += 3600
+    await restarted.preload(client, ["BTCUSDT"])
+    assert client.calls[-1] == ["BTCUSDT", "ETHUSDT"]
+    assert await restarted.preload(client, ["NOPEUSDT"]) == ["NOPEUSDT"]
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_invalid_symbols_are_negatively_cached():
+    now = [0.0]
+    client = FakeExchangeInfo()
+    cache = SymbolFilterCache(refresh_interval=3600, clock=lambda: now[0])
+    await cache.preload(client, ["BTCUSDT"])
+    for _ in range(3):
+        assert await cache.preload(client, ["ETHUSDT", "BADUSDT"]) == ["BADUSDT"]
+    assert client.calls == [["BTCUSDT"], ["BADUSDT", "BTCUSDT", "ETHUSDT"], ["BTCUSDT"], ["BADUSDT"], ["ETHUSDT"]]
+    assert cache.get("ETHUSDT").symbol == "ETHUSDT"
+
+    now[0] = 3601
+    assert await cache.preload(client, ["BADUSDT"]) == ["BADUSDT"]
+    assert client.calls[-1] == ["BADUSDT"]
+
+
+@pytest.mark.asyncio
+async def test_place_order_uses_preloaded_filters_only():
+    client = FakeExchangeInfo()
+    adapter = BinanceSpotAdapter("key", "secret", filters=SymbolFilterCache())
+    adapter.client = client
+    await adapter.prepare(["BTCUSDT"])
+
+    fill = await adapter.place_order(OrderIntent(symbol="BTCUSDT", side="BUY", qty=0.12345, price=100.129, stop_loss=None))
+    assert client.orders[-1]["type"] == "LIMIT"
+    assert (client.orders[-1]["quantity"], client.orders[-1]["price"]) == ("0.12300000", "100.12000000")
+    assert fill.qty == 0.123
+    with pytest.raises(RuntimeError, match="MIN_NOTIONAL"):
+        await adapter.place_order(OrderIntent(symbol="BTCUSDT", side="BUY", qty=0.01, price=100.0, stop_loss=None))
+    with pytest.raises(RuntimeError, match="MIN_NOTIONAL"):
+        await adapter.place_order(OrderIntent(symbol="BTCUSDT", side="BUY", qty=0.01, price=None, stop_loss=None, ref_price=100.0))
+    with pytest.raises(RuntimeError, match="MIN_NOTIONAL"):
+        await adapter.place_order(OrderIntent(symbol="BTCUSDT", side="SELL", qty=0.04, price=None, stop_loss=None))
+    await adapter.place_order(OrderIntent(symbol="BTCUSDT", side="SELL", qty=0.06, price=None, stop_loss=None))
+    assert client.orders[-1]["type"] == "MARKET"
+    with pytest.raises(RuntimeError, match="LOT_SIZE"):
+        await adapter.place_order(OrderIntent(symbol="BTCUSDT", side="SELL", qty=0.0005, price=None, stop_loss=None))
+    assert len(client.calls) == 1
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+from data.store import AsyncStore, SQLiteStore
+from data.write_behind import FillJournal, WriteBehind
+from data.writes import EngineStateWrite, PositionWrite, TradeWrite
+
+
+class FlakyStore(SQLiteStore):
+    def __init__(self, db_path: str) -> None:
+        super().__init__(db_path)
+        self.batches: list[int] = []
+        self.fail = 0
+
+    def write_batch(self, writes):
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("database is locked")
+        self.batches.append(len(writes))
+        super().write_batch(writes)
+
+
+def _trade(client_id: str, qty: float = 1.0) -> TradeWrite:
+    return TradeWrite(1, "BTCUSDT", "BUY", qty, 100.0, "paper", "paper", None, 1_700_000_000, client_id)
+
+
+@pytest.mark.asyncio
+async def test_write_behind_groups_writes_and_flush_is_a_barrier(tmp_path):
+    store = FlakyStore(str(tmp_path / "w.db"))
+    store.ensure_user(1, None)
+    db = AsyncStore(store, max_workers=2)
+    writes = WriteBehind(db, flush_interval=10.0)
+
+    for i in range(5):
+        await writes.put(_trade(f"t{i}"), durable=True)
+    await writes.put(PositionWrite(1, "BTCUSDT", 5.0, 100.0, 0))
+    await writes.put(EngineStateWrite(1, {"last_candle_ts": 1}))
+    await writes.put(EngineStateWrite(1, {"last_error": "boom"}))
+    assert store.list_trades(1) == []
+
+    await writes.flush()
+    assert store.batches == [8]
+    assert len(store.list_trades(1, limit=10)) == 5
+    assert store.list_positions(1)[0]["qty"] == 5.0
+    state = store.get_engine_state(1)
+    assert (state["last_candle_ts"], state["last_error"]) == (1, "boom")
+    assert store.get_daily_stats(1, 1_700_000_000 - 1_700_000_000 % 86400).trade_count == 5
+    await writes.close()
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_retried_and_journal_survives_crash(tmp_path):
+    store = FlakyStore(str(tmp_path / "j.db"))
+    db = AsyncStore(store, max_workers=2)
+    journal = FillJournal(tmp_path / "fills.journal")
+    writes = WriteBehind(db, journal, flush_interval=0.0, retry_delay=0.01)
+
+    store.fail = 2
+    await writes.put(_trade("a"), durable=True)
+    await asyncio.wait_for(writes.flush(), 5)
+    assert writes.failures == 2
+    assert [t["client_id"] for t in store.list_trades(1)] == ["a"]
+    assert journal.read() == []
+
+    store.fail = 10**6
+    await writes.put(_trade("b"), durable=True)
+    await writes.put(_trade("c", qty=2.0), durable=True)
+    await asyncio.sleep(0.05)
+    assert [w.client_id for w in journal.read()] == ["b", "c"]
+    writes._task.cancel()
+
+    journal.append([_trade("a")])
+    store.fail = 0
+    recovered = WriteBehind(db, FillJournal(tmp_path / "fills.journal"))
+    assert await recovered.recover() == 2
+    assert sorted(t["client_id"] for t in store.list_trades(1, limit=10)) == ["a", "b", "c"]
+    assert journal.read() == []
+    db.close()
+
+
+class PoisonStore(SQLiteStore):
+    def write_batch(self, writes):
+        if any(isinstance(w, TradeWrite) and w.client_id == "bad" for w in writes):
+            raise RuntimeError("UNIQUE constraint failed: trades.client_id")
+        super().write_batch(writes)
+
+
+@pytest.mark.asyncio
+async def test_poison_groups_are_dead_lettered_and_flush_is_bounded(tmp_path):
+    db = AsyncStore(PoisonStore(str(tmp_path / "p.db")), max_workers=2)
+    dead = FillJournal(tmp_path / "fills.deadletter")
+    writes = WriteBehind(db, flush_interval=0.0, retry_delay=0.01, max_attempts=3, dead_letter=dead)
+
+    await writes.put_many([_trade("ok1")])
+    await writes.put_many([_trade("bad"), PositionWrite(1, "BTCUSDT", 1.0, 100.0, 0)])
+    await writes.put_many([_trade("ok2")])
+    await asyncio.wait_for(writes.flush(), 5)
+    assert sorted(t["client_id"] for t in db.store.list_trades(1)) == ["ok1", "ok2"]
+    assert [type(w).__name__ for w in dead.read()] == ["TradeWrite", "PositionWrite"]
+    assert writes.stats()["dead_lettered"] == 2
+    assert writes.failures == 4
+
+    writes.max_attempts = 10**6
+    await writes.put(_trade("bad"))
+    with pytest.raises(RuntimeError, match="flush timed out"):
+        await writes.flush(timeout=0.05)
+    writes._task.cancel()
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_journal_keeps_fills_of_ticks_that_have_not_committed(tmp_path):
+    db = AsyncStore(SQLiteStore(str(tmp_path / "t.db")), max_workers=2)
+    journal = FillJournal(tmp_path / "fills.journal")
+    writes = WriteBehind(db, journal, flush_interval=0.0)
+
+    tick_a = [_trade("a")]
+    tick_b = [_trade("b1"), _trade("b2")]
+    entry_a = await writes.journal_writes(tick_a)
+    entry_b = await writes.journal_writes(tick_b)
+
+    await writes.put_many(tick_b, entries=[entry_b])
+    await writes.flush()
+    assert [w.client_id for w in journal.read()] == ["a", "b1", "b2"]
+
+    tick_c = [_trade("c")]
+    entry_c = await writes.journal_writes(tick_c)
+    await writes.put_many(tick_a, entries=[entry_a])
+    await writes.flush()
+    assert [w.client_id for w in journal.read()] == ["c"]
+
+    await writes.put_many(tick_c, entries=[entry_c])
+    await writes.flush()
+    assert journal.read() == []
+    assert sorted(t["client_id"] for t in db.store.list_trades(1, limit=10)) == ["a", "b1", "b2", "c"]
+    await writes.close()
+    db.close()